@@ -7,9 +7,6 @@ from django.db import models
 from django.shortcuts import render
 from django.urls import include
 
-from datavalidation.viewsets import router
-from datavalidation.views import object_counts, csrf_info
-
 
 class Summary(models.Model):
     # dummy model for the admin page
@@ -22,6 +19,11 @@ class Summary(models.Model):
 class ValidationAdmin(admin.ModelAdmin):
     """ hook up react to the django admin """
     def get_urls(self):
+        # nb. the api (and rest_framework) is only imported when the urls are
+        # loaded, not whenever the admin is imported
+        from datavalidation.viewsets import router
+        from datavalidation.views import object_counts, csrf_info
+
         admin_view = self.admin_site.admin_view
         if getattr(settings, "DATAVALIDATION_DEVELOPMENT", False):
             template_name = "datavalidation/admin/dev/index.html"
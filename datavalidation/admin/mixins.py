@@ -10,9 +10,8 @@ from django.forms import Textarea
 from django.http import HttpRequest, QueryDict
 from django.utils.safestring import mark_safe
 
-from datavalidation.models import FailingObject
+from datavalidation.models import FailingObject, Validator
 from datavalidation.registry import RegistryKeyError
-from datavalidation.runners import ObjectValidationRunner
 from datavalidation.utils import partition
 
 
@@ -22,7 +21,7 @@ class BaseFormSet(BaseGenericInlineFormSet):
     def get_queryset(self):
         if not hasattr(self, "_queryset"):
             self._queryset = super().get_queryset().filter(  # noqa
-                is_exception=self.is_exception, is_valid=True
+                is_exception=self.is_exception
             )
         return self._queryset
 
@@ -30,6 +29,15 @@ class BaseFormSet(BaseGenericInlineFormSet):
     def count(self):
         return len(self.get_queryset())
 
+    def save_existing(self, form, instance: FailingObject, commit: bool = True):
+        fobj = super().save_existing(form, instance, commit)
+        if commit and "allowed_to_fail" in form.changed_data:
+            Validator.add_to_counts(
+                fobj.validator_id,
+                num_allowed_to_fail=1 if fobj.allowed_to_fail else -1
+            )
+        return fobj
+
 
 class DataValidationExceptionFormSet(BaseFormSet):
     is_exception = True
@@ -107,6 +115,7 @@ class DataValidationMixin(_Base):
         # related failing objects have been saved to the database already.
         assert request.method == "POST"
         assert obj is not None
+        from datavalidation.runners import ObjectValidationRunner
         try:
             _, failing, exception = ObjectValidationRunner(obj).run(class_methods=True)
         except RegistryKeyError:
@@ -1,4 +1,3 @@
-import inspect
 from functools import lru_cache
 from typing import Type
 
@@ -9,6 +8,8 @@ class ConfigMeta(type):
     """ metaclass for configuration """
     CONFIG_OPTIONS = {
         "exclude",
+        "incremental_field",
+        "iterator",
     }
 
     def __new__(mcs, name, bases, attrs):
@@ -37,11 +38,23 @@ class Config(metaclass=ConfigMeta):
     # be processed during validation
     exclude = False
 
+    # the name of a field that increases whenever an object is modified
+    # (e.g. an auto_now timestamp). If set, the instance method validators
+    # only re-validate the objects that have changed since the last run
+    incremental_field = None
+
+    # how the objects are fetched during validation: "chunked" (a
+    # server-side cursor) or "keyset" (separate queries for each page of
+    # primary keys). Defaults to settings.DATAVALIDATION_ITERATOR
+    iterator = None
+
 
 @lru_cache(maxsize=None)
 def get_config(model: Type[models.Model]) -> Type[Config]:
     """ return the configuration on a model """
-    for name, member in inspect.getmembers(model):
-        if isinstance(member, type) and issubclass(member, Config):
+    # nb. configs are not inherited (see ConfigMeta.__get__) so only the
+    # attributes defined on the model itself need to be checked
+    for member in vars(model).values():
+        if isinstance(member, ConfigMeta) and member._owner_qualname == model.__qualname__:
             return member
     return Config
@@ -7,3 +7,32 @@ MAX_DESCRIPTION_LEN = getattr(settings,
 
 
 MAX_TRACEBACK_LEN = 2000
+
+# the number of FailingObjects buffered per validator before they are
+# written to the database in bulk
+FLUSH_SIZE = getattr(settings, "DATAVALIDATION_FLUSH_SIZE", 1000)
+
+# how the objects of a model are fetched during validation. "chunked" uses
+# a server-side cursor, "keyset" fetches pages ordered by primary key
+ITERATOR = getattr(settings, "DATAVALIDATION_ITERATOR", "chunked")
+ITERATORS = ("chunked", "keyset")
+
+# the minimum number of seconds between the checkpoints of a (serial) scan
+# of a model, from which an interrupted run can be resumed
+CHECKPOINT_INTERVAL = getattr(settings, "DATAVALIDATION_CHECKPOINT_INTERVAL", 60)
+
+# if set, validate writes metrics in the prometheus text format to this file
+# (e.g. for the node_exporter textfile collector)
+METRICS_FILE = getattr(settings, "DATAVALIDATION_METRICS_FILE", None)
+
+# the maximum number of calls of async data validators awaited at the same
+# time while validating a chunk of objects
+ASYNC_CONCURRENCY = getattr(settings, "DATAVALIDATION_ASYNC_CONCURRENCY", 100)
+
+# the maximum number of results cached per validator (see data_validator's
+# cache argument)
+RESULT_CACHE_SIZE = getattr(settings, "DATAVALIDATION_RESULT_CACHE_SIZE", 1000000)
+
+# the number of runs of consecutive primary keys of failing objects kept in
+# memory per validator before they are written to a temporary file
+FAILURES_SPILL_SIZE = getattr(settings, "DATAVALIDATION_FAILURES_SPILL_SIZE", 1000000)
@@ -1,7 +1,14 @@
 import sys
 import logging
+import threading
+from contextlib import contextmanager
+from typing import Generator, List
 
-from termcolor import colored
+
+def colored(text: str, **kwargs) -> str:
+    # nb. termcolor is imported on first use to keep importing the package light
+    from termcolor import colored
+    return colored(text, **kwargs)
 
 
 class ColouredLogger(logging.Logger):
@@ -18,11 +25,44 @@ class ColouredLogger(logging.Logger):
         self.error(colored(message, color="red", attrs=["bold"]))
 
 
+class DeferredOutputFilter(logging.Filter):
+    """ hold back the records of threads that are grouping their output """
+    local = threading.local()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        records = getattr(self.local, "records", None)
+        if records is None:
+            return True
+        records.append(record)
+        return False
+
+
 logger = logging.getLogger("datavalidation")
 logger.setLevel(logging.INFO)
 
 handler = logging.StreamHandler(sys.stdout)
 handler.formatter = logging.Formatter("%(message)s")
+handler.addFilter(DeferredOutputFilter())
 logger.addHandler(handler)
 
 logger.__class__ = ColouredLogger
+
+_output_lock = threading.Lock()
+
+
+@contextmanager
+def grouped_output() -> Generator[List[logging.LogRecord], None, None]:
+    """ defer the output of the current thread and emit it in one block
+
+     used when validating models concurrently so that the output of each
+     model is not interleaved with the others
+    """
+    records: List[logging.LogRecord] = []
+    DeferredOutputFilter.local.records = records
+    try:
+        yield records
+    finally:
+        DeferredOutputFilter.local.records = None
+        with _output_lock:
+            for record in records:
+                handler.handle(record)
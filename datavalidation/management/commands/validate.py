@@ -1,16 +1,43 @@
+from argparse import ArgumentTypeError
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from itertools import chain
-from typing import List, Tuple
+import time
+from typing import Dict, Iterable, List, Tuple, Union
 
 from django.apps import apps
 from django.core.management.base import BaseCommand
+from django.db import router
 from termcolor import colored as coloured
 
+from datavalidation.constants import METRICS_FILE
+from datavalidation.metrics import METRICS
+from datavalidation.models import FailingObject
+from datavalidation.parallel import close_connections, supports_concurrent_writes, thread_pool
 from datavalidation.registry import REGISTRY, ValidatorInfo
 from datavalidation.results import SummaryEx, Status
 from datavalidation.runners import ModelValidationRunner
 from datavalidation.utils import sysexit, timer
-from datavalidation.logging import logger
+from datavalidation.logging import grouped_output, logger
+
+
+def parse_sample(value: str) -> Union[int, float]:
+    """ parse --sample as a percentage (e.g. 1%) or a number of objects """
+    try:
+        if value.endswith("%"):
+            sample = float(value[:-1]) / 100
+            if 0 < sample <= 1:
+                return sample
+        else:
+            sample = int(value)
+            if sample > 0:
+                return sample
+    except ValueError:
+        pass
+    raise ArgumentTypeError(
+        f"expected a percentage (e.g. 1%) or a positive number of objects, got: {value}"
+    )
 
 
 class Command(BaseCommand):
@@ -28,6 +55,69 @@ class Command(BaseCommand):
         parser.add_argument(
             "labels", nargs="*", type=str, help=help_text
         )
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="the number of processes used to run the instance method "
+                 "validators of each model (default: 1)"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=1,
+            help="the number of models to validate concurrently (default: 1)"
+        )
+        parser.add_argument(
+            "--by-database", action="store_true", default=False,
+            help="group the models by the database they are read from (see "
+                 "DATABASE_ROUTERS) and validate the databases in parallel, "
+                 "each with up to --concurrency models at a time"
+        )
+        parser.add_argument(
+            "--class-workers", type=int, default=1,
+            help="the number of class method validators to run at the same "
+                 "time, each on its own database connection. The pool is "
+                 "shared by all models (default: 1)"
+        )
+        parser.add_argument(
+            "--full", action="store_true", default=False,
+            help="re-validate all objects of models that are configured for "
+                 "incremental validation"
+        )
+        parser.add_argument(
+            "--resume", action="store_true", default=False,
+            help="continue the validation of each model from the last "
+                 "checkpoint of an interrupted run"
+        )
+        parser.add_argument(
+            "--metrics-file", type=str, default=METRICS_FILE,
+            help="write prometheus metrics of the run to this file when it "
+                 "completes (e.g. for the node_exporter textfile collector)"
+        )
+        parser.add_argument(
+            "--metrics-port", type=int, default=None,
+            help="serve prometheus metrics at http://<addr>:<port>/metrics "
+                 "while validating"
+        )
+        parser.add_argument(
+            "--metrics-addr", type=str, default="127.0.0.1",
+            help="the address to serve the metrics on with --metrics-port "
+                 "(default: 127.0.0.1, use 0.0.0.0 for all interfaces)"
+        )
+        parser.add_argument(
+            "--sample", type=parse_sample, default=None,
+            help="only validate a random sample of the objects of each model, "
+                 "given as a percentage (e.g. 1%%) or a number of objects. The "
+                 "class method validators are skipped and the results are not "
+                 "saved"
+        )
+        parser.add_argument(
+            "--deadline", type=float, default=None,
+            help="stop calling the validators after this many seconds. The "
+                 "validators that were cut short have the status TIMEOUT"
+        )
+        parser.add_argument(
+            "--fail-fast", action="store_true", default=False,
+            help="stop running each validator at its first failure (the "
+                 "results of the failing validators are truncated)"
+        )
 
     @staticmethod
     def parse_label(label: str) -> List[ModelValidationRunner]:
@@ -64,6 +154,11 @@ class Command(BaseCommand):
     @timer(output=logger.cinfo)
     def handle(self, *args, **options) -> int:
         """ run the data validation """
+        # start the clock before the runners are initialised
+        deadline = None
+        if options["deadline"] is not None:
+            deadline = time.time() + options["deadline"]
+
         labels = options["labels"]
         if len(labels) == 0:
             # init runners first so that they can validate the inputs
@@ -71,20 +166,50 @@ class Command(BaseCommand):
         else:
             runners = list(chain(*[self.parse_label(label) for label in labels]))
 
+        # create the Validator records (and cache their ids) up front
+        # rather than one at a time as each validator is run. nb. this
+        # must happen before run_runners/run_databases start their threads
+        REGISTRY.sync_to_db()
+
+        # the runners write the results concurrently unless they run one
+        # at a time
+        concurrent = options["class_workers"] > 1 or options["concurrency"] > 1 \
+            or options["by_database"]
+        if concurrent and not supports_concurrent_writes(router.db_for_write(FailingObject)):
+            logger.cwarning("the database of the validation results does not support "
+                            "concurrent writes: validating one model at a time")
+            options.update(class_workers=1, concurrency=1, by_database=False)
+
+        if options["metrics_port"] is not None:
+            METRICS.serve(options["metrics_port"], options["metrics_addr"])
+
         totals = Counter()
-        for runner in runners:
-            summaries = runner.run(show_progress=True)
-            self.print_summaries(summaries)
-            for valinfo, summary in summaries:
-                totals[summary.status] += 1
+        with thread_pool(options["class_workers"]) as class_pool:
+            run_options = {
+                "workers": options["workers"],
+                "full": options["full"],
+                "sample": options["sample"],
+                "resume": options["resume"],
+                "deadline": deadline,
+                "fail_fast": options["fail_fast"],
+                "class_pool": class_pool,
+            }
+            if options["by_database"]:
+                results = self.run_databases(runners, options["concurrency"], **run_options)
+            else:
+                results = self.run_runners(runners, options["concurrency"], **run_options)
+            for summaries in results:
+                for valinfo, summary in summaries:
+                    totals[summary.status] += 1
 
         result_str = (
             f"Total Passing: {totals[Status.PASSING]}\n"
             f"Total Failing: {totals[Status.FAILING]}\n"
             f"Total Exceptions: {totals[Status.EXCEPTION]}\n"
+            f"Total Timeouts: {totals[Status.TIMEOUT]}\n"
             f"Total Uninitialized: {totals[Status.UNINITIALIZED]}\n"
         )
-        if totals[Status.FAILING] + totals[Status.EXCEPTION] > 0:
+        if totals[Status.FAILING] + totals[Status.EXCEPTION] + totals[Status.TIMEOUT] > 0:
             exit_code = 1
             colour = "red"
         elif totals[Status.PASSING] == 0:
@@ -96,8 +221,98 @@ class Command(BaseCommand):
 
         logger.info("="*70)
         logger.info(coloured(result_str, colour, attrs=["bold"]))
+        if options["metrics_file"]:
+            METRICS.write_textfile(options["metrics_file"])
         return exit_code
 
+    @classmethod
+    def run_runners(cls,
+                    runners: List[ModelValidationRunner],
+                    concurrency: int,
+                    **run_options
+                    ) -> Iterable[List[Tuple[ValidatorInfo, SummaryEx]]]:
+        """ run the model runners and print their summaries
+
+         run_options are passed to ModelValidationRunner.run
+
+         if concurrency is greater than 1 the models are validated in a
+         thread pool, and the output of each model is printed in one block
+         when it completes
+
+         :returns: the summaries of each runner (in the order of runners)
+        """
+        if concurrency <= 1:
+            for runner in runners:
+                summaries = runner.run(show_progress=True, **run_options)
+                cls.print_summaries(summaries)
+                yield summaries
+            return
+
+        run = close_connections(partial(cls.run_grouped, **run_options))
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            yield from pool.map(run, runners)
+
+    @staticmethod
+    def group_by_database(runners: List[ModelValidationRunner]
+                          ) -> Dict[str, List[ModelValidationRunner]]:
+        """ group the runners by the database their model is read from """
+        groups: Dict[str, List[ModelValidationRunner]] = {}
+        for runner in runners:
+            groups.setdefault(router.db_for_read(runner.model), []).append(runner)
+        return groups
+
+    @classmethod
+    def run_databases(cls,
+                      runners: List[ModelValidationRunner],
+                      concurrency: int,
+                      **run_options
+                      ) -> List[List[Tuple[ValidatorInfo, SummaryEx]]]:
+        """ run the model runners of each database in parallel
+
+         each database is validated in its own thread with up to
+         concurrency models at a time (so each database gets its own
+         connection budget), and the output of each model is printed in
+         one block when it completes
+
+         :returns: the summaries of each runner (in the order of runners)
+        """
+        groups = cls.group_by_database(runners)
+        run = partial(cls.run_database, concurrency=concurrency, **run_options)
+        with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+            results = dict(zip(groups.keys(), pool.map(run, groups.values())))
+        summaries = {
+            runner: runner_summaries
+            for alias, group in groups.items()
+            for runner, runner_summaries in zip(group, results[alias])
+        }
+        return [summaries[runner] for runner in runners]
+
+    @classmethod
+    def run_database(cls,
+                     runners: List[ModelValidationRunner],
+                     concurrency: int,
+                     **run_options
+                     ) -> List[List[Tuple[ValidatorInfo, SummaryEx]]]:
+        """ run the model runners of one database, up to concurrency at a
+            time
+        """
+        run = close_connections(partial(cls.run_grouped, **run_options))
+        if concurrency <= 1:
+            return [run(runner) for runner in runners]
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(run, runners))
+
+    @classmethod
+    def run_grouped(cls,
+                    runner: ModelValidationRunner,
+                    **run_options
+                    ) -> List[Tuple[ValidatorInfo, SummaryEx]]:
+        """ run a model runner and print its output in one block """
+        with grouped_output():
+            summaries = runner.run(show_progress=False, **run_options)
+            cls.print_summaries(summaries)
+        return summaries
+
     @staticmethod
     def print_summaries(summaries: List[Tuple[ValidatorInfo, SummaryEx]]):
         for valinfo, summary in summaries:
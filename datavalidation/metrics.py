@@ -0,0 +1,202 @@
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from .results import SummaryEx
+
+
+# name: (type, help)
+METRIC_TYPES = {
+    "datavalidation_rows_scanned_total": (
+        "counter", "objects scanned by the instance method validators"
+    ),
+    "datavalidation_rows_scanned_per_second": (
+        "gauge", "objects scanned per second in the last scan of the model"
+    ),
+    "datavalidation_scan_duration_seconds": (
+        "gauge", "duration of the last scan of the model by the instance method validators"
+    ),
+    "datavalidation_validator_duration_seconds": (
+        "gauge", "total execution time of the validator in the last run"
+    ),
+    "datavalidation_last_run_timestamp_seconds": (
+        "gauge", "unix time of the last run of the validator"
+    ),
+    "datavalidation_validator_calls_total": (
+        "counter", "calls of the validator (one per object for instance method validators)"
+    ),
+    "datavalidation_validator_latency_seconds": (
+        "summary", "time per object spent in the validator"
+    ),
+    "datavalidation_persistence_latency_seconds": (
+        "summary", "time per object spent saving the result of the validator"
+    ),
+    "datavalidation_failures": (
+        "gauge", "objects failing the validator in the last run"
+    ),
+    "datavalidation_exceptions_total": (
+        "counter", "runs of the validator that raised an exception"
+    ),
+    "datavalidation_timeouts_total": (
+        "counter", "runs of the validator that ran out of time"
+    ),
+    "datavalidation_truncations_total": (
+        "counter", "runs of the validator that were stopped at max_failures"
+    ),
+    "datavalidation_failing_objects_written_total": (
+        "counter", "FailingObject records created or updated"
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def get_family(name: str) -> str:
+    """ return the name of the metric that a series belongs to (the _sum
+        and _count series of a summary belong to the summary)
+    """
+    for suffix in ("_sum", "_count"):
+        family = name[:-len(suffix)]
+        if name.endswith(suffix) and METRIC_TYPES.get(family, ("",))[0] == "summary":
+            return family
+    return name
+
+
+class Metrics:
+    """ the metrics of the validation runs in this process, in the
+        prometheus text exposition format
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples: Dict[str, Dict[Labels, float]] = {}
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        assert get_family(name) in METRIC_TYPES
+        with self.lock:
+            self.samples.setdefault(name, {})[tuple(sorted(labels.items()))] = value
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        assert get_family(name) in METRIC_TYPES
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            samples = self.samples.setdefault(name, {})
+            samples[key] = samples.get(key, 0) + value
+
+    def clear(self) -> None:
+        with self.lock:
+            self.samples.clear()
+
+    def record_scan(self, model: str, num_scanned: int, seconds: float) -> None:
+        """ record a scan of the objects of a model """
+        self.inc("datavalidation_rows_scanned_total", num_scanned, model=model)
+        self.set("datavalidation_scan_duration_seconds", seconds, model=model)
+        if seconds > 0:
+            self.set("datavalidation_rows_scanned_per_second",
+                     num_scanned / seconds, model=model)
+
+    def record_summary(self,
+                       model: str,
+                       validator: str,
+                       summary: SummaryEx,
+                       execution_time: Optional[float]) -> None:
+        """ record the (completed) summary of a validator """
+        labels = {"model": model, "validator": validator}
+        self.set("datavalidation_last_run_timestamp_seconds", time.time(), **labels)
+        if execution_time is not None:
+            self.set("datavalidation_validator_duration_seconds", execution_time, **labels)
+        if summary.is_exception:
+            self.inc("datavalidation_exceptions_total", **labels)
+        elif summary.failures is not None:
+            self.set("datavalidation_failures", len(summary.failures), **labels)
+        if summary.timed_out:
+            self.inc("datavalidation_timeouts_total", **labels)
+        if summary.truncated:
+            self.inc("datavalidation_truncations_total", **labels)
+        if summary.validator_latency:
+            self.inc("datavalidation_validator_calls_total",
+                     summary.validator_latency.count, **labels)
+        else:
+            self.inc("datavalidation_validator_calls_total", **labels)
+        for name, histogram in (
+                ("datavalidation_validator_latency_seconds", summary.validator_latency),
+                ("datavalidation_persistence_latency_seconds", summary.persistence_latency)):
+            if not histogram:
+                continue
+            # the quantiles are of the last run, the sum and count accumulate
+            for percentile in histogram.PERCENTILES:
+                self.set(name, histogram.percentile(percentile),
+                         quantile=str(percentile / 100), **labels)
+            self.set(name, histogram.max, quantile="1.0", **labels)
+            self.inc(f"{name}_sum", histogram.total, **labels)
+            self.inc(f"{name}_count", histogram.count, **labels)
+        self.inc("datavalidation_failing_objects_written_total",
+                 summary.num_written, **labels)
+
+    def render(self) -> str:
+        """ return the metrics in the prometheus text exposition format """
+        lines = []
+        with self.lock:
+            families: Dict[str, List[str]] = {}
+            for name in self.samples:
+                families.setdefault(get_family(name), []).append(name)
+            for family, names in sorted(families.items()):
+                metric_type, help_text = METRIC_TYPES[family]
+                lines.append(f"# HELP {family} {help_text}")
+                lines.append(f"# TYPE {family} {metric_type}")
+                for name in sorted(names):
+                    for labels, value in sorted(self.samples[name].items()):
+                        label_str = ",".join(f'{k}="{escape(v)}"' for k, v in labels)
+                        lines.append(f"{name}{{{label_str}}} {value!r}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """ write the metrics to a file for the node_exporter textfile
+            collector (atomically, so a partial file is never scraped)
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.render())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def serve(self, port: int, addr: str = "127.0.0.1") -> HTTPServer:
+        """ serve the metrics at http://<addr>:<port>/metrics in a daemon
+            thread (only on the loopback interface unless addr is given)
+        """
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = HTTPServer((addr, port), MetricsHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return server
+
+
+METRICS = Metrics()
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.13 on 2026-10-18 08:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datavalidation', '0004_auto_20200724_1816'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='validator',
+            name='high_water_mark',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.13 on 2026-10-18 08:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datavalidation', '0006_validator_latency'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='validator',
+            name='checkpoint',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
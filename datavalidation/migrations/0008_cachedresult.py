@@ -0,0 +1,27 @@
+# Generated by Django 4.1.13 on 2026-10-18 09:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datavalidation', '0007_validator_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CachedResult',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_pk', models.PositiveIntegerField()),
+                ('fingerprint', models.BigIntegerField()),
+                ('result', models.PositiveSmallIntegerField()),
+                ('validator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cached_results', to='datavalidation.validator')),
+            ],
+            options={
+                'unique_together': {('validator', 'object_pk')},
+            },
+        ),
+    ]
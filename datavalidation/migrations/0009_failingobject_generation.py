@@ -0,0 +1,38 @@
+# Generated by Django 4.1.13 on 2026-10-18 09:14
+
+from django.db import migrations, models
+
+
+def set_generation(apps, schema_editor):
+    # the valid records belong to the last run (generation 1) of each validator
+    FailingObject = apps.get_model('datavalidation', 'FailingObject')
+    FailingObject.objects.filter(is_valid=True).update(generation=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datavalidation', '0008_cachedresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='failingobject',
+            name='generation',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='validator',
+            name='generation',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.RunPython(set_generation, migrations.RunPython.noop),
+        migrations.AlterIndexTogether(
+            name='failingobject',
+            index_together={('validator', 'generation'), ('validator', 'object_pk')},
+        ),
+        migrations.RemoveField(
+            model_name='failingobject',
+            name='is_valid',
+        ),
+    ]
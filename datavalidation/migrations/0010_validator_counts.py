@@ -0,0 +1,40 @@
+# Generated by Django 4.1.13 on 2026-10-18 09:16
+
+from django.db import migrations, models
+from django.db.models import Count, F, Q
+
+
+def count_failing_objects(apps, schema_editor):
+    Validator = apps.get_model('datavalidation', 'Validator')
+    is_current = Q(failing_objects__generation__gte=F('generation'))
+    counts = Validator.objects.annotate(
+        failing=Count('failing_objects', filter=is_current),
+        allowed_to_fail=Count(
+            'failing_objects', filter=is_current & Q(failing_objects__allowed_to_fail=True)
+        ),
+    )
+    for validator in counts:
+        Validator.objects.filter(id=validator.id).update(
+            num_failing=validator.failing, num_allowed_to_fail=validator.allowed_to_fail
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datavalidation', '0009_failingobject_generation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='validator',
+            name='num_allowed_to_fail',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='validator',
+            name='num_failing',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_failing_objects, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.13 on 2026-10-18 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datavalidation', '0010_validator_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='validator',
+            name='run_generation',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.1.13 on 2026-10-18 11:02
+
+from django.db import migrations
+from django.db.models import F
+
+
+def hide_old_generations(apps, schema_editor):
+    # hidden records used to be the ones older than the generation of their
+    # validator, now they have generation 0
+    FailingObject = apps.get_model('datavalidation', 'FailingObject')
+    FailingObject.objects.filter(
+        generation__lt=F('validator__generation')
+    ).update(generation=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('datavalidation', '0011_validator_run_generation'),
+    ]
+
+    operations = [
+        migrations.RunPython(hide_old_generations, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,13 @@
+import json
 import sys
 import traceback
-from typing import TYPE_CHECKING, Type
+from typing import TYPE_CHECKING, Dict, Optional, Type
 
 import enumfields
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
-from django.db.models import QuerySet
+from django.db.models import F, QuerySet
 from django.urls import reverse, NoReverseMatch
 
 from .constants import (
@@ -17,6 +18,7 @@ from .results import ExceptionInfo, Status
 
 
 __all__ = (
+    "CachedResult",
     "DataValidationMixin",
     "FailingObject",
     "Validator",
@@ -71,6 +73,22 @@ class Validator(ExceptionInfoMixin, models.Model):
     status = enumfields.EnumIntegerField(Status, default=Status.UNINITIALIZED)
     num_passing = models.PositiveIntegerField(blank=True, null=True)
     num_na = models.PositiveIntegerField(blank=True, null=True)
+    # the greatest value of Config.incremental_field that has been validated
+    high_water_mark = models.TextField(blank=True, null=True)
+    # json: percentiles of the time per object spent in the validator and
+    # saving its result (instance-method validators only)
+    latency = models.TextField(blank=True, null=True)
+    # json: the progress of an interrupted run of the validator
+    checkpoint = models.TextField(blank=True, null=True)
+    # the generation of the FailingObjects written by the last completed run
+    generation = models.PositiveIntegerField(default=1)
+    # the generation being written by a run in progress (or interrupted)
+    run_generation = models.PositiveIntegerField(blank=True, null=True)
+    # the number of (current) FailingObjects, and of those allowed to fail.
+    # These are recounted at the end of each run and kept up to date in
+    # between by single object validation and edits of allowed_to_fail
+    num_failing = models.PositiveIntegerField(default=0)
+    num_allowed_to_fail = models.PositiveIntegerField(default=0)
 
     class Meta:
         index_together = ("app_label", "model_name", "method_name")
@@ -86,6 +104,22 @@ class Validator(ExceptionInfoMixin, models.Model):
     def get_num_allowed_to_fail(self):
         return self.failing_objects.filter(allowed_to_fail=True).count()
 
+    @classmethod
+    def add_to_counts(cls,
+                      validator_id: int,
+                      num_failing: int = 0,
+                      num_allowed_to_fail: int = 0) -> None:
+        """ add to the counts of the FailingObjects of a validator """
+        if num_failing == 0 and num_allowed_to_fail == 0:
+            return
+        cls.objects.filter(id=validator_id).update(
+            num_failing=F("num_failing") + num_failing,
+            num_allowed_to_fail=F("num_allowed_to_fail") + num_allowed_to_fail,
+        )
+
+    def get_latency(self) -> Optional[Dict[str, Dict[str, float]]]:
+        return None if self.latency is None else json.loads(self.latency)
+
     @classmethod
     def get_status_for_model(cls, model: Type[models.Model]) -> Status:
         """ return the datavalidation status for the model """
@@ -100,6 +134,8 @@ class Validator(ExceptionInfoMixin, models.Model):
                 model_status = Status.PASSING
             elif status == Status.FAILING:
                 model_status = Status.FAILING
+            elif status == Status.TIMEOUT and model_status != Status.FAILING:
+                model_status = Status.TIMEOUT
             if status == Status.EXCEPTION:
                 return Status.EXCEPTION
         return model_status
@@ -107,7 +143,9 @@ class Validator(ExceptionInfoMixin, models.Model):
 
 class FailingObjectManager(models.Manager):
     def get_queryset(self):
-        return super().get_queryset().filter(is_valid=True)
+        # the failures of the last completed run and of a run in progress
+        # (older records are hidden by setting their generation to 0)
+        return super().get_queryset().filter(generation__gt=0)
 
 
 class FailingObject(models.Model):
@@ -133,16 +171,18 @@ class FailingObject(models.Model):
     allowed_to_fail = models.BooleanField(default=False)
     allowed_to_fail_justification = models.TextField(blank=True, verbose_name="justification")
 
-    # control variable: existing records are marked as invalid prior to
-    # running the validation so that objects that have been marked
-    # allowed_to_fail by the user are not deleted
-    is_valid = models.BooleanField()
+    # control variable: the generation of the run that last found the
+    # object failing. Records from older runs are deleted at the end of a
+    # run, unless they have been marked allowed_to_fail by the user (so
+    # they are not lost if the object fails again), in which case they are
+    # hidden with generation 0
+    generation = models.PositiveIntegerField(default=0)
 
     objects = FailingObjectManager()
     all_objects = models.Manager()
 
     class Meta:
-        index_together = ("validator", "object_pk")
+        index_together = (("validator", "object_pk"), ("validator", "generation"))
         unique_together = ("validator", "object_pk")
         ordering = ("object_pk",)
 
@@ -175,6 +215,27 @@ class FailingObject(models.Model):
         )
 
 
+class CachedResult(models.Model):
+    """ the last result of an instance-method validator for an object,
+        keyed on a fingerprint of the object and the validator
+    """
+    validator = models.ForeignKey(
+        Validator,
+        on_delete=models.CASCADE,
+        related_name="cached_results",
+        db_index=True,
+    )
+    object_pk = models.PositiveIntegerField()
+    # hash of the values of the fields read by the validator and of the
+    # source code of the validator
+    fingerprint = models.BigIntegerField()
+    # the code of the PASS, FAIL or NA result (see ResultCache.RESULTS)
+    result = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ("validator", "object_pk")
+
+
 if TYPE_CHECKING:
     _Base = models.Model
 else:
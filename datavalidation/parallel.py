@@ -0,0 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Generator, Optional
+
+import django
+from django.db import connections
+
+from .registry import REGISTRY
+
+
+def init_worker() -> None:
+    """ prepare a worker process to use the django ORM
+
+     forked workers inherit the parent's (closed) connections and each
+     opens its own on first use. Spawned workers need to set up django.
+    """
+    django.setup()
+    connections.close_all()
+    # forked workers inherit the ids of the validators, spawned workers
+    # fetch them (in one query)
+    REGISTRY.sync_to_db()
+
+
+@contextmanager
+def process_pool(workers: int) -> Generator[ProcessPoolExecutor, None, None]:
+    """ a process pool in which each worker has its own database connection """
+    REGISTRY.sync_to_db()
+    # the connections must not be shared with the child processes
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        yield pool
+
+
+def supports_concurrent_writes(using: str) -> bool:
+    """ return False if the database cannot be written by more than one
+        connection at a time
+
+     sqlite locks the whole database for a write, so concurrent writers
+     fail with "database is locked" (or, with a shared cache, "database
+     table is locked") rather than waiting for each other
+    """
+    return connections[using].vendor != "sqlite"
+
+
+def close_connections(func: Callable) -> Callable:
+    """ close the database connections that were opened by the calling
+        thread once the function returns (for use in thread pools)
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            connections.close_all()
+    return wrapper
+
+
+@contextmanager
+def thread_pool(workers: int) -> Generator[Optional[ThreadPoolExecutor], None, None]:
+    """ a thread pool for tasks that wait on the database (each thread
+        opens its own connection), or None if workers is not more than 1
+
+     submit functions wrapped with close_connections
+    """
+    if workers <= 1:
+        yield None
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield pool
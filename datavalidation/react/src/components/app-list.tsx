@@ -52,6 +52,10 @@ function buildNestedValidatorSummary(validators: IValidator[]): IAppList {
             else if (child.status === Status.FAILING) {
                 parent.status = Status.FAILING ;
             }
+            else if (child.status === Status.TIMEOUT &&
+                     parent.status !== Status.FAILING) {
+                parent.status = Status.TIMEOUT;
+            }
             else if (child.status === Status.EXCEPTION) {
                 parent.status = Status.EXCEPTION;
                 break;
@@ -18,6 +18,7 @@ const getIcon = (status: Status): FC<SVGProps<SVGSVGElement>> => {
             return Cross;
         case Status.EXCEPTION:
         case Status.WARNING:
+        case Status.TIMEOUT:
             return Exclamation;
     }
 }
@@ -33,6 +34,7 @@ export const getStatusColour = (status: Status, onDark: boolean = false): string
         case Status.EXCEPTION:
             return onDark ? "#c6d2cd" : "#7e8482";
         case Status.WARNING:
+        case Status.TIMEOUT:
             return onDark ? "#fff409" : "#847e05";
     }
 }
@@ -44,6 +46,7 @@ export const getStatusContrastColour = (status: Status, onDark: boolean = false)
         case Status.PASSING:
         case Status.EXCEPTION:
         case Status.WARNING:
+        case Status.TIMEOUT:
             return onDark ? "#696969" : "#fff";
         case Status.FAILING:
             return "#fff";
@@ -4,4 +4,5 @@ export enum Status {
     FAILING = 2,
     EXCEPTION = 3,
     WARNING = 4,
+    TIMEOUT = 5,
 }
\ No newline at end of file
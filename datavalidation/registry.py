@@ -1,14 +1,15 @@
 import inspect
-from functools import lru_cache
 from typing import (
-    Callable, Dict, Optional, Sequence, Type, Union, Set
+    Callable, Dict, List, Optional, Sequence, Tuple, Type, Union, Set
 )
 
 from dataclasses import dataclass, field
-from django.db import models
+from django.db import models, transaction
+from django.db.models.constants import LOOKUP_SEP
 
 from .config import get_config
 from .constants import MAX_DESCRIPTION_LEN
+from .logging import logger
 from .types import ValidatorType
 
 
@@ -17,6 +18,12 @@ class DecoratorArgs:
     """ arguments passed to the data_validator decorator """
     select_related: Set[str] = field(default_factory=tuple)
     prefetch_related: Set[str] = field(default_factory=tuple)
+    only: Optional[Set[str]] = None
+    defer: Set[str] = field(default_factory=tuple)
+    batch: bool = False
+    timeout: Optional[float] = None
+    max_failures: Optional[int] = None
+    cache: bool = False
 
 
 @dataclass
@@ -25,10 +32,22 @@ class ValidatorInfo:
     model_info: "ModelInfo"
     method_name: str
     description: str
+    # the valid select_related and prefetch_related lookups
     select_related: set
     prefetch_related: set
+    only: Optional[set] = None
+    defer: set = field(default_factory=set)
+    # the maximum number of seconds to spend running the validator
+    timeout: Optional[float] = None
+    # stop running the validator after this many failures
+    max_failures: Optional[int] = None
     instance_method: Optional[ValidatorType] = None
+    # True if the instance method is a coroutine function
+    is_async: bool = False
+    # reuse the results of objects that have not changed since the last run
+    cache: bool = False
     class_method: Optional[ValidatorType] = None
+    batch_method: Optional[ValidatorType] = None
 
     def __str__(self):
         mi = self.model_info
@@ -37,19 +56,29 @@ class ValidatorInfo:
     def __hash__(self):
         return hash(str(self))
 
-    @lru_cache(maxsize=None)
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return self.model_info.app_label, self.model_info.model_name, self.method_name
+
     def get_validator_id(self) -> int:
-        """ return the primary key of the corresponding ValidationMethod """
-        from .models import Validator
-        obj, _ = Validator.objects.update_or_create(
-            app_label=self.model_info.app_label,
-            model_name=self.model_info.model_name,
-            method_name=self.method_name,
-            defaults={
-                "description": self.description,
-            }
-        )
-        return obj.id
+        """ return the primary key of the corresponding ValidationMethod
+
+         the ids are cached in REGISTRY.validator_ids (see
+         Registry.sync_to_db), otherwise the record is created or updated
+        """
+        validator_id = REGISTRY.validator_ids.get(self.key)
+        if validator_id is None:
+            from .models import Validator
+            obj, _ = Validator.objects.update_or_create(
+                app_label=self.model_info.app_label,
+                model_name=self.model_info.model_name,
+                method_name=self.method_name,
+                defaults={
+                    "description": self.description,
+                }
+            )
+            validator_id = REGISTRY.validator_ids[self.key] = obj.id
+        return validator_id
 
 
 @dataclass
@@ -66,10 +95,17 @@ class ModelInfo:
     def __hash__(self):
         return hash(str(self))
 
-    @lru_cache(maxsize=None)
     def get_content_type_id(self) -> int:
-        from django.contrib.contenttypes.models import ContentType
-        return ContentType.objects.get_for_model(self.model).id
+        """ return the primary key of the ContentType of the model (cached
+            in REGISTRY.content_type_ids)
+        """
+        key = (self.app_label, self.model_name)
+        content_type_id = REGISTRY.content_type_ids.get(key)
+        if content_type_id is None:
+            from django.contrib.contenttypes.models import ContentType
+            content_type_id = ContentType.objects.get_for_model(self.model).id
+            REGISTRY.content_type_ids[key] = content_type_id
+        return content_type_id
 
 
 class RegistryKeyError(Exception):
@@ -81,6 +117,10 @@ class Registry(dict):
     def __init__(self):
         super().__init__()
         self.synced = False
+        # (app_label, model_name, method_name): the id of the Validator
+        self.validator_ids: Dict[Tuple[str, str, str], int] = {}
+        # (app_label, model_name): the id of the ContentType of the model
+        self.content_type_ids: Dict[Tuple[str, str], int] = {}
 
     def __getitem__(self, item):
         try:
@@ -89,22 +129,81 @@ class Registry(dict):
             raise RegistryKeyError(f"{item} not in REGISTRY")
 
     def sync_to_db(self):
-        """ ensure a record for each validator exists in the database """
+        """ ensure a record for each validator exists in the database, and
+            cache the ids of the validators and the content types
+
+         the existing records are fetched in one query, and the missing
+         or changed ones are written in bulk
+        """
         if self.synced:
             return
-        for model_info in self.values():
-            for valinfo in model_info.validators.values():
-                valinfo.get_validator_id()
+        from django.contrib.contenttypes.models import ContentType
+        from .models import Validator
+
+        valinfos = {
+            valinfo.key: valinfo
+            for model_info in self.values()
+            for valinfo in model_info.validators.values()
+        }
+        existing = {
+            (obj.app_label, obj.model_name, obj.method_name): obj
+            for obj in Validator.objects.only(
+                "app_label", "model_name", "method_name", "description"
+            )
+        }
+        objects_to_create, objects_to_update = [], []
+        for key, valinfo in valinfos.items():
+            obj = existing.get(key)
+            if obj is None:
+                app_label, model_name, method_name = key
+                objects_to_create.append(Validator(app_label=app_label,
+                                                   model_name=model_name,
+                                                   method_name=method_name,
+                                                   description=valinfo.description))
+            elif obj.description != valinfo.description:
+                obj.description = valinfo.description
+                objects_to_update.append(obj)
+
+        with transaction.atomic():
+            Validator.objects.bulk_update(objects_to_update, ["description"])
+            # nb. another process may be creating the same records
+            Validator.objects.bulk_create(objects_to_create, ignore_conflicts=True)
+        if len(objects_to_create) != 0:
+            # the ids of the created records are not returned on all backends
+            existing = {
+                (obj.app_label, obj.model_name, obj.method_name): obj
+                for obj in Validator.objects.only("app_label", "model_name", "method_name")
+            }
+        self.validator_ids.update({key: existing[key].id for key in valinfos})
+
+        content_types = ContentType.objects.get_for_models(
+            *[model_info.model for model_info in self.values() if model_info.model is not None]
+        )
+        self.content_type_ids.update({
+            (model._meta.app_label, model.__name__): content_type.id  # noqa
+            for model, content_type in content_types.items()
+        })
         self.synced = True
 
 
 REGISTRY = Registry()
 
+# (module, qualname) of a class: the names of the data validators defined on
+# it. Recorded by the decorator so that update_registry doesn't need to
+# inspect every model
+DECORATED: Dict[Tuple[str, str], Set[str]] = {}
+
 
 def data_validator(_method: Optional[ValidatorType] = None,
                    *,
                    select_related: Union[Sequence, str, None] = None,
                    prefetch_related: Union[Sequence, str, None] = None,
+                   only: Union[Sequence, str, None] = None,
+                   defer: Union[Sequence, str, None] = None,
+                   batch: bool = False,
+                   timeout: Optional[float] = None,
+                   max_failures: Optional[int] = None,
+                   cache: bool = False,
                    ) -> ValidatorType:
     """ decorator that marks a method as a data validator.
 
@@ -117,9 +216,33 @@ def data_validator(_method: Optional[ValidatorType] = None,
             validation (for classmethod data validators this does nothing)
          prefetch_related: the same as select_related, but for
             prefetch_related
+         only: an optional field name, or list of field names that are
+            the only fields of the model read by the validator. The other
+            fields are deferred when iterating the queryset unless another
+            validator of the model reads them
+         defer: an optional field name, or list of field names that are
+            not read by the validator (the opposite of only)
+         batch: if True the validator is a classmethod that is passed a
+            list of objects and returns the result for each of them (or
+            the objects that fail)
+         timeout: the maximum number of seconds to spend in the validator.
+            Instance method validators stop being called once they have
+            spent this long, and class method validators are cancelled (if
+            the database supports statement timeouts). Either way the
+            validator has the status TIMEOUT
+         max_failures: the maximum number of failing objects to record.
+            Instance method validators stop being called after this many
+            objects fail, and the failures of class method validators are
+            cut off. The summary of the validator is marked as truncated
+         cache: if True the result for each object is cached with a hash
+            of the fields the validator reads and of its source code. If
+            neither has changed since the last run the cached result is
+            used instead of calling the validator (instance methods only)
     """
     if _method is None:
-        return _data_validator(select_related, prefetch_related)
+        return _data_validator(
+            select_related, prefetch_related, only, defer, batch, timeout, max_failures, cache
+        )
     else:
         if select_related is not None:
             raise TypeError("cannot specify select_related when the first "
@@ -127,67 +250,126 @@ def data_validator(_method: Optional[ValidatorType] = None,
         if prefetch_related is not None:
             raise TypeError("cannot specify prefetch_related when the "
                             "first argument is a callable")
+        if only is not None:
+            raise TypeError("cannot specify only when the first argument "
+                            "is a callable")
+        if defer is not None:
+            raise TypeError("cannot specify defer when the first argument "
+                            "is a callable")
+        if batch:
+            raise TypeError("cannot specify batch when the first argument "
+                            "is a callable")
+        if timeout is not None:
+            raise TypeError("cannot specify timeout when the first argument "
+                            "is a callable")
+        if max_failures is not None:
+            raise TypeError("cannot specify max_failures when the first "
+                            "argument is a callable")
+        if cache:
+            raise TypeError("cannot specify cache when the first argument "
+                            "is a callable")
         return _data_validator()(_method)
 
 
+def _to_set(value: Union[Sequence, str, None]) -> Set[str]:
+    """ convert a decorator argument to a set of field names """
+    if value is None:
+        return set()
+    elif isinstance(value, str):
+        return {value}
+    else:
+        return set(value)
+
+
 def _data_validator(select_related: Union[Sequence, str, None] = None,
                     prefetch_related: Union[Sequence, str, None] = None,
+                    only: Union[Sequence, str, None] = None,
+                    defer: Union[Sequence, str, None] = None,
+                    batch: bool = False,
+                    timeout: Optional[float] = None,
+                    max_failures: Optional[int] = None,
+                    cache: bool = False,
                     ) -> Callable:
     """ add decorator arguments to the data validator """
-    if select_related is None:
-        select_related = set()
-    elif isinstance(select_related, str):
-        select_related = {select_related}
-    else:
-        select_related = set(select_related)
-
-    if prefetch_related is None:
-        prefetch_related = set()
-    elif isinstance(prefetch_related, str):
-        prefetch_related = {prefetch_related}
-    else:
-        prefetch_related = set(prefetch_related)
+    if only is not None and defer is not None:
+        raise TypeError("cannot specify both only and defer")
+    if timeout is not None and not timeout > 0:
+        raise ValueError("timeout must be a positive number of seconds")
+    if max_failures is not None and not max_failures > 0:
+        raise ValueError("max_failures must be a positive number of failures")
+    if cache and (select_related or prefetch_related):
+        # the fingerprint of an object does not cover its related objects
+        raise TypeError("cannot cache the results of a validator that reads related objects")
+    select_related = _to_set(select_related)
+    prefetch_related = _to_set(prefetch_related)
+    only = None if only is None else _to_set(only)
+    defer = _to_set(defer)
 
     def decorator(method: ValidatorType) -> ValidatorType:
+        if batch and not isinstance(method, classmethod):
+            raise TypeError(
+                f"batch data validators must be class methods: {method.__qualname__}"
+            )
+        if cache and (isinstance(method, classmethod) or inspect.iscoroutinefunction(method)):
+            raise TypeError(
+                f"only sync instance method validators can be cached: {method.__qualname__}"
+            )
         if isinstance(method, classmethod):
             func = method.__func__
+            if inspect.iscoroutinefunction(func):
+                raise TypeError(
+                    f"async data validators must be instance methods: {method.__qualname__}"
+                )
             func.__classmethod__ = True
-            cache = {"class": func}
+            overloads = {"class": func}
         else:
             func = method
             func.__classmethod__ = False
-            cache = {"instance": func}
+            overloads = {"instance": func}
 
         def overload(omethod: ValidatorType) -> Callable:
             if isinstance(omethod, classmethod):
                 ofunc = omethod.__func__
-                if "class" in cache:
+                if inspect.iscoroutinefunction(ofunc):
+                    raise TypeError(
+                        f"async data validators must be instance methods: "
+                        f"{ofunc.__qualname__}"
+                    )
+                if "class" in overloads:
                     raise RuntimeError(
                         f"overloaded data validators are both class "
                         f"methods! {omethod.__func__.__qualname__}"
                     )
-                cache["class"] = omethod.__func__
+                overloads["class"] = omethod.__func__
             else:
                 ofunc = omethod
-                if "instance" in cache:
+                if "instance" in overloads:
                     raise RuntimeError(
                         f"overloaded data validators are both instance "
                         f"methods! {omethod.__qualname__}"
                     )
-                cache["instance"] = omethod
+                overloads["instance"] = omethod
             if ofunc.__name__ != func.__name__:
                 raise ValueError(
                     f"overloaded validators should have the same name: "
                     f"{func.__qualname__}, {ofunc.__qualname__}"
                 )
-            func._overloads = cache
+            func._overloads = overloads
             return method
 
         # nb. we cannot determine anything else until the apps are loaded
+        owner_qualname, _, name = func.__qualname__.rpartition(".")
+        DECORATED.setdefault((func.__module__, owner_qualname), set()).add(name)
         func.__datavalidator__ = True
         func.__decoratorargs__ = DecoratorArgs(
             select_related=select_related,
-            prefetch_related=prefetch_related
+            prefetch_related=prefetch_related,
+            only=only,
+            defer=defer,
+            batch=batch,
+            timeout=timeout,
+            max_failures=max_failures,
+            cache=cache,
         )
         func._overloads = None
         method.overload = overload
@@ -196,15 +378,95 @@ def _data_validator(select_related: Union[Sequence, str, None] = None,
     return decorator
 
 
+def get_field_names(model: Type[models.Model],
+                    method_name: str,
+                    names: Set[str]) -> Set[str]:
+    """ return the names of the concrete fields in names (which may also be
+        given by their attname) and display a warning for any others
+    """
+    concrete_fields = {}
+    for f in model._meta.concrete_fields:  # noqa
+        concrete_fields[f.name] = concrete_fields[f.attname] = f.name
+    unknown = names - concrete_fields.keys()
+    if len(unknown) != 0:
+        logger.cwarning(
+            f"{', '.join(sorted(unknown))} are not fields of {model.__name__} "
+            f"and will be ignored for {model.__name__}.{method_name}"
+        )
+    return {concrete_fields[name] for name in names - unknown}
+
+
+def is_valid_lookup(model: Type[models.Model],
+                    lookup: Union[str, models.Prefetch],
+                    select: bool) -> bool:
+    """ check a select_related (if select is True) or prefetch_related
+        lookup against the relations of the model without querying the
+        database
+    """
+    if isinstance(lookup, models.Prefetch):
+        lookup = lookup.prefetch_through
+    for name in lookup.split(LOOKUP_SEP):
+        if model is None:
+            # the related model of a generic relation is not known
+            return not select
+        relations = {}
+        for f in model._meta.get_fields():  # noqa
+            if not f.is_relation:
+                continue
+            if f.auto_created and not f.concrete and not select:
+                # reverse relations are prefetched by their accessor name
+                relations[f.get_accessor_name()] = f
+            else:
+                relations[f.name] = f
+        f = relations.get(name)
+        if f is None:
+            # prefetch_related also supports custom descriptors
+            return not select and hasattr(getattr(model, name, None), "get_prefetch_queryset")
+        if select and (f.many_to_many or f.one_to_many or f.related_model is None):
+            return False
+        model = f.related_model
+    return True
+
+
+def get_related_lookups(model: Type[models.Model],
+                        method_name: str,
+                        lookups: Set[Union[str, models.Prefetch]],
+                        select: bool) -> Set[Union[str, models.Prefetch]]:
+    """ return the valid lookups and display a warning for any others """
+    valid = {lookup for lookup in lookups if is_valid_lookup(model, lookup, select)}
+    method = "select_related" if select else "prefetch_related"
+    for lookup in lookups - valid:
+        lookup = getattr(lookup, "prefetch_to", lookup)
+        logger.cwarning(
+            f"{lookup} is not a valid {method} lookup on {model.__name__}. It "
+            f"will be skipped for {model.__name__}.{method_name}"
+        )
+    return valid
+
+
+def get_validators(model: Type[models.Model]) -> List[Tuple[str, ValidatorType]]:
+    """ return the (name, method) of the data validators of a model sorted by
+        name (the same as inspect.getmembers but only looking up the names
+        recorded in DECORATED for the classes in the mro)
+    """
+    names = set()
+    for cls in model.__mro__:
+        names.update(DECORATED.get((cls.__module__, cls.__qualname__), ()))
+    validators = []
+    for name in sorted(names):
+        member = getattr(model, name, None)
+        if hasattr(member, "__datavalidator__"):
+            validators.append((name, member))
+    return validators
+
+
 def update_registry():
     """ add all additional info to REGISTRY. """
     from django.apps import apps
     global REGISTRY
 
     for model in apps.get_models():
-        validators = inspect.getmembers(
-            model, predicate=lambda m: hasattr(m, "__datavalidator__")
-        )
+        validators = get_validators(model)
         if len(validators) == 0:
             continue
         # skip models that define exclude=True on their Config
@@ -227,17 +489,33 @@ def update_registry():
             else:
                 description = method_name.replace("_", " ")
 
+            only = args.only and get_field_names(model, method_name, args.only)
             model_info.validators[method_name] = valinfo = ValidatorInfo(
                 model_info=model_info,
                 method_name=method_name,
                 description=description[:MAX_DESCRIPTION_LEN],
-                select_related=args.select_related,
-                prefetch_related=args.prefetch_related,
+                select_related=get_related_lookups(
+                    model, method_name, args.select_related, select=True
+                ),
+                prefetch_related=get_related_lookups(
+                    model, method_name, args.prefetch_related, select=False
+                ),
+                only=only,
+                defer=get_field_names(model, method_name, args.defer),
+                timeout=args.timeout,
+                max_failures=args.max_failures,
+                cache=args.cache,
             )
             if validator._overloads is not None:  # noqa
                 valinfo.instance_method = validator._overloads["instance"]  # noqa
-                valinfo.class_method = validator._overloads["class"]  # noqa
+                if args.batch:
+                    valinfo.batch_method = validator._overloads["class"]  # noqa
+                else:
+                    valinfo.class_method = validator._overloads["class"]  # noqa
+            elif args.batch:
+                valinfo.batch_method = validator.__func__
             elif validator.__classmethod__:
                 valinfo.class_method = validator.__func__
             else:
                 valinfo.instance_method = validator
+            valinfo.is_async = inspect.iscoroutinefunction(valinfo.instance_method)
@@ -1,10 +1,18 @@
+from array import array
+from collections import Counter
 from dataclasses import dataclass, field
 import enum
-from typing import List, Optional, Union, Any, Generator, Tuple, Type
+from itertools import islice
+from math import ceil, log, sqrt
+import tempfile
+from typing import (
+    Dict, Iterable, Iterator, List, Optional, Union, Any, Generator, Tuple, Type
+)
 
 from django.db import models
 from django.db.models import Model, QuerySet
-from termcolor import colored as coloured
+
+from .constants import FAILURES_SPILL_SIZE
 
 
 class Status(enum.Enum):
@@ -13,6 +21,7 @@ class Status(enum.Enum):
     FAILING = 2
     EXCEPTION = 3
     WARNING = 4
+    TIMEOUT = 5
 
     @property
     def colour(self) -> str:
@@ -26,6 +35,8 @@ class Status(enum.Enum):
             return "grey"
         elif self == Status.WARNING:
             return "yellow"
+        elif self == Status.TIMEOUT:
+            return "magenta"
 
 
 @dataclass
@@ -92,6 +103,39 @@ def check_return_value(return_value: Any,
         )
 
 
+def check_batch_return_value(objects: List[Model], return_value: Any) -> List[Any]:
+    """ split the return value of a batch data-validator into the return
+        value for each object
+
+     batch validators may return:
+        - a dict mapping each object (or its primary key) to a PASS, FAIL,
+          NA or bool, or
+        - a QuerySet, list or set of the objects (or primary keys) that
+          fail; all other objects pass
+
+     :returns: a list of return values in the same order as objects
+    """
+    if isinstance(return_value, dict):
+        results = {getattr(key, "pk", key): value for key, value in return_value.items()}
+        missing = [obj.pk for obj in objects if obj.pk not in results]
+        if len(missing) != 0:
+            raise TypeError(
+                f"batch data validators must return a result for every "
+                f"object (missing pk={missing[0]})"
+            )
+        return [results[obj.pk] for obj in objects]
+    elif isinstance(return_value, (QuerySet, list, tuple, set)):
+        failures = {getattr(el, "pk", el) for el in return_value}
+        return [FAIL if obj.pk in failures else PASS for obj in objects]
+    else:
+        raise TypeError(
+            f"{type(return_value)} is not a permissible return value for a "
+            f"batch validator. Permissible types are: a dict of objects or "
+            f"object ids to results, or a QuerySet, list or set of the "
+            f"objects or object ids that fail"
+        )
+
+
 @dataclass
 class Summary:
     """ The return value of a classmethod data_validator
@@ -104,14 +148,225 @@ class Summary:
     num_na: Optional[int] = 0
 
 
+class FailureSet:
+    """ the (integer) primary keys of the failing objects of a validator,
+        in the order they were added
+
+     consecutive primary keys are stored as runs of (first pk, length) in
+     a typed array, so a validator that fails on every object needs a few
+     bytes rather than a python int per failure. Once there are more than
+     spill_size runs in memory they are written to a temporary file.
+    """
+    # the number of runs read from the temporary file at a time
+    READ_SIZE = 65536
+
+    def __init__(self, pks: Iterable[int] = (), spill_size: Optional[int] = None):
+        self.spill_size = FAILURES_SPILL_SIZE if spill_size is None else spill_size
+        # flattened pairs of (first pk, length)
+        self.runs = array("q")
+        self.file = None
+        self.length = 0
+        self.extend(pks)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[int]:
+        for start, length in self.iter_runs():
+            yield from range(start, start + length)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (FailureSet, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and list(self) == list(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"FailureSet({list(islice(self, 10))}{'...' if len(self) > 10 else ''})"
+
+    def __getstate__(self) -> dict:
+        # the temporary file cannot be pickled (e.g. when returning the
+        # summary from a worker process) so the runs are read back
+        runs = array("q")
+        for start, length in self.iter_runs():
+            runs.append(start)
+            runs.append(length)
+        return {"spill_size": self.spill_size, "runs": runs.tobytes(), "length": self.length}
+
+    def __setstate__(self, state: dict) -> None:
+        self.spill_size = state["spill_size"]
+        self.runs = array("q")
+        self.runs.frombytes(state["runs"])
+        self.file = None
+        self.length = state["length"]
+        if len(self.runs) > 2 * self.spill_size:
+            self.spill()
+
+    def iter_runs(self) -> Iterator[Tuple[int, int]]:
+        """ iterate the runs of (first pk, length) """
+        if self.file is not None:
+            offset = 0
+            while True:
+                # seek each time in case the file is read by another iterator
+                self.file.seek(offset)
+                block = array("q")
+                block.frombytes(self.file.read(2 * self.READ_SIZE * block.itemsize))
+                if len(block) == 0:
+                    break
+                offset += len(block) * block.itemsize
+                yield from zip(block[::2], block[1::2])
+        yield from zip(self.runs[::2], self.runs[1::2])
+
+    def add_run(self, start: int, length: int) -> None:
+        """ add the primary keys start, start + 1, ..., start + length - 1 """
+        runs = self.runs
+        if len(runs) != 0 and runs[-2] + runs[-1] == start:
+            runs[-1] += length
+        else:
+            runs.append(start)
+            runs.append(length)
+            if len(runs) > 2 * self.spill_size:
+                self.spill()
+        self.length += length
+
+    def append(self, pk: int) -> None:
+        self.add_run(pk, 1)
+
+    def extend(self, pks: Iterable[int]) -> None:
+        if isinstance(pks, FailureSet):
+            for start, length in pks.iter_runs():
+                self.add_run(start, length)
+        else:
+            for pk in pks:
+                self.add_run(pk, 1)
+
+    def spill(self) -> None:
+        """ move the runs in memory to the temporary file """
+        if self.file is None:
+            self.file = tempfile.TemporaryFile()
+        self.file.seek(0, 2)
+        self.runs.tofile(self.file)
+        self.runs = array("q")
+
+
+class LatencyHistogram:
+    """ a histogram of the time (in seconds) taken per object
+
+     the buckets grow geometrically so the percentiles are accurate to
+     within a factor of GROWTH regardless of the scale, and the histograms
+     of disjoint sets of objects can be merged
+    """
+    MIN_LATENCY = 1e-7
+    GROWTH = 1.05
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self):
+        self.buckets = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def __bool__(self):
+        return self.count != 0
+
+    def add(self, latency: float, count: int = 1) -> None:
+        """ add count samples of latency (in seconds) """
+        if latency <= self.MIN_LATENCY:
+            bucket = 0
+        else:
+            bucket = ceil(log(latency / self.MIN_LATENCY, self.GROWTH))
+        self.buckets[bucket] += count
+        self.count += count
+        self.total += latency * count
+        self.max = max(self.max, latency)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """ add the samples of another histogram to this one """
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def get_state(self) -> dict:
+        """ return the histogram as json serializable values """
+        return {"buckets": list(self.buckets.items()), "count": self.count,
+                "total": self.total, "max": self.max}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "LatencyHistogram":
+        """ return the histogram saved by get_state """
+        histogram = cls()
+        histogram.buckets.update(dict(state["buckets"]))
+        histogram.count = state["count"]
+        histogram.total = state["total"]
+        histogram.max = state["max"]
+        return histogram
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """ return the (upper bound of the) given percentile """
+        if self.count == 0:
+            return None
+        rank = max(1, ceil(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.MIN_LATENCY * self.GROWTH ** bucket, self.max)
+
+    def to_dict(self) -> Dict[str, float]:
+        """ return the percentiles and the maximum """
+        latencies = {f"p{p}": self.percentile(p) for p in self.PERCENTILES}
+        latencies["max"] = self.max
+        return latencies
+
+    def pretty_print(self) -> str:
+        return " ".join(
+            f"{name}={format_latency(latency)}"
+            for name, latency in self.to_dict().items()
+        )
+
+
+def format_latency(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    elif seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+def wilson_interval(failures: int, size: int, z: float = 1.96) -> Tuple[float, float]:
+    """ return the (95%) confidence interval of a failure rate estimated
+        from a random sample
+    """
+    if size == 0:
+        return 0.0, 1.0
+    rate = failures / size
+    denominator = 1 + z ** 2 / size
+    centre = (rate + z ** 2 / (2 * size)) / denominator
+    width = z * sqrt(rate * (1 - rate) / size + z ** 2 / (4 * size ** 2)) / denominator
+    return max(0.0, centre - width), min(1.0, centre + width)
+
+
 # internal use only
 @dataclass
 class SummaryEx(Summary, ExceptionInfo):
     """ Summary Extended (keep some methods away from the user) """
     status: Status = Status.UNINITIALIZED
-    failures: Union[QuerySet, List[Model], List[int], None] = field(default_factory=list)
+    failures: Union[QuerySet, List[Model], List[int], FailureSet, None] = field(default_factory=FailureSet)  # noqa E501
     num_allowed_to_fail: Optional[int] = 0
     execution_time: Optional[int] = 0
+    # the time per object spent in the validator and saving the result
+    validator_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    persistence_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # the number of objects validated if this is the summary of a sample
+    sample_size: Optional[int] = None
+    # the number of FailingObjects created or updated
+    num_written: int = 0
+    # True if the validator ran out of time (the counts are partial)
+    timed_out: bool = False
+    # True if the validator was stopped at max_failures (the counts are partial)
+    truncated: bool = False
 
     TYPE_ERROR_MESSAGES = {
         "num_passing": "Summary.num_passing must be an int",
@@ -129,7 +384,8 @@ class SummaryEx(Summary, ExceptionInfo):
                 if val is not None:
                     if sorted(list(val)) != sorted(list(other.failures)):
                         return False
-            elif prop == "execution_time":
+            elif prop in ("execution_time", "validator_latency", "persistence_latency",
+                          "num_written"):
                 continue
             elif val != getattr(other, prop):
                 return False
@@ -195,10 +451,52 @@ class SummaryEx(Summary, ExceptionInfo):
         summary_ex.__dict__.update(exinfo.__dict__)
         return summary_ex
 
+    @classmethod
+    def merge(cls, summaries: List["SummaryEx"]) -> "SummaryEx":
+        """ combine the (incomplete) summaries of an instance-method
+            validator run on disjoint sets of objects
+
+         if any of the summaries hit an exception then the first exception
+         is returned (the summaries are in order of primary key)
+        """
+        exceptions = [summary for summary in summaries if summary.is_exception]
+        if len(exceptions) != 0:
+            return exceptions[0]
+        merged = cls()
+        for summary in summaries:
+            merged.timed_out |= summary.timed_out
+            merged.truncated |= summary.truncated
+            merged.num_passing += summary.num_passing
+            merged.num_na += summary.num_na
+            merged.num_allowed_to_fail += summary.num_allowed_to_fail
+            merged.failures.extend(summary.failures)
+            merged.execution_time += summary.execution_time
+            merged.validator_latency.merge(summary.validator_latency)
+            merged.persistence_latency.merge(summary.persistence_latency)
+            merged.num_written += summary.num_written
+        return merged
+
     @property
     def is_exception(self) -> bool:
         return not (self.exc_type is None)
 
+    def get_latency(self) -> Optional[Dict[str, Dict[str, float]]]:
+        """ return the latency percentiles (if any objects were validated) """
+        if not self.validator_latency:
+            return None
+        return {
+            "validator": self.validator_latency.to_dict(),
+            "persistence": self.persistence_latency.to_dict(),
+        }
+
+    def get_failure_rate(self) -> Tuple[float, float, float]:
+        """ return the failure rate (of the objects that are not NA) in a
+            sample and its confidence interval
+        """
+        size = self.num_passing + len(self.failures)
+        low, high = wilson_interval(len(self.failures), size)
+        return (len(self.failures) / size if size else 0.0), low, high
+
     @property
     def exception_info_dict(self) -> dict:
         return {
@@ -217,6 +515,11 @@ class SummaryEx(Summary, ExceptionInfo):
             self.failures = None
             self.execution_time = None
             return self
+        elif self.timed_out:
+            self.status = Status.TIMEOUT
+            if self.failures is not None:
+                self.failures = self.get_failure_pks()
+            return self
         else:
             self.failures = self.get_failure_pks()
 
@@ -241,31 +544,49 @@ class SummaryEx(Summary, ExceptionInfo):
 
         return self
 
-    def get_failure_pks(self) -> Optional[List[int]]:
-        """ convert self.faliures to a list of primary keys """
+    def truncate(self, max_failures: int) -> "SummaryEx":
+        """ keep (at most) the first max_failures of the failures """
         if isinstance(self.failures, QuerySet):
-            return list(self.failures.values_list("pk", flat=True))
+            # only fetch the primary keys that are kept
+            self.failures = list(self.failures.values_list("pk", flat=True)[:max_failures + 1])
+        if self.failures is not None and len(self.failures) > max_failures:
+            self.failures = FailureSet(islice(self.get_failure_pks(), max_failures))
+            self.truncated = True
+        return self
+
+    def get_failure_pks(self) -> FailureSet:
+        """ convert self.faliures to a FailureSet of primary keys """
+        if isinstance(self.failures, FailureSet):
+            return self.failures
+        elif isinstance(self.failures, QuerySet):
+            # stream the primary keys rather than building a list
+            return FailureSet(self.failures.values_list("pk", flat=True).iterator())
         elif isinstance(self.failures, list):
             if len(self.failures) == 0:
-                return self.failures
+                return FailureSet()
             elif isinstance(self.failures[0], Model):
                 try:
-                    return [obj.pk for obj in self.failures]
+                    return FailureSet(obj.pk for obj in self.failures)
                 except AttributeError:
                     raise TypeError(self.TYPE_ERROR_MESSAGES["failures"])
             else:
                 if not all(isinstance(el, int) for el in self.failures):
                     raise TypeError(self.TYPE_ERROR_MESSAGES["failures"])
-                return self.failures
+                return FailureSet(self.failures)
         else:
             raise TypeError(self.TYPE_ERROR_MESSAGES["failures"])
 
     def print_status(self, colour: bool = True) -> str:
         if not colour:
             return self.status.name
+        from termcolor import colored as coloured
         return coloured(self.status.name, self.status.colour, attrs=["bold"])
 
     def _pretty_print(self) -> Generator[str, None, None]:
+        if self.timed_out:
+            yield "TIMED OUT: the results are incomplete"
+        if self.truncated:
+            yield "TRUNCATED: stopped at the maximum number of failures"
         if not self.is_exception:
             if self.num_passing is not None:
                 yield f"PASSED: {self.num_passing}"
@@ -276,10 +597,18 @@ class SummaryEx(Summary, ExceptionInfo):
             if self.num_allowed_to_fail is not None:
                 yield f"Allowed to Fail: {self.num_allowed_to_fail}"
             if self.failures is not None and len(self.failures) > 0:
-                ids = ", ".join(map(str, self.failures[:3]))
+                ids = ", ".join(map(str, islice(self.failures, 3)))
                 if len(self.failures) > 3:
                     ids += "..."
                 yield f"Failing Ids: {ids}"
+            if self.sample_size is not None:
+                rate, low, high = self.get_failure_rate()
+                yield f"Sampled: {self.sample_size}"
+                yield (f"Estimated Failure Rate: {rate:.2%} "
+                       f"(95% CI: {low:.2%} - {high:.2%})")
+            if self.validator_latency:
+                yield f"Validator Latency: {self.validator_latency.pretty_print()}"
+                yield f"Persistence Latency: {self.persistence_latency.pretty_print()}"
         else:
             if self.exc_obj_pk is not None:
                 obj_pk = f" (object pk={self.exc_obj_pk})"
@@ -1,7 +1,16 @@
+import asyncio
 from collections import Counter
+from concurrent.futures import Executor
 from datetime import datetime
+import json
+from functools import partial
+import hashlib
+import inspect
+from math import ceil
+import time
+from uuid import uuid4
 from typing import (
-    Dict, Generator, List, Optional, Tuple, Type, Set, Any
+    Any, Callable, Dict, Generator, Iterable, List, Optional, Tuple, Type, Set, Union
 )
 try:
     from time import time_ns as timer
@@ -10,21 +19,31 @@ except ImportError:
     from time import time as timer
     TIME_UNIT = 1
 
-from django.core.exceptions import ObjectDoesNotExist, FieldError
-from django.db import models, transaction
-from tqdm import tqdm
+from django.apps import apps
+from django.db import OperationalError, connections, models, router, transaction
+from django.db.models import Case, Count, F, Max, Q, QuerySet, Value, When
+from django.db.models.constants import LOOKUP_SEP
 
+from .config import get_config
+from .constants import (
+    ASYNC_CONCURRENCY, CHECKPOINT_INTERVAL, FLUSH_SIZE, ITERATOR, ITERATORS,
+    RESULT_CACHE_SIZE
+)
 from .models import (
-    ExceptionInfoMixin, FailingObject, Validator  # noqa
+    CachedResult, ExceptionInfoMixin, FailingObject, Validator  # noqa
 )
+from .parallel import close_connections, process_pool
 from .registry import REGISTRY, ValidatorInfo
 from .results import (
-    check_return_value, PASS, FAIL, NA, EXCEPTION,
-    ExceptionInfo, Result, Status, SummaryEx
+    check_batch_return_value, check_return_value, PASS, FAIL, NA, EXCEPTION,
+    ExceptionInfo, FailureSet, LatencyHistogram, Result, Status, SummaryEx
+)
+from .utils import (
+    keyset_chunks, queryset_chunks, chunk, partition, pk_ranges, random_pks, run_coroutine
 )
-from .utils import queryset_iterator, chunk, partition
 
 from .logging import logger
+from .metrics import METRICS
 
 
 __all__ = (
@@ -34,11 +53,96 @@ __all__ = (
 
 
 class ResultHandlerMixin:
+    # the number of failures written per statement by upsert_failing_objects
+    UPSERT_SIZE = 50000
+
+    @staticmethod
+    def get_generations(valinfos: List[ValidatorInfo],
+                        advance: bool,
+                        in_progress: bool = False) -> Dict[ValidatorInfo, int]:
+        """ return the generation to write the FailingObjects of each
+            validator with
+
+         a run of all objects writes the next generation, which becomes
+         visible when the run completes, and is marked as in progress
+         until then. A run of some of the objects writes the current
+         generation (advance=False), or the generation of a run in progress
+         if in_progress is True (so the records are not swept at the end of
+         that run).
+        """
+        validators = Validator.objects.filter(
+            id__in=[valinfo.get_validator_id() for valinfo in valinfos]
+        )
+        if advance:
+            validators.update(run_generation=F("generation") + 1)
+        generations = {
+            validator_id: max(generation, run_generation or 0) if in_progress else generation
+            for validator_id, generation, run_generation in validators.values_list(
+                "id", "generation", "run_generation"
+            )
+        }
+        return {
+            valinfo: generations[valinfo.get_validator_id()] + advance
+            for valinfo in valinfos
+        }
+
+    @staticmethod
+    def sweep_failing_objects(valinfo: ValidatorInfo, generation: int) -> None:
+        """ make the FailingObjects written with `generation` the current
+            ones, delete the older records (except the ones allowed to
+            fail, which are only hidden) and recount them
+        """
+        validator_id = valinfo.get_validator_id()
+        qs = FailingObject.all_objects.filter(
+            validator_id=validator_id, generation__lt=generation, allowed_to_fail=False
+        )
+        # noinspection PyProtectedMember
+        qs._raw_delete(qs.db)
+        FailingObject.all_objects.filter(
+            validator_id=validator_id, generation__lt=generation, generation__gt=0
+        ).update(generation=0)
+        counts = FailingObject.all_objects.filter(
+            validator_id=validator_id, generation__gte=generation
+        ).aggregate(
+            num_failing=Count("pk"),
+            num_allowed_to_fail=Count("pk", filter=Q(allowed_to_fail=True)),
+        )
+        Validator.objects.filter(id=validator_id).update(
+            generation=generation, run_generation=None, **counts
+        )
+
     @staticmethod
-    def handle_return_value(valinfo: ValidatorInfo,
+    def get_failing_object_defaults(result: Type[Result],
+                                    retval: Any,
+                                    exinfo: Optional[ExceptionInfo],
+                                    generation: int
+                                    ) -> dict:
+        """ return the field values to set on the FailingObject of a
+            FAIL or EXCEPTION result
+        """
+        extra_args = {}
+        if isinstance(retval, FAIL):
+            if retval.allowed_to_fail is not None:
+                extra_args["allowed_to_fail"] = retval.allowed_to_fail
+                if retval.comment:
+                    extra_args["allowed_to_fail_justification"] = retval.comment
+            elif retval.comment:
+                extra_args["comment"] = retval.comment
+        elif result is EXCEPTION:
+            extra_args["comment"] = exinfo.exc_type
+
+        return {
+            "generation": generation,
+            "is_exception": result is EXCEPTION,
+            **extra_args
+        }
+
+    def handle_return_value(self,
+                            valinfo: ValidatorInfo,
                             obj: models.Model,
                             retval: Any,
-                            exinfo: Optional[ExceptionInfo]
+                            exinfo: Optional[ExceptionInfo],
+                            generation: int
                             ) -> Tuple[Type[Result], Optional[ExceptionInfo], Optional[bool]]:
         """ handle the value returned by an instance-method validator
 
@@ -53,26 +157,11 @@ class ResultHandlerMixin:
 
         if result is FAIL or result is EXCEPTION:
             # save the failing object
-            extra_args = {}
-            if isinstance(retval, FAIL):
-                if retval.allowed_to_fail is not None:
-                    extra_args["allowed_to_fail"] = retval.allowed_to_fail
-                    if retval.comment:
-                        extra_args["allowed_to_fail_justification"] = retval.comment
-                elif retval.comment:
-                    extra_args["comment"] = retval.comment
-            elif result is EXCEPTION:
-                extra_args["comment"] = exinfo.exc_type
-
             fobj, _ = FailingObject.all_objects.update_or_create(
                 validator_id=valinfo.get_validator_id(),
                 content_type_id=valinfo.model_info.get_content_type_id(),
                 object_pk=obj.pk,
-                defaults={
-                    "is_valid": True,
-                    "is_exception": result is EXCEPTION,
-                    **extra_args
-                }
+                defaults=self.get_failing_object_defaults(result, retval, exinfo, generation)
             )
 
             # if the object was (previously) marked as allowed to fail
@@ -80,9 +169,11 @@ class ResultHandlerMixin:
 
         return result, exinfo, allowed_to_fail
 
-    @staticmethod
-    def update_failing_objects(valinfo: ValidatorInfo,
-                               summary: SummaryEx
+    @classmethod
+    def update_failing_objects(cls,
+                               valinfo: ValidatorInfo,
+                               summary: SummaryEx,
+                               generation: int
                                ) -> SummaryEx:
         """ add the failures to the FailingObject table """
         validator_id = valinfo.get_validator_id()
@@ -90,13 +181,19 @@ class ResultHandlerMixin:
         if summary.failures is None:
             return summary
 
+        using = router.db_for_write(FailingObject)
+        if connections[using].vendor == "postgresql":
+            cls.upsert_failing_objects(valinfo, summary.failures, generation, using)
+            summary.num_written = len(summary.failures)
+            return summary
+
         with transaction.atomic():
             for object_pks in chunk(summary.failures, 1000):
                 qs_update = FailingObject.all_objects.filter(
                     validator_id=validator_id,
                     object_pk__in=object_pks
                 ).select_for_update()
-                qs_update.update(is_valid=True, is_exception=False, comment="")
+                qs_update.update(generation=generation, is_exception=False, comment="")
                 pks_updated = qs_update.values_list("object_pk", flat=True)
                 objects_to_create = [
                     FailingObject(validator_id=validator_id,
@@ -104,12 +201,53 @@ class ResultHandlerMixin:
                                   object_pk=pk,
                                   is_exception=False,
                                   comment="",
-                                  is_valid=True)
+                                  generation=generation)
                     for pk in set(object_pks) - set(pks_updated)
                 ]
                 FailingObject.objects.bulk_create(objects_to_create)
+        summary.num_written = len(summary.failures)
         return summary
 
+    @classmethod
+    def upsert_failing_objects(cls,
+                               valinfo: ValidatorInfo,
+                               failures: FailureSet,
+                               generation: int,
+                               using: str
+                               ) -> None:
+        """ create or re-validate the FailingObjects of the failures with
+            INSERT ... ON CONFLICT DO UPDATE (postgres only)
+
+         each statement writes UPSERT_SIZE failures in its own transaction
+         (unless called in an atomic block) so the rows are not locked for
+         the whole result. Existing records keep allowed_to_fail and the
+         justification.
+        """
+        connection = connections[using]
+        qn = connection.ops.quote_name
+        opts = FailingObject._meta
+        column = {f.name: qn(f.column) for f in opts.concrete_fields}
+        # nb. DISTINCT because a row cannot be updated twice by one statement
+        sql = (
+            f"INSERT INTO {qn(opts.db_table)} ("
+            f"{column['validator']}, {column['content_type']}, {column['object_pk']}, "
+            f"{column['is_exception']}, {column['comment']}, {column['allowed_to_fail']}, "
+            f"{column['allowed_to_fail_justification']}, {column['generation']}"
+            f") SELECT %s, %s, pk, false, '', false, '', %s "
+            f"FROM (SELECT DISTINCT unnest(%s::integer[]) AS pk) AS failures "
+            f"ON CONFLICT ({column['validator']}, {column['object_pk']}) DO UPDATE SET "
+            f"{column['generation']} = EXCLUDED.{column['generation']}, "
+            f"{column['is_exception']} = false, "
+            f"{column['comment']} = ''"
+        )
+        validator_id = valinfo.get_validator_id()
+        content_type_id = valinfo.model_info.get_content_type_id()
+        with connection.cursor() as cursor:
+            for object_pks in chunk(failures, cls.UPSERT_SIZE):
+                cursor.execute(
+                    sql, [validator_id, content_type_id, generation, list(object_pks)]
+                )
+
     @staticmethod
     def handle_summary(valinfo: ValidatorInfo,
                        summary: SummaryEx
@@ -124,6 +262,10 @@ class ResultHandlerMixin:
             execution_time = summary.execution_time / TIME_UNIT
         else:
             execution_time = None
+        latency = summary.get_latency()
+        METRICS.record_summary(
+            str(valinfo.model_info), valinfo.method_name, summary, execution_time
+        )
 
         Validator.objects.filter(id=valinfo.get_validator_id()).update(
             status=summary.status,
@@ -131,79 +273,821 @@ class ResultHandlerMixin:
             num_na=summary.num_na,
             last_run_time=datetime.now(),
             execution_time=execution_time,
+            latency=None if latency is None else json.dumps(latency),
             **extra_args,
         )
 
         return summary
 
 
+class FailingObjectBuffer:
+    """ buffer the FailingObjects of an instance-method validator and
+        write them to the database in bulk
+    """
+
+    def __init__(self,
+                 valinfo: ValidatorInfo,
+                 summary: SummaryEx,
+                 flush_size: int = FLUSH_SIZE):
+        self.valinfo = valinfo
+        self.summary = summary
+        self.flush_size = flush_size
+        self.pending: Dict[int, dict] = {}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def add(self, object_pk: int, defaults: dict) -> None:
+        """ add a FailingObject to the buffer, flushing it if it is full """
+        self.pending[object_pk] = defaults
+        if len(self.pending) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """ write the buffered FailingObjects to the database
+
+         existing records are updated in place (preserving allowed_to_fail
+         and the justification unless the validator returned them) and
+         the rest are created. Objects that are allowed to fail are counted
+         on the summary.
+        """
+        if len(self.pending) == 0:
+            return
+
+        validator_id = self.valinfo.get_validator_id()
+        content_type_id = self.valinfo.model_info.get_content_type_id()
+        existing = {
+            fobj.object_pk: fobj
+            for fobj in FailingObject.all_objects.filter(
+                validator_id=validator_id, object_pk__in=self.pending.keys()
+            )
+        }
+
+        objects_to_create, objects_to_update = [], []
+        update_fields = set()
+        for object_pk, defaults in self.pending.items():
+            fobj = existing.get(object_pk)
+            if fobj is None:
+                fobj = FailingObject(validator_id=validator_id,
+                                     content_type_id=content_type_id,
+                                     object_pk=object_pk,
+                                     **defaults)
+                objects_to_create.append(fobj)
+            else:
+                # fields that are not in defaults keep their current value
+                fobj.__dict__.update(defaults)
+                update_fields.update(defaults.keys())
+                objects_to_update.append(fobj)
+            if fobj.allowed_to_fail and not fobj.is_exception:
+                self.summary.num_allowed_to_fail += 1
+
+        with transaction.atomic():
+            if len(objects_to_update) != 0:
+                FailingObject.all_objects.bulk_update(objects_to_update, update_fields)
+            FailingObject.all_objects.bulk_create(objects_to_create)
+
+        self.summary.num_written += len(self.pending)
+        self.pending.clear()
+
+
+class ResultCache:
+    """ the cached results of an instance-method validator
+
+     each result is stored with a fingerprint of the object (the values of
+     the fields read by the validator) and of the source code of the
+     validator, so changing either of them invalidates the result
+    """
+    RESULTS = {PASS: 1, FAIL: 2, NA: 3}
+    CODES = {1: PASS, 2: FAIL, 3: NA}
+
+    def __init__(self, valinfo: ValidatorInfo, read_only: bool = False):
+        self.valinfo = valinfo
+        # if True the results of the run are not saved (e.g. when sampling)
+        self.read_only = read_only
+        self.max_size = RESULT_CACHE_SIZE
+        self.attnames = [
+            f.attname for f in valinfo.model_info.model._meta.concrete_fields
+            if (valinfo.only is None or f.name in valinfo.only) and f.name not in valinfo.defer
+        ]
+        self.source_hash = self.get_source_hash(valinfo.instance_method)
+        self.queryset = CachedResult.objects.filter(validator_id=valinfo.get_validator_id())
+        self.size = self.queryset.count()
+        # the cached results of the current chunk of objects
+        self.entries: Dict[int, CachedResult] = {}
+        self.pending: Dict[int, Tuple[int, int]] = {}
+
+    @staticmethod
+    def get_source_hash(method: Callable) -> bytes:
+        """ return a hash of the source code of a method """
+        try:
+            source = inspect.getsource(method).encode("utf-8")
+        except (OSError, TypeError):
+            # the source is not available, so hash the byte code instead
+            code = method.__code__
+            source = code.co_code + repr(code.co_consts).encode("utf-8")
+        return hashlib.blake2b(source, digest_size=16).digest()
+
+    def get_fingerprint(self, obj: models.Model) -> int:
+        """ return a (signed 64-bit) hash of the object and the validator """
+        values = tuple(getattr(obj, attname) for attname in self.attnames)
+        digest = hashlib.blake2b(
+            repr(values).encode("utf-8"), digest_size=8, key=self.source_hash
+        ).digest()
+        return int.from_bytes(digest, "big", signed=True)
+
+    def load(self, objs: List[models.Model]) -> None:
+        """ fetch the cached results of a chunk of objects """
+        self.entries = {
+            entry.object_pk: entry
+            for entry in self.queryset.filter(object_pk__in=[obj.pk for obj in objs])
+        }
+
+    def get(self, obj: models.Model) -> Tuple[int, Optional[Type[Result]]]:
+        """ :returns: the fingerprint of the object and the cached result
+            (or None if the object or the validator has changed)
+        """
+        fingerprint = self.get_fingerprint(obj)
+        entry = self.entries.get(obj.pk)
+        if entry is None or entry.fingerprint != fingerprint:
+            return fingerprint, None
+        return fingerprint, self.CODES[entry.result]
+
+    def add(self, object_pk: int, fingerprint: int, retval: Any) -> None:
+        """ cache the value returned by the validator for an object """
+        if self.read_only:
+            return
+        result, _ = check_return_value(retval)
+        self.pending[object_pk] = (fingerprint, self.RESULTS[result])
+
+    def flush(self) -> None:
+        """ write the results of the current chunk to the database """
+        objects_to_create, objects_to_update = [], []
+        for object_pk, (fingerprint, result) in self.pending.items():
+            entry = self.entries.get(object_pk)
+            if entry is not None:
+                entry.fingerprint, entry.result = fingerprint, result
+                objects_to_update.append(entry)
+            elif self.size + len(objects_to_create) < self.max_size:
+                objects_to_create.append(CachedResult(
+                    validator_id=self.valinfo.get_validator_id(),
+                    object_pk=object_pk,
+                    fingerprint=fingerprint,
+                    result=result,
+                ))
+
+        with transaction.atomic():
+            if len(objects_to_update) != 0:
+                CachedResult.objects.bulk_update(objects_to_update, ["fingerprint", "result"])
+            CachedResult.objects.bulk_create(objects_to_create)
+
+        self.size += len(objects_to_create)
+        self.pending.clear()
+
+    def trim(self) -> None:
+        """ delete the results of objects that no longer exist, and the
+            results over max_size (e.g. added by parallel workers)
+        """
+        model = self.valinfo.model_info.model
+        self.queryset.exclude(
+            object_pk__in=model._meta.default_manager.values("pk")
+        ).delete()
+        last = self.queryset.order_by("object_pk").values_list(
+            "object_pk", flat=True
+        )[self.max_size:self.max_size + 1]
+        if len(last) != 0:
+            self.queryset.filter(object_pk__gte=last[0]).delete()
+
+
 class InstanceMethodRunner(ResultHandlerMixin):
+    # the primary keys are split into this many ranges per worker process
+    # so that a range of slow objects doesn't hold up the whole run
+    SHARDS_PER_WORKER = 4
+    # the number of objects fetched from the database at a time
+    CHUNK_SIZE = 2000
+
     def __init__(self,
                  model: Type[models.Model],
-                 validator_infos: List[ValidatorInfo]):
+                 validator_infos: List[ValidatorInfo],
+                 flush_size: int = FLUSH_SIZE,
+                 pk_range: Optional[Tuple[int, int]] = None,
+                 filters: Optional[Dict[str, Any]] = None,
+                 deadline: Optional[float] = None,
+                 budgets: Optional[Dict[ValidatorInfo, float]] = None,
+                 max_failures: Optional[Dict[ValidatorInfo, int]] = None,
+                 generations: Optional[Dict[ValidatorInfo, int]] = None):
         self.model = model
         self.model_info = REGISTRY[model]
         self.validator_infos = validator_infos
-        assert all(v.instance_method is not None for v in self.validator_infos)
+        assert all(
+            v.instance_method is not None or v.batch_method is not None
+            for v in self.validator_infos
+        )
+        # stop calling the validators at this (unix) time
+        self.deadline = deadline
+        # the number of seconds each validator may spend being called
+        if budgets is None:
+            budgets = {info: info.timeout for info in self.validator_infos}
+        self.budgets = budgets
+        self._spent = {info: 0.0 for info in self.validator_infos}
+        # stop calling each validator after this many failures
+        if max_failures is None:
+            max_failures = {info: info.max_failures for info in self.validator_infos}
+        self.max_failures = max_failures
+        # the generation of the FailingObjects written by this run (set by
+        # run() unless this runner scans a shard of a run)
+        self.generations = generations or {}
+        self.flush_size = flush_size
+        self.async_concurrency = ASYNC_CONCURRENCY
+        self.pk_range = pk_range
+        # restrict the objects that are validated (for incremental runs)
+        self.filters = filters or {}
+        # restrict the objects that are validated (for sampling)
+        self.sample_pks: Optional[List[Any]] = None
+        # only validate the objects after this pk (when resuming a run)
+        self.resume_pk: Any = None
+        # save a checkpoint at most every checkpoint_interval seconds
+        self.checkpoint_interval: Optional[float] = None
+        self.run_id = uuid4().hex
+        self.high_water_mark: Any = None
+        self.num_scanned = 0
         self._summaries = {info: SummaryEx() for info in self.validator_infos}
+        # the validators that hit an exception or ran out of time
+        self._dropped: Dict[ValidatorInfo, SummaryEx] = {}
+        self._buffers = {
+            info: FailingObjectBuffer(info, summary, flush_size)
+            for info, summary in self._summaries.items()
+        }
+        # the result caches are created when the scan starts
+        self._caches: Dict[ValidatorInfo, ResultCache] = {}
+        # the objects allowed to fail and the number of failures that are
+        # allowed to fail, of the validators with max_failures (also set
+        # when the scan starts)
+        self._allowed_pks: Dict[ValidatorInfo, Set[int]] = {}
+        self._num_allowed: Dict[ValidatorInfo, int] = {}
         self.summaries: Dict[ValidatorInfo, SummaryEx] = {}
         self._time = None
 
-    def run(self, show_progress: bool) -> Dict[ValidatorInfo, SummaryEx]:
+    def run(self,
+            show_progress: bool,
+            workers: int = 1,
+            full: bool = False,
+            resume: bool = False,
+            ) -> Dict[ValidatorInfo, SummaryEx]:
         """ run all instance-method data validators against all objects
 
+         Args:
+            show_progress: if True display a progress bar
+            workers: if greater than 1 the objects are split by primary key
+                and validated in this many worker processes
+            full: if True validate all objects even if the model is
+                configured for incremental validation
+            resume: if True continue from the last checkpoint of an
+                interrupted run (if there is one)
+
          :returns: a dictionary mapping ValidatorInfos to the SummaryEx
             containing the validation results
         """
-        # mark failing objects from the previous run as invalid, but don't
-        # delete them yet so we don't lose any with allowed_to_fail=True
+        checkpoints = self.load_checkpoints() if resume else None
+        if checkpoints is None:
+            self.high_water_mark = self.init_incremental(full)
+
+            # hide the failing objects that are about to be re-validated by
+            # an incremental run, but don't delete them yet so we don't lose
+            # any with allowed_to_fail=True
+            for valinfo in self.validator_infos:
+                self.invalidate_failing_objects(valinfo)
+        else:
+            self.restore_checkpoints(checkpoints)
+        # nb. an interrupted run has not advanced the generation, so it is
+        # resumed with the same one
+        self.generations = self.get_generations(
+            self.validator_infos, advance=len(self.filters) == 0
+        )
+        if checkpoints is not None:
+            for valinfo in self.validator_infos:
+                self.restore_failures(valinfo)
+
+        t0 = timer()
+        if workers > 1 and checkpoints is None:
+            summaries = self.scan_parallel(show_progress, workers)
+        else:
+            # only serial scans save checkpoints
+            self.checkpoint_interval = CHECKPOINT_INTERVAL
+            summaries = self.scan(show_progress)
+        if len(self.validator_infos) != 0:
+            METRICS.record_scan(
+                str(self.model_info), self.num_scanned, (timer() - t0) / TIME_UNIT
+            )
+
         for valinfo in self.validator_infos:
-            FailingObject.all_objects.filter(
-                validator_id=valinfo.get_validator_id()
-            ).update(is_valid=False)
-
-        # iterate over each object in the table and call each data
-        # validator on it. When an exception is encountered on a validator
-        # remove it from the list
-        progress = tqdm if show_progress else lambda x: x
-        valinfos = self.validator_infos.copy()
-        for obj in progress(self.iterate_model_objects()):
-            valinfos = list(self.run_for_object(valinfos, obj))
+            if valinfo.cache and valinfo.instance_method is not None:
+                ResultCache(valinfo).trim()
 
-        # now we can delete the invalid objects
+        if len(self.filters) != 0:
+            for valinfo in self.validator_infos:
+                self.delete_orphaned_failing_objects(valinfo)
+
+        # now we can delete the failing objects that were not re-validated
         for valinfo in self.validator_infos:
-            qs = FailingObject.all_objects.filter(
-                validator_id=valinfo.get_validator_id(), is_valid=False, allowed_to_fail=False
-            )
-            # noinspection PyProtectedMember
-            qs._raw_delete(qs.db)
+            self.sweep_failing_objects(valinfo, self.generations[valinfo])
+
+        if len(self.filters) != 0 or checkpoints is not None:
+            # the failures of the objects that were not re-validated (or
+            # were validated before the run was interrupted) still count
+            # towards the status of the validator
+            for valinfo, summary in summaries.items():
+                self.include_unchanged_failures(valinfo, summary)
 
-        for valinfo, summary in self._summaries.items():
+        for valinfo, summary in summaries.items():
             # skip_failures because we already created the FailingObjects
-            # in the call to handle_result
+            # when flushing the buffers
             self.summaries[valinfo] = self.handle_summary(valinfo, summary)
 
+        if self.high_water_mark is not None:
+            Validator.objects.filter(id__in=[
+                valinfo.get_validator_id()
+                for valinfo, summary in self.summaries.items()
+                if not (summary.is_exception or summary.timed_out or summary.truncated)
+            ]).update(high_water_mark=str(self.high_water_mark))
+
+        Validator.objects.filter(id__in=[
+            valinfo.get_validator_id() for valinfo in self.validator_infos
+        ]).update(checkpoint=None)
+
+        return self.summaries
+
+    def save_checkpoint(self, last_pk: Any) -> None:
+        """ save the progress of the scan up to (and including) the object
+            with primary key last_pk
+        """
+        # the FailingObjects of the objects up to last_pk must be saved
+        for buffer in self._buffers.values():
+            buffer.flush()
+        for valinfo in self.validator_infos:
+            summary = self._dropped.get(valinfo) or self._summaries[valinfo]
+            if summary.is_exception:
+                state = summary.exception_info_dict
+            else:
+                state = {
+                    "num_passing": summary.num_passing,
+                    "num_na": summary.num_na,
+                    "execution_time": summary.execution_time,
+                    "timed_out": summary.timed_out,
+                    "truncated": summary.truncated,
+                    # nb. the failures are restored from the FailingObjects
+                    "validator_latency": summary.validator_latency.get_state(),
+                    "persistence_latency": summary.persistence_latency.get_state(),
+                }
+            checkpoint = {
+                "run_id": self.run_id,
+                "last_pk": last_pk,
+                "filters": self.filters,
+                "high_water_mark": self.high_water_mark,
+                "spent": self._spent[valinfo],
+                "summary": state,
+            }
+            Validator.objects.filter(id=valinfo.get_validator_id()).update(
+                checkpoint=json.dumps(checkpoint, default=str)
+            )
+
+    def load_checkpoints(self) -> Optional[Dict[ValidatorInfo, dict]]:
+        """ return the checkpoint of each validator if they were all saved
+            by the same run, otherwise None
+        """
+        if len(self.validator_infos) == 0:
+            return None
+        valinfos = {valinfo.get_validator_id(): valinfo for valinfo in self.validator_infos}
+        checkpoints = {
+            valinfos[validator_id]: json.loads(checkpoint)
+            for validator_id, checkpoint in Validator.objects.filter(
+                id__in=valinfos.keys(), checkpoint__isnull=False
+            ).values_list("id", "checkpoint")
+        }
+        run_ids = {checkpoint["run_id"] for checkpoint in checkpoints.values()}
+        if len(checkpoints) != len(valinfos) or len(run_ids) != 1:
+            logger.cinfo(f"no checkpoint to resume for {self.model_info!s}")
+            return None
+        return checkpoints
+
+    def restore_checkpoints(self, checkpoints: Dict[ValidatorInfo, dict]) -> None:
+        """ continue the scan of an interrupted run after its checkpoint """
+        checkpoint = next(iter(checkpoints.values()))
+        self.run_id = checkpoint["run_id"]
+        self.resume_pk = checkpoint["last_pk"]
+        self.filters = checkpoint["filters"]
+        self.high_water_mark = checkpoint["high_water_mark"]
+        logger.cinfo(f"resuming {self.model_info!s} after object pk={self.resume_pk}")
+
+        for valinfo, checkpoint in checkpoints.items():
+            state = checkpoint["summary"]
+            self._spent[valinfo] = checkpoint["spent"]
+            for name in ("validator_latency", "persistence_latency"):
+                if name in state:
+                    state[name] = LatencyHistogram.from_state(state[name])
+            if state.get("exc_type") is not None:
+                self._summaries.pop(valinfo)
+                self._buffers.pop(valinfo)
+                exinfo = ExceptionInfo(**state)
+                self._dropped[valinfo] = SummaryEx.from_exception_info(exinfo)
+            elif state["timed_out"] or state["truncated"]:
+                self._buffers.pop(valinfo)
+                self._dropped[valinfo] = self._summaries.pop(valinfo)
+                self._dropped[valinfo].__dict__.update(state)
+            else:
+                self._summaries[valinfo].__dict__.update(state)
+                # the interrupted run may have saved FailingObjects of objects
+                # after the checkpoint, which are about to be re-validated
+                self.invalidate_failing_objects(valinfo, object_pk__gt=self.resume_pk)
+
+    def restore_failures(self, valinfo: ValidatorInfo) -> None:
+        """ restore the failures found before the checkpoint (from the
+            FailingObjects the interrupted run wrote) so that max_failures
+            counts the failures of the whole run
+        """
+        summary = self._dropped.get(valinfo) or self._summaries[valinfo]
+        if summary.is_exception:
+            return
+        qs = FailingObject.all_objects.filter(
+            validator_id=valinfo.get_validator_id(),
+            generation=self.generations[valinfo],
+            is_exception=False,
+            object_pk__lte=self.resume_pk,
+        ).order_by("object_pk").values_list("object_pk", "allowed_to_fail")
+        if len(self.filters) == 0:
+            rows = qs.iterator()
+        else:
+            # the records of the objects that were not re-validated by an
+            # incremental run have the same generation
+            object_pks = self.model._meta.default_manager \
+                             .filter(pk__lte=self.resume_pk, **self.filters) \
+                             .order_by("pk") \
+                             .values_list("pk", flat=True)
+            rows = (
+                row for pks in chunk(object_pks, 1000) for row in qs.filter(object_pk__in=pks)
+            )
+        summary.failures = FailureSet()
+        summary.num_allowed_to_fail = 0
+        for object_pk, allowed_to_fail in rows:
+            summary.failures.append(object_pk)
+            summary.num_allowed_to_fail += allowed_to_fail
+
+    def run_sample(self,
+                   show_progress: bool,
+                   sample: Union[int, float],
+                   ) -> Dict[ValidatorInfo, SummaryEx]:
+        """ run the data validators on a random sample of the objects
+            without updating the FailingObjects or the Validators
+
+         Args:
+            show_progress: if True display a progress bar
+            sample: the number (int) or the fraction (float) of the objects
+                to validate
+
+         :returns: a dictionary mapping ValidatorInfos to the SummaryEx
+            containing the validation results of the sample
+        """
+        queryset = self.model._meta.default_manager.filter(**self.filters)
+        if isinstance(sample, float):
+            sample = ceil(queryset.count() * sample)
+        self.sample_pks = sorted(random_pks(queryset, sample))
+        self._buffers.clear()
+        # a truncated sample would bias the estimated failure rates
+        self.max_failures = {}
+
+        for valinfo, summary in self.scan(show_progress).items():
+            summary.sample_size = len(self.sample_pks)
+            self.summaries[valinfo] = summary.complete()
         return self.summaries
 
+    def init_incremental(self, full: bool) -> Any:
+        """ restrict the objects to those that have changed since the
+            lowest high water mark of the validators (if the model is
+            configured for incremental validation)
+
+         :returns: the high water mark to store after the run
+        """
+        field_name = get_config(self.model).incremental_field
+        if field_name is None:
+            return None
+        field = self.model._meta.get_field(field_name)
+        queryset = self.model._meta.default_manager.all()
+        high_water_mark = queryset.aggregate(mark=Max(field_name))["mark"]
+        if high_water_mark is None:
+            return None
+
+        marks = Validator.objects.filter(
+            id__in=[valinfo.get_validator_id() for valinfo in self.validator_infos]
+        ).values_list("high_water_mark", flat=True)
+        if full or len(marks) != len(self.validator_infos) or None in marks:
+            return high_water_mark  # re-validate everything
+
+        since = min(field.to_python(mark) for mark in marks)
+        self.filters = {
+            f"{field_name}__gt": since,
+            f"{field_name}__lte": high_water_mark,
+        }
+        return max(since, high_water_mark)
+
+    def invalidate_failing_objects(self, valinfo: ValidatorInfo, **kwargs) -> None:
+        """ hide the FailingObjects of the objects to be validated until
+            they are written again (kwargs are extra filters on the
+            FailingObjects)
+
+         there is nothing to do when all objects are validated: the records
+         of the last run stay visible and the ones that are not written
+         again are swept when the run completes.
+        """
+        if len(self.filters) == 0 and len(kwargs) == 0:
+            return
+        qs = FailingObject.all_objects.filter(
+            validator_id=valinfo.get_validator_id(), **kwargs
+        )
+        if len(self.filters) == 0:
+            qs.update(generation=0)
+            return
+        object_pks = self.model._meta.default_manager \
+                         .filter(**self.filters) \
+                         .values_list("pk", flat=True)
+        for pks in chunk(object_pks, 1000):
+            qs.filter(object_pk__in=pks).update(generation=0)
+
+    def delete_orphaned_failing_objects(self, valinfo: ValidatorInfo) -> None:
+        """ delete the FailingObjects of objects that no longer exist
+
+         a full run sweeps them because they are not written again, but an
+         incremental run only re-validates the objects that have changed
+        """
+        qs = FailingObject.all_objects.filter(validator_id=valinfo.get_validator_id())
+        object_pks = qs.order_by("object_pk").values_list("object_pk", flat=True)
+        orphaned_pks = []
+        # nb. the model may be in another database than the FailingObjects
+        for pks in chunk(object_pks.iterator(), 1000):
+            existing = set(self.model._meta.default_manager
+                               .filter(pk__in=pks)
+                               .values_list("pk", flat=True))
+            orphaned_pks.extend(pk for pk in pks if pk not in existing)
+        for pks in chunk(orphaned_pks, 1000):
+            orphans = qs.filter(object_pk__in=pks)
+            # noinspection PyProtectedMember
+            orphans._raw_delete(orphans.db)
+
+    @staticmethod
+    def include_unchanged_failures(valinfo: ValidatorInfo, summary: SummaryEx) -> None:
+        """ replace the failures of an incremental run with all of the
+            failures of the validator
+        """
+        if summary.is_exception:
+            return
+        qs = FailingObject.objects.filter(
+            validator_id=valinfo.get_validator_id(), is_exception=False
+        )
+        summary.failures = FailureSet(qs.values_list("object_pk", flat=True).iterator())
+        summary.num_allowed_to_fail = qs.filter(allowed_to_fail=True).count()
+
+    def scan(self, show_progress: bool = False) -> Dict[ValidatorInfo, SummaryEx]:
+        """ call the data validators on each object and save the failures
+
+         :returns: a dictionary mapping ValidatorInfos to their (incomplete)
+            SummaryEx
+        """
+        # iterate over the objects in the table in chunks and call each data
+        # validator on them. When an exception is encountered on a validator
+        # (or it runs out of time or reaches max_failures) remove it from
+        # the list
+        valinfos = [
+            valinfo for valinfo in self.validator_infos if valinfo not in self._dropped
+        ]
+        self._caches = {
+            valinfo: ResultCache(valinfo, read_only=valinfo not in self._buffers)
+            for valinfo in valinfos if valinfo.cache and valinfo.instance_method is not None
+        }
+        for valinfo in valinfos:
+            if self.max_failures.get(valinfo) is not None:
+                self._allowed_pks[valinfo] = set(FailingObject.all_objects.filter(
+                    validator_id=valinfo.get_validator_id(), allowed_to_fail=True
+                ).values_list("object_pk", flat=True))
+                self._num_allowed[valinfo] = self._summaries[valinfo].num_allowed_to_fail
+        last_checkpoint = timer()
+        from tqdm import tqdm
+        with tqdm(disable=not show_progress) as progress:
+            for objs in self.iterate_model_chunks():
+                valinfos = self.run_for_chunk(valinfos, objs)
+                progress.update(len(objs))
+                self.num_scanned += len(objs)
+                if self.checkpoint_interval is not None and \
+                        timer() - last_checkpoint >= self.checkpoint_interval * TIME_UNIT:
+                    self.save_checkpoint(objs[-1].pk)
+                    last_checkpoint = timer()
+                if len(valinfos) == 0:
+                    # every validator has been dropped
+                    break
+
+        for buffer in self._buffers.values():
+            buffer.flush()
+
+        return {
+            valinfo: self._dropped.get(valinfo) or self._summaries[valinfo]
+            for valinfo in self.validator_infos
+        }
+
+    def scan_parallel(self, show_progress: bool, workers: int) -> Dict[ValidatorInfo, SummaryEx]:  # noqa E501
+        """ scan ranges of primary keys in worker processes and merge the
+            results into the same summaries as a serial scan (in order of
+            primary key)
+
+         nb. a validator that reaches max_failures has the same failures
+         as in a serial scan, but the objects the shards validated after
+         the last of them are still counted as passing or NA
+
+         :returns: a dictionary mapping ValidatorInfos to their (incomplete)
+            SummaryEx
+        """
+        ranges = pk_ranges(
+            self.model._meta.default_manager.filter(**self.filters),
+            workers * self.SHARDS_PER_WORKER
+        )
+        if len(ranges) == 0:
+            # the table is empty or the primary key is not an integer
+            return self.scan(show_progress)
+
+        run = partial(
+            run_shard,
+            self.model_info.app_label,
+            self.model_info.model_name,
+            [valinfo.method_name for valinfo in self.validator_infos],
+            self.flush_size,
+            self.filters,
+            self.deadline,
+            # each worker scans SHARDS_PER_WORKER shards one after the other
+            {
+                valinfo.method_name: budget / self.SHARDS_PER_WORKER
+                for valinfo, budget in self.budgets.items() if budget is not None
+            },
+            # nb. each shard stops at max_failures, and the merged failures
+            # are cut to max_failures (see truncate_failures)
+            {
+                valinfo.method_name: limit
+                for valinfo, limit in self.max_failures.items() if limit is not None
+            },
+            {
+                valinfo.method_name: generation
+                for valinfo, generation in self.generations.items()
+            },
+        )
+        if show_progress:
+            from tqdm import tqdm
+            progress = partial(tqdm, total=len(ranges), unit="shard")
+        else:
+            progress = lambda x: x  # noqa E731
+        shard_summaries: Dict[ValidatorInfo, List[SummaryEx]] = {
+            valinfo: [] for valinfo in self.validator_infos
+        }
+        with process_pool(workers) as pool:
+            for num_scanned, shard in progress(pool.map(run, ranges)):
+                self.num_scanned += num_scanned
+                for valinfo in self.validator_infos:
+                    shard_summaries[valinfo].append(shard[valinfo.method_name])
+
+        summaries = {
+            valinfo: SummaryEx.merge(shards)
+            for valinfo, shards in shard_summaries.items()
+        }
+        for valinfo, summary in summaries.items():
+            if summary.is_exception:
+                # a serial scan stops calling the validator at the first
+                # exception, so discard anything found after that object
+                # (or after its shard if it is not attributed to an object)
+                last_pk = summary.exc_obj_pk
+                if last_pk is None:
+                    shard = next(i for i, shard_summary in enumerate(shard_summaries[valinfo])
+                                 if shard_summary is summary)
+                    _, last_pk = ranges[shard]
+                self.invalidate_failing_objects(valinfo, object_pk__gt=last_pk)
+            elif self.max_failures.get(valinfo) is not None:
+                self.truncate_failures(valinfo, summary, self.max_failures[valinfo])
+        return summaries
+
+    def truncate_failures(self,
+                          valinfo: ValidatorInfo,
+                          summary: SummaryEx,
+                          limit: int) -> None:
+        """ keep the failures of a merged summary up to the one at which a
+            serial scan would have reached max_failures (not counting the
+            objects allowed to fail), and discard the FailingObjects after it
+        """
+        if len(summary.failures) - summary.num_allowed_to_fail <= limit:
+            return
+        allowed_pks = set(FailingObject.all_objects.filter(
+            validator_id=valinfo.get_validator_id(),
+            generation=self.generations[valinfo],
+            is_exception=False,
+            allowed_to_fail=True,
+        ).values_list("object_pk", flat=True))
+        failures, num_allowed_to_fail = FailureSet(), 0
+        for object_pk in summary.failures:
+            failures.append(object_pk)
+            num_allowed_to_fail += object_pk in allowed_pks
+            if len(failures) - num_allowed_to_fail == limit:
+                break
+        summary.failures = failures
+        summary.num_allowed_to_fail = num_allowed_to_fail
+        summary.truncated = True
+        self.invalidate_failing_objects(valinfo, object_pk__gt=object_pk)
+
+    def run_for_chunk(self,
+                      valinfos: List[ValidatorInfo],
+                      objs: List[models.Model]
+                      ) -> List[ValidatorInfo]:
+        """ run each data validator on a chunk of objects
+
+         :returns: the list of ValidatorInfos that did not hit an exception,
+            run out of time or reach max_failures
+        """
+        batch_valinfos, valinfos = partition(
+            valinfos, predicate=lambda valinfo: valinfo.batch_method is not None
+        )
+        async_valinfos, valinfos = partition(
+            valinfos, predicate=lambda valinfo: valinfo.is_async
+        )
+        caches = [self._caches[valinfo] for valinfo in valinfos if valinfo in self._caches]
+        for cache in caches:
+            cache.load(objs)
+        for obj in objs:
+            valinfos = list(self.run_for_object(valinfos, obj))
+        for cache in caches:
+            cache.flush()
+        if len(async_valinfos) != 0:
+            valinfos.extend(self.run_async_validators(async_valinfos, objs))
+        for valinfo in batch_valinfos:
+            exinfo = self.run_batch_validator(valinfo, objs)
+            if exinfo is not None:
+                self.drop_validator(valinfo, exinfo)
+            elif self.is_over_budget(valinfo):
+                self.stop_validator(valinfo).timed_out = True
+            elif self.is_over_max_failures(valinfo):
+                self.stop_validator(valinfo).truncated = True
+            else:
+                valinfos.append(valinfo)
+        return valinfos
+
     def run_for_object(self,
                        valinfos: List[ValidatorInfo],
                        obj: models.Model
                        ) -> Generator[ValidatorInfo, None, None]:
         """ run each data validator on the given object
 
-         :returns: the list of ValidatorInfos that did not hit an exception
+         :returns: the list of ValidatorInfos that did not hit an exception,
+            run out of time or reach max_failures
         """
         self._time = timer()
         for valinfo in valinfos:
             exinfo = self.run_validator_for_object(valinfo, obj)
-            if exinfo is None:
-                yield valinfo
+            if exinfo is not None:
+                self.drop_validator(valinfo, exinfo)
+            elif self.is_over_budget(valinfo):
+                self.stop_validator(valinfo).timed_out = True
+            elif self.is_over_max_failures(valinfo):
+                self.stop_validator(valinfo).truncated = True
             else:
-                # stop calling this validator if an exception was hit
-                self._summaries.pop(valinfo)
-                exinfo.exc_obj_pk = obj.pk
-                summary = SummaryEx.from_exception_info(exinfo)
-                self.summaries[valinfo] = self.handle_summary(valinfo, summary)
+                yield valinfo
+
+    def drop_validator(self, valinfo: ValidatorInfo, exinfo: ExceptionInfo) -> None:
+        """ stop calling a validator that hit an exception """
+        self._summaries.pop(valinfo)
+        if valinfo in self._buffers:
+            self._buffers.pop(valinfo).flush()
+        self._dropped[valinfo] = SummaryEx.from_exception_info(exinfo)
+
+    def is_over_budget(self, valinfo: ValidatorInfo) -> bool:
+        """ return True if the validator has used up its time budget or the
+            deadline of the run has passed
+        """
+        budget = self.budgets.get(valinfo)
+        if budget is not None and self._spent[valinfo] >= budget:
+            return True
+        return self.deadline is not None and time.time() >= self.deadline
+
+    def is_over_max_failures(self, valinfo: ValidatorInfo) -> bool:
+        """ return True if the validator has reached its maximum number of
+            failures (not counting objects that are allowed to fail)
+        """
+        limit = self.max_failures.get(valinfo)
+        if limit is None:
+            return False
+        return len(self._summaries[valinfo].failures) - self._num_allowed[valinfo] >= limit
+
+    def stop_validator(self, valinfo: ValidatorInfo) -> SummaryEx:
+        """ stop calling a validator that ran out of time or reached its
+            maximum number of failures (keeping the results of the objects
+            it was already called on)
+
+         :returns: the summary of the validator
+        """
+        summary = self._summaries.pop(valinfo)
+        if valinfo in self._buffers:
+            self._buffers.pop(valinfo).flush()
+        self._dropped[valinfo] = summary
+        return summary
 
     def run_validator_for_object(self,
                                  valinfo: ValidatorInfo,
@@ -213,132 +1097,444 @@ class InstanceMethodRunner(ResultHandlerMixin):
 
          :returns: the exception info if there was any
         """
+        t0 = timer()
+        cache = self._caches.get(valinfo)
+        fingerprint, cached = cache.get(obj) if cache is not None else (None, None)
+        if cached is not None:
+            retval, exinfo = cached, None
+        else:
+            # noinspection PyBroadException
+            try:
+                retval = valinfo.instance_method(obj)
+                exinfo = None
+            except Exception:
+                retval = None
+                exinfo = ExceptionInfoMixin.get_exception_info()
+        t1 = timer()
+        self._spent[valinfo] += (t1 - t0) / TIME_UNIT
+
+        exinfo = self.record_result(valinfo, obj, retval, exinfo)
+        if cache is not None and cached is None and exinfo is None:
+            cache.add(obj.pk, fingerprint, retval)
+
+        t = timer()
+        execution_time, self._time = t - self._time, t
+        summary = self._summaries[valinfo]
+        summary.validator_latency.add((t1 - t0) / TIME_UNIT)
+        summary.persistence_latency.add((t - t1) / TIME_UNIT)
+        if summary.execution_time is not None:
+            summary.execution_time += execution_time
+
+        return exinfo
+
+    def run_async_validators(self,
+                             valinfos: List[ValidatorInfo],
+                             objs: List[models.Model]
+                             ) -> List[ValidatorInfo]:
+        """ call the async data validators on a chunk of objects
+            concurrently, and record the results in order of the objects
+
+         :returns: the list of ValidatorInfos that did not hit an exception,
+            run out of time or reach max_failures
+        """
+        results = run_coroutine(self.gather_async_validators(valinfos, objs))
+
+        remaining = []
+        for valinfo in valinfos:
+            # each validator is charged the time from the start of its first
+            # call to the end of its last call (not the whole chunk)
+            elapsed = max(end for _, _, _, end in results[valinfo]) \
+                - min(start for _, _, start, _ in results[valinfo])
+            self._spent[valinfo] += elapsed / TIME_UNIT
+            summary = self._summaries[valinfo]
+            t = timer()
+            for obj, (retval, exinfo, start, end) in zip(objs, results[valinfo]):
+                exinfo = self.record_result(valinfo, obj, retval, exinfo)
+                summary.validator_latency.add((end - start) / TIME_UNIT)
+                summary.persistence_latency.add((timer() - t) / TIME_UNIT)
+                t = timer()
+                # the results after the first exception (or max_failures)
+                # are discarded, the same as a sync validator
+                if exinfo is not None:
+                    self.drop_validator(valinfo, exinfo)
+                    break
+                elif self.is_over_max_failures(valinfo):
+                    self.stop_validator(valinfo).truncated = True
+                    break
+            else:
+                if self.is_over_budget(valinfo):
+                    self.stop_validator(valinfo).timed_out = True
+                else:
+                    remaining.append(valinfo)
+            if summary.execution_time is not None:
+                summary.execution_time += elapsed
+        return remaining
+
+    async def gather_async_validators(self,
+                                      valinfos: List[ValidatorInfo],
+                                      objs: List[models.Model]
+                                      ) -> Dict[ValidatorInfo, List[Tuple[Any, Optional[ExceptionInfo], int, int]]]:  # noqa E501
+        """ await the async data validators on each object, with at most
+            async_concurrency calls pending at the same time
+
+         :returns: a dictionary mapping ValidatorInfos to a list of
+            (return value, exception info, start time, end time) of each
+            object
+        """
+        semaphore = asyncio.Semaphore(self.async_concurrency)
+
+        async def call(valinfo: ValidatorInfo, obj: models.Model):
+            async with semaphore:
+                t0 = timer()
+                # noinspection PyBroadException
+                try:
+                    retval = await valinfo.instance_method(obj)
+                    exinfo = None
+                except Exception:
+                    retval = None
+                    exinfo = ExceptionInfoMixin.get_exception_info()
+                return retval, exinfo, t0, timer()
+
+        results = await asyncio.gather(*[
+            call(valinfo, obj) for valinfo in valinfos for obj in objs
+        ])
+        return {
+            valinfo: results[i * len(objs):(i + 1) * len(objs)]
+            for i, valinfo in enumerate(valinfos)
+        }
+
+    def run_batch_validator(self,
+                            valinfo: ValidatorInfo,
+                            objs: List[models.Model]
+                            ) -> Optional[ExceptionInfo]:
+        """ run the given batch data validator for a chunk of objects
+
+         :returns: the exception info if there was any
+        """
+        t0 = timer()
+        chunk_exinfo = None
         # noinspection PyBroadException
         try:
-            retval = valinfo.instance_method(obj)
-            exinfo = None
+            retvals = check_batch_return_value(objs, valinfo.batch_method(self.model, objs))
+            results = [(obj, retval, None) for obj, retval in zip(objs, retvals)]
         except Exception:
-            retval = None
-            exinfo = ExceptionInfoMixin.get_exception_info()
+            chunk_exinfo = ExceptionInfoMixin.get_exception_info()
+            results = self.run_batch_validator_per_object(valinfo, objs)
+        t1 = timer()
+        self._spent[valinfo] += (t1 - t0) / TIME_UNIT
+
+        exinfo = None
+        for obj, retval, error in results:
+            exinfo = self.record_result(valinfo, obj, retval, error)
+            if exinfo is not None:
+                break
+        else:
+            # no object raised on its own, so the exception is not
+            # attributed to any of them
+            exinfo = chunk_exinfo
 
-        result, exinfo, allowed_to_fail = self.handle_return_value(
-            valinfo, obj, retval, exinfo
-        )
+        # the time per object is the average over the chunk
+        t2 = timer()
+        summary = self._summaries[valinfo]
+        summary.validator_latency.add((t1 - t0) / TIME_UNIT / len(objs), len(objs))
+        summary.persistence_latency.add((t2 - t1) / TIME_UNIT / len(objs), len(objs))
+        if summary.execution_time is not None:
+            summary.execution_time += t2 - t0
+
+        return exinfo
+
+    def run_batch_validator_per_object(self,
+                                       valinfo: ValidatorInfo,
+                                       objs: List[models.Model]
+                                       ) -> List[Tuple[models.Model, Any, Optional[ExceptionInfo]]]:  # noqa E501
+        """ call a batch data validator that raised an exception on one
+            object at a time, to find the object that raises
+
+         :returns: a list of (object, return value, exception info) up to
+            and including the first object that raised
+        """
+        results = []
+        for obj in objs:
+            # noinspection PyBroadException
+            try:
+                retvals = valinfo.batch_method(self.model, [obj])
+                retval, = check_batch_return_value([obj], retvals)
+                results.append((obj, retval, None))
+            except Exception:
+                results.append((obj, None, ExceptionInfoMixin.get_exception_info()))
+                break
+        return results
+
+    def record_result(self,
+                      valinfo: ValidatorInfo,
+                      obj: models.Model,
+                      retval: Any,
+                      exinfo: Optional[ExceptionInfo]
+                      ) -> Optional[ExceptionInfo]:
+        """ count the value returned by a validator for an object on the
+            summary, and buffer the FailingObject if it failed
+
+         :returns: the exception info if there was any
+        """
+        result, exinfo = check_return_value(retval, exinfo, obj.pk)
+        if (result is FAIL or result is EXCEPTION) and valinfo in self._buffers:
+            # objects allowed to fail are counted when the buffer is flushed
+            # (there are no buffers when sampling)
+            defaults = self.get_failing_object_defaults(
+                result, retval, exinfo, self.generations[valinfo]
+            )
+            self._buffers[valinfo].add(obj.pk, defaults)
 
         summary = self._summaries[valinfo]
         if result is PASS:
             summary.num_passing += 1
         elif result is FAIL:
             summary.failures.append(obj.pk)
-            if allowed_to_fail:
-                summary.num_allowed_to_fail += 1
+            if valinfo in self._allowed_pks:
+                # the same as the allowed_to_fail of the FailingObject, so
+                # the buffer doesn't need to be flushed to count them
+                if isinstance(retval, FAIL) and retval.allowed_to_fail is not None:
+                    self._num_allowed[valinfo] += retval.allowed_to_fail
+                else:
+                    self._num_allowed[valinfo] += obj.pk in self._allowed_pks[valinfo]
         elif result is NA:
             summary.num_na += 1
 
-        t = timer()
-        execution_time, self._time = t - self._time, t
-        if summary.execution_time is not None:
-            summary.execution_time += execution_time
-
         return exinfo
 
     def get_related_lookups(self) -> Tuple[Set[str], Set[str]]:
-        """ check that the select_related and prefetch_related fields are
-            valid and display a warning if they are not
-
-         :returns: the union of valid select related and prefetch related
-            fields accross all validators on the model
+        """ return the union of the select related and prefetch related
+            lookups accross all validators on the model (invalid lookups
+            were already removed when the registry was built)
         """
-        qs = self.model._meta.default_manager.all()
-
-        try:
-            obj = qs.first()
-        except ObjectDoesNotExist:
-            return set(), set()
-
-        select_related = set()
-        for valinfo in self.validator_infos:
-            not_seen = valinfo.select_related - select_related
-            if len(not_seen) != 0:
-                try:
-                    qs.select_related(*not_seen).first()
-                    select_related |= not_seen
-                except FieldError as e:
-                    logger.cwarning(
-                        f"{e.args[0]}. select_related fields will be skipped for"
-                        f" {self.model_info.model_name}.{valinfo.method_name}"
-                    )
-
-        prefetch_related = set()
+        select_related, prefetch_related = set(), set()
         for valinfo in self.validator_infos:
-            not_seen = valinfo.prefetch_related - prefetch_related
-            if len(not_seen) != 0:
-                try:
-                    models.prefetch_related_objects([obj], *valinfo.prefetch_related)
-                    prefetch_related |= not_seen
-                except (FieldError, AttributeError, ValueError) as e:
-                    logger.cwarning(
-                        f"{e.args[0]}. prefetch_realted will be skipped for "
-                        f"{self.model_info.model_name}.{valinfo.method_name}"
-                    )
-
+            select_related |= valinfo.select_related
+            prefetch_related |= valinfo.prefetch_related
         return select_related, prefetch_related
 
-    def iterate_model_objects(self, chunk_size: int = 2000) -> Generator[models.Model, None, None]:  # noqa E501
-        """ iterate the objects of a model with select/prefetch related """
+    def get_deferred_fields(self, select_related: Set[str]) -> Set[str]:
+        """ return the fields of the model that are not read by any of the
+            validators (a validator without only or defer reads every field)
+        """
+        deferred = {
+            f.name for f in self.model._meta.concrete_fields if not f.primary_key
+        }
+        for valinfo in self.validator_infos:
+            if valinfo.only is not None:
+                deferred -= valinfo.only
+            else:
+                deferred &= valinfo.defer
+        # fields followed by select_related cannot be deferred
+        return deferred - {lookup.split(LOOKUP_SEP)[0] for lookup in select_related}
+
+    def get_queryset(self) -> models.QuerySet:
+        """ return the objects of the model to validate with select/prefetch
+            related and without the fields that the validators do not read
+        """
         select_related, prefetch_related = self.get_related_lookups()
         queryset = self.model._meta.default_manager \
+                       .filter(**self.filters) \
                        .select_related(*select_related) \
-                       .prefetch_related(*prefetch_related)
-        yield from queryset_iterator(queryset, chunk_size)
+                       .prefetch_related(*prefetch_related) \
+                       .defer(*self.get_deferred_fields(select_related))
+        if self.pk_range is not None:
+            first_pk, last_pk = self.pk_range
+            queryset = queryset.filter(pk__gte=first_pk, pk__lte=last_pk)
+        if self.resume_pk is not None:
+            queryset = queryset.filter(pk__gt=self.resume_pk)
+        # checkpoints and shards rely on the objects being in order of pk
+        return queryset.order_by("pk")
+
+    def iterate_model_chunks(self,
+                             chunk_size: Optional[int] = None
+                             ) -> Iterable[List[models.Model]]:
+        """ iterate the objects of a model in chunks """
+        chunk_size = chunk_size or self.CHUNK_SIZE
+        if self.sample_pks is not None:
+            for pks in chunk(self.sample_pks, chunk_size):
+                yield list(self.get_queryset().filter(pk__in=pks))
+            return
+        iterator = get_config(self.model).iterator or ITERATOR
+        if iterator == "chunked":
+            yield from queryset_chunks(self.get_queryset(), chunk_size)
+        elif iterator == "keyset":
+            yield from keyset_chunks(self.get_queryset(), chunk_size)
+        else:
+            raise ValueError(
+                f"{iterator} is not a valid iterator. Options are: {', '.join(ITERATORS)}"
+            )
+
+
+def run_shard(app_label: str,
+              model_name: str,
+              method_names: List[str],
+              flush_size: int,
+              filters: Dict[str, Any],
+              deadline: Optional[float],
+              budgets: Dict[str, float],
+              max_failures: Dict[str, int],
+              generations: Dict[str, int],
+              pk_range: Tuple[int, int]
+              ) -> Tuple[int, Dict[str, SummaryEx]]:
+    """ scan a range of primary keys of a model (in a worker process)
+
+     :returns: the number of objects scanned and a dictionary mapping
+        method names to their (incomplete) SummaryEx
+    """
+    model_info = REGISTRY[apps.get_model(app_label, model_name)]
+    validator_infos = [model_info.validators[name] for name in method_names]
+    runner = InstanceMethodRunner(
+        model_info.model,
+        validator_infos,
+        flush_size=flush_size,
+        pk_range=pk_range,
+        filters=filters,
+        deadline=deadline,
+        budgets={valinfo: budgets.get(valinfo.method_name) for valinfo in validator_infos},
+        max_failures={
+            valinfo: max_failures.get(valinfo.method_name) for valinfo in validator_infos
+        },
+        generations={valinfo: generations[valinfo.method_name] for valinfo in validator_infos},
+    )
+    summaries = {
+        valinfo.method_name: summary
+        for valinfo, summary in runner.scan().items()
+    }
+    return runner.num_scanned, summaries
 
 
 class ClassMethodRunner(ResultHandlerMixin):
+    # the error code postgres raises when a statement timeout is hit
+    QUERY_CANCELED = "57014"
+
     def __init__(self,
                  model: Type[models.Model],
-                 validator_infos: List[ValidatorInfo]):
+                 validator_infos: List[ValidatorInfo],
+                 deadline: Optional[float] = None,
+                 max_failures: Optional[Dict[ValidatorInfo, int]] = None):
         super().__init__()
         self.model = model
         self.validator_infos = validator_infos
         assert all(v.class_method is not None for v in self.validator_infos)
+        # do not start a validator after this (unix) time
+        self.deadline = deadline
+        # record at most this many failures of each validator
+        if max_failures is None:
+            max_failures = {info: info.max_failures for info in self.validator_infos}
+        self.max_failures = max_failures
+        self.generations: Dict[ValidatorInfo, int] = {}
         self.summaries: Dict[ValidatorInfo, SummaryEx] = {}
 
-    def run(self) -> Dict[ValidatorInfo, SummaryEx]:
+    def run(self, pool: Optional[Executor] = None) -> Dict[ValidatorInfo, SummaryEx]:
         """ run all class-method validators
 
+         Args:
+            pool: if provided run the validators concurrently in this thread
+                pool (see parallel.thread_pool), so each of them queries
+                the database on the connection of a worker thread
+
          :returns: a dictionary mapping ValidatorInfos to the SummaryEx
             containing the validation results
         """
-        for valinfo in self.validator_infos:
-            FailingObject.all_objects.filter(
-                validator_id=valinfo.get_validator_id()
-            ).update(is_valid=False)
-
-        for valinfo in self.validator_infos:
-            self.run_validator(valinfo)
+        self.generations = self.get_generations(self.validator_infos, advance=True)
+
+        if pool is None:
+            for valinfo in self.validator_infos:
+                self.run_validator(valinfo)
+            return self.summaries
+
+        # only the validators run in the pool. The results are saved by
+        # this thread (in the same order as a serial run) so the writes
+        # don't contend with each other
+        get_summary = close_connections(self.get_summary)
+        futures = [pool.submit(get_summary, valinfo) for valinfo in self.validator_infos]
+        for valinfo, future in zip(self.validator_infos, futures):
+            self.save_summary(valinfo, future.result())
+        return self.summaries
 
-        # clean up any remaining invalid FailingObjects
-        for valinfo in self.validator_infos:
-            qs = FailingObject.all_objects.filter(
-                validator_id=valinfo.get_validator_id(), is_valid=False, allowed_to_fail=False
-            )
-            # noinspection PyProtectedMember
-            qs._raw_delete(qs.db)
+    def get_budget(self, valinfo: ValidatorInfo) -> Optional[float]:
+        """ return the number of seconds the validator may run for """
+        budgets = [valinfo.timeout]
+        if self.deadline is not None:
+            budgets.append(self.deadline - time.time())
+        budgets = [budget for budget in budgets if budget is not None]
+        return min(budgets) if len(budgets) != 0 else None
+
+    def call_validator(self,
+                       valinfo: ValidatorInfo,
+                       budget: Optional[float]
+                       ) -> Optional[SummaryEx]:
+        """ call a class-method validator, cancelling its queries if they
+            run over the budget (only supported on postgres)
+
+         :returns: the SummaryEx, or None if the validator was cancelled
+        """
+        using = router.db_for_read(self.model)
+        if budget is None or connections[using].vendor != "postgresql":
+            return SummaryEx.from_return_value(valinfo.class_method(self.model))
 
-        return self.summaries
+        try:
+            with transaction.atomic(using=using):
+                with connections[using].cursor() as cursor:
+                    timeout_ms = max(1, int(budget * 1000))
+                    cursor.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+                summary = SummaryEx.from_return_value(valinfo.class_method(self.model))
+                if isinstance(summary.failures, QuerySet):
+                    # evaluate the queryset before the timeout is reset
+                    summary.failures = summary.get_failure_pks()
+                return summary
+        except OperationalError as e:
+            if getattr(e.__cause__, "pgcode", None) == self.QUERY_CANCELED:
+                return None
+            raise
 
     def run_validator(self, valinfo: ValidatorInfo) -> None:
         """ run a given class-method validator and hande the result """
-        # noinspection PyBroadException
+        self.save_summary(valinfo, self.get_summary(valinfo))
+
+    def get_summary(self, valinfo: ValidatorInfo) -> SummaryEx:
+        """ run a given class-method validator
+
+         :returns: the SummaryEx, with the failures evaluated
+        """
+        budget = self.get_budget(valinfo)
         t0 = timer()
-        try:
-            retval = valinfo.class_method(self.model)
-            summary = SummaryEx.from_return_value(retval)
-        except Exception:  # noqa
-            exinfo = ExceptionInfoMixin.get_exception_info()
-            summary = SummaryEx.from_exception_info(exinfo)
+        if budget is not None and budget <= 0:
+            # the deadline has already passed
+            summary = None
+        else:
+            # noinspection PyBroadException
+            try:
+                summary = self.call_validator(valinfo, budget)
+            except Exception:  # noqa
+                exinfo = ExceptionInfoMixin.get_exception_info()
+                summary = SummaryEx.from_exception_info(exinfo)
+
+        if summary is None:
+            summary = SummaryEx(num_passing=None, num_na=None, num_allowed_to_fail=None,
+                                failures=None, timed_out=True)
+        elif budget is not None and (timer() - t0) / TIME_UNIT > budget:
+            # the validator could not be cancelled so it ran to completion,
+            # and its result stands
+            logger.cwarning(
+                f"{valinfo!s} ran over its timeout, but cannot be cancelled "
+                f"on this database"
+            )
+        if self.max_failures.get(valinfo) is not None and not summary.is_exception:
+            summary.truncate(self.max_failures[valinfo])
+        if isinstance(summary.failures, QuerySet):
+            summary.failures = summary.get_failure_pks()
 
-        summary = self.update_failing_objects(valinfo, summary)
+        summary.execution_time = timer() - t0
+        return summary
+
+    def save_summary(self, valinfo: ValidatorInfo, summary: SummaryEx) -> None:
+        """ save the FailingObjects and the status of a validator """
+        t0 = timer() - summary.execution_time
+        summary = self.update_failing_objects(valinfo, summary, self.generations[valinfo])
+        # clean up the FailingObjects that were not found again
+        self.sweep_failing_objects(valinfo, self.generations[valinfo])
         summary.execution_time = timer() - t0
         self.summaries[valinfo] = self.handle_summary(valinfo, summary)
 
@@ -373,9 +1569,39 @@ class ModelValidationRunner:
                     f"{method} is not a data validator on {self.model_info.model_name}"
                 )
 
-    def run(self, show_progress: bool = False) -> List[Tuple[ValidatorInfo, SummaryEx]]:
+    def run(self,
+            show_progress: bool = False,
+            workers: int = 1,
+            full: bool = False,
+            sample: Union[int, float, None] = None,
+            resume: bool = False,
+            deadline: Optional[float] = None,
+            fail_fast: bool = False,
+            class_pool: Optional[Executor] = None,
+            ) -> List[Tuple[ValidatorInfo, SummaryEx]]:
         """ run validation for specified method
 
+         Args:
+            show_progress: if True display a progress bar
+            workers: the number of processes used to run the instance
+                method validators
+            full: if True re-validate all objects of a model that is
+                configured for incremental validation
+            sample: if provided only validate a random sample of this many
+                objects (int) or this fraction of the objects (float). The
+                class method validators are skipped, and the results are
+                not saved to the database
+            resume: if True continue the instance method validators from
+                the last checkpoint of an interrupted run
+            deadline: if provided stop calling the validators at this unix
+                time. The validators that were cut short have the status
+                TIMEOUT
+            fail_fast: if True stop each validator at its first failure
+                (overriding max_failures)
+            class_pool: if provided run the class method validators
+                concurrently in this thread pool (see parallel.thread_pool).
+                The pool can be shared by the runners of several models
+
          :returns: the list of ValidatorInfos and SummaryEx containing the
             validation summaries. If method_names was provided to __init__
             then the results are returned in the same order.
@@ -393,10 +1619,21 @@ class ModelValidationRunner:
             predicate=lambda valinfo: valinfo.class_method is not None
         )
 
-        class_summaries = ClassMethodRunner(self.model, classmethod_infos).run()
+        max_failures = None
+        if fail_fast:
+            max_failures = {self.model_info.validators[name]: 1 for name in self.method_names}
+
+        if sample is not None:
+            for valinfo in classmethod_infos:
+                logger.cinfo(f"skipping class method {valinfo.method_name} when sampling")
+            instance_summaries = InstanceMethodRunner(self.model, instancemethod_infos, deadline=deadline).run_sample(show_progress, sample)  # noqa E501
+            summaries.update({k.method_name: (k, v) for k, v in instance_summaries.items()})
+            return [summaries[name] for name in self.method_names if name in summaries]
+
+        class_summaries = ClassMethodRunner(self.model, classmethod_infos, deadline, max_failures).run(class_pool)  # noqa E501
         summaries.update({k.method_name: (k, v) for k, v in class_summaries.items()})
 
-        instance_summaries = InstanceMethodRunner(self.model, instancemethod_infos).run(show_progress)  # noqa E501
+        instance_summaries = InstanceMethodRunner(self.model, instancemethod_infos, deadline=deadline, max_failures=max_failures).run(show_progress, workers, full, resume)  # noqa E501
         summaries.update({k.method_name: (k, v) for k, v in instance_summaries.items()})
 
         return [summaries[name] for name in self.method_names]
@@ -414,7 +1651,9 @@ class ObjectValidationRunner(ResultHandlerMixin):
         # this is the whole point of overloading data validators.
         self.instancemethod_infos, self.classmethod_infos = partition(
             self.model_info.validators.values(),
-            predicate=lambda valinfo: valinfo.instance_method is not None
+            predicate=lambda valinfo: (
+                valinfo.instance_method is not None or valinfo.batch_method is not None
+            )
         )
 
     def run(self, class_methods: bool = True) -> Tuple[int, int, int]:
@@ -427,25 +1666,14 @@ class ObjectValidationRunner(ResultHandlerMixin):
          :returns: a tuple of the number passing (or na), the number
             failing, and the number of exceptions
         """
-        validator_ids = [v.get_validator_id() for v in self.instancemethod_infos]
-        FailingObject.all_objects.filter(
-            validator_id__in=validator_ids, object_pk=self.obj.pk
-        ).update(is_valid=False)
-
+        generations = self.get_generations(
+            self.instancemethod_infos, advance=False, in_progress=True
+        )
         instance_results = [
-            self.run_for_object(valinfo)
+            self.run_for_object(valinfo, generations[valinfo])
             for valinfo in self.instancemethod_infos
         ]
 
-        qs = FailingObject.all_objects.filter(
-            validator_id__in=validator_ids,
-            object_pk=self.obj.pk,
-            is_valid=False,
-            allowed_to_fail=False
-        )
-        # noinspection PyProtectedMember
-        qs._raw_delete(qs.db)
-
         if class_methods:
             class_results = ClassMethodRunner(self.model, self.classmethod_infos).run()
         else:
@@ -461,23 +1689,62 @@ class ObjectValidationRunner(ResultHandlerMixin):
         assert set(results.keys()) <= set(keys), f"unknown status {results.keys()!s}"
         return tuple(results[key] for key in keys)  # noqa
 
-    def run_for_object(self, valinfo: ValidatorInfo) -> Status:
+    def run_for_object(self,
+                       valinfo: ValidatorInfo,
+                       generation: Optional[int] = None
+                       ) -> Status:
         """ run a validator for a single object
 
+         Args:
+            valinfo: the validator to run
+            generation: the generation to write a FailingObject with
+                (defaults to the current generation of the validator, or
+                the generation of a run in progress)
+
          :returns: True if there was no validation error
         """
+        if generation is None:
+            generation = self.get_generations(
+                [valinfo], advance=False, in_progress=True
+            )[valinfo]
+        fobjs = FailingObject.all_objects.filter(
+            validator_id=valinfo.get_validator_id(), object_pk=self.obj.pk
+        )
+        # None if the object was not failing
+        was_allowed_to_fail = FailingObject.objects.filter(
+            validator_id=valinfo.get_validator_id(), object_pk=self.obj.pk
+        ).values_list("allowed_to_fail", flat=True).first()
+
         # noinspection PyBroadException
         try:
-            retval = valinfo.instance_method(self.obj)
+            if valinfo.instance_method is not None:
+                retval = valinfo.instance_method(self.obj)
+                if valinfo.is_async:
+                    retval = run_coroutine(retval)
+            else:
+                retval, = check_batch_return_value(
+                    [self.obj], valinfo.batch_method(self.model, [self.obj])
+                )
             exinfo = None
         except Exception:
             retval = None
             exinfo = ExceptionInfoMixin.get_exception_info()
 
         result, exinfo, allowed_to_fail = self.handle_return_value(
-            valinfo, self.obj, retval, exinfo
+            valinfo, self.obj, retval, exinfo, generation
         )
+        if allowed_to_fail is None:
+            # the object passed: delete the FailingObject, or hide it if it
+            # is allowed to fail
+            # noinspection PyProtectedMember
+            fobjs.filter(allowed_to_fail=False)._raw_delete(fobjs.db)
+            fobjs.update(generation=0)
 
+        Validator.add_to_counts(
+            valinfo.get_validator_id(),
+            num_failing=(allowed_to_fail is not None) - (was_allowed_to_fail is not None),
+            num_allowed_to_fail=bool(allowed_to_fail) - bool(was_allowed_to_fail),
+        )
         self.update_validator(valinfo, result, exinfo)
 
         if result is PASS or result is NA or (result is FAIL and allowed_to_fail):
@@ -496,32 +1763,25 @@ class ObjectValidationRunner(ResultHandlerMixin):
                          exinfo: Optional[ExceptionInfo]
                          ) -> None:
         # running validation for one object may change the status of the
-        # entire Validator (e.g. if this object was the only one failing)
-        validator = Validator.objects.select_for_update().get(id=valinfo.get_validator_id())
-        if validator.status == Status.EXCEPTION:
-            return  # don't update
-        elif result is EXCEPTION:
-            validator.status = Status.EXCEPTION
-            validator.__dict__.update(exinfo.__dict__)
-            validator.save()
+        # entire Validator (e.g. if this object was the only one failing).
+        # nb. the status is derived from the counts in the UPDATE statement
+        # so the row is not locked (or counted) first
+        validators = Validator.objects.filter(id=valinfo.get_validator_id()) \
+                                      .exclude(status=Status.EXCEPTION)  # don't update
+        if result is EXCEPTION:
+            validators.update(status=Status.EXCEPTION, **exinfo.__dict__)
             return
 
-        failures = validator.failing_objects.filter(is_valid=True, allowed_to_fail=False)
+        no_failures = Q(num_failing=F("num_allowed_to_fail"))
 
         # edge case: the validator is overloaded, the class method only
         # returns a bool (i.e. it doesn't return the objects that failed),
         # and the validator is Failing. Then we cannot make any inference
         # about how this single object impacts the validator.
-        is_edge_case = (
-                valinfo.instance_method is not None and
-                valinfo.class_method is not None and
-                failures.count() == 0 and
-                validator.status == Status.FAILING
-        )
-        if is_edge_case:
-            return  # cannot do anything
+        if valinfo.instance_method is not None and valinfo.class_method is not None:
+            validators = validators.exclude(no_failures & Q(status=Status.FAILING))
 
-        new_status = Status.PASSING if failures.count() == 0 else Status.FAILING
-        if validator.status != new_status:
-            validator.status = new_status
-            validator.save()
+        validators.update(status=Case(
+            When(no_failures, then=Value(Status.PASSING.value)),
+            default=Value(Status.FAILING.value),
+        ))
@@ -7,15 +7,25 @@ from .models import Validator, FailingObject
 class FailingObjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = FailingObject
-        exclude = ("content_type", "is_valid", "is_exception")
+        exclude = ("content_type", "generation", "is_exception")
 
     admin_page = serializers.ReadOnlyField()
 
+    def update(self, instance: FailingObject, validated_data: dict) -> FailingObject:
+        was_allowed_to_fail = instance.allowed_to_fail
+        instance = super().update(instance, validated_data)
+        Validator.add_to_counts(
+            instance.validator_id,
+            num_allowed_to_fail=instance.allowed_to_fail - was_allowed_to_fail
+        )
+        return instance
+
 
 class ValidatorSerializer(EnumSupportSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Validator
-        exclude = ()
+        # internal bookkeeping that is not part of the front end schema
+        exclude = ("high_water_mark", "latency", "checkpoint", "generation", "run_generation")
 
     num_failing = serializers.ReadOnlyField()
     num_allowed_to_fail = serializers.ReadOnlyField()
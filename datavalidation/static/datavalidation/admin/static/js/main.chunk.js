@@ -1,2 +1,2 @@
-(this.webpackJsonpadmin=this.webpackJsonpadmin||[]).push([[0],{308:function(e,t,n){"use strict";n.r(t);var a=n(0),r=n.n(a),l=n(16),o=n.n(l),c=(n(61),n(62),n(1)),i=n.n(c),s=n(4),u=n(5),f=n(33),d=n(14),p=n(19),m=n(8),v=n.n(m),b=n(20),g=n(51),y=n(55),h=n(9),E=n(21),O=n(26),w=n(27);function x(e){return e.replace(/^\/+/,"")}function j(e){return e.replace(/\/+$/,"")}function _(e){e=j(e);for(var t=arguments.length,n=new Array(t>1?t-1:0),a=1;a<t;a++)n[a-1]=arguments[a];var r=x(n.pop()),l=n.map(x).map(j);return[e].concat(Object(p.a)(l),[r]).join("/")}function I(e,t){var n=arguments.length>2&&void 0!==arguments[2]?arguments[2]:"0";console.assert(1===n.length);var a=t-e.length;if(a<0)throw Error("value longer than fixed width");return n.repeat(a)+e}var k={0:"Jan",1:"Feb",2:"Mar",3:"Apr",4:"May",5:"Jun",6:"Jul",7:"Aug",8:"Sep",9:"Oct",10:"Nov",11:"Dec"};Map;var N=n(23),S=n.n(N),A={type:"integer"},L={type:["integer","null"]},P={type:"string"},R={type:["string","null"]},C=function(e){Object(E.a)(n,e);var t=Object(O.a)(n);function n(e){var a;return Object(b.a)(this,n),(a=t.call(this,e)).name="ValidationError",a}return n}(Object(w.a)(Error)),F={type:"object",properties:{next:R,results:{type:"array",items:{$ref:"#/definitions/failingObject"}}},additionalProperties:!0,required:["next","results"],definitions:{failingObject:{type:"object",properties:{id:A,validator:A,object_pk:A,allowed_to_fail:{type:"boolean"},allowed_to_fail_justification:P,comment:P,admin_page:P},additionalProperties:!1,required:[]}}};F.definitions.failingObject.required=Object.keys(F.definitions.failingObject.properties);var W=(new S.a).compile(F);function G(e){if(function(e){return W(e)}(e))return e;throw new C("invalid data: ".concat(JSON.stringify(W.errors)))}var T={type:"array",items:{$ref:"#/definitions/validationSummary"},definitions:{validationSummary:{type:"object",properties:{id:A,app_label:P,model_name:P,method_name:P,description:P,last_run_time:R,execution_time:{type:["number","null"]},status:A,num_passing:L,num_failing:L,num_na:L,num_allowed_to_fail:L,exc_type:R,exc_traceback:R,exc_obj_pk:L},additionalProperties:!1,required:[]}}};T.definitions.validationSummary.required=Object.keys(T.definitions.validationSummary.properties);var D=(new S.a).compile(T);function M(e){if(function(e){return D(e)}(e))return e;throw new C("invalid data: ".concat(JSON.stringify(D.errors)))}var V,B=_(window.location.href,"/api/");function K(){return z.apply(this,arguments)}function z(){return(z=Object(s.a)(i.a.mark((function e(){var t;return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return e.prev=0,e.next=3,v.a.get(_(B,"meta/csrf/"));case 3:t=e.sent,v.a.defaults.xsrfHeaderName=t.data.csrf_header_name,v.a.defaults.xsrfCookieName=t.data.csrf_cookie_name,e.next=11;break;case 8:e.prev=8,e.t0=e.catch(0),console.error("[fetchCSRFInfo]",e.t0);case 11:case"end":return e.stop()}}),e,null,[[0,8]])})))).apply(this,arguments)}function U(){return(U=Object(s.a)(i.a.mark((function e(t,n,a){var r;return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return e.prev=0,e.next=3,v.a.get(_(B,"meta/object-counts/"),{params:{appLabel:t,modelName:n}});case 3:r=e.sent,a(r.data),e.next=10;break;case 7:e.prev=7,e.t0=e.catch(0),console.error("[fetchTotalObjectCount]",e.t0);case 10:case"end":return e.stop()}}),e,null,[[0,7]])})))).apply(this,arguments)}function X(e){return Z.apply(this,arguments)}function Z(){return(Z=Object(s.a)(i.a.mark((function e(t){var n;return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return e.prev=0,e.next=3,v.a.get(_(B,"validator-summary/"));case 3:n=e.sent,t(M(n.data)),e.next=10;break;case 7:e.prev=7,e.t0=e.catch(0),console.error("[fetchValidators]",e.t0);case 10:case"end":return e.stop()}}),e,null,[[0,7]])})))).apply(this,arguments)}function J(e){return H.apply(this,arguments)}function H(){return(H=Object(s.a)(i.a.mark((function e(t){return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return e.prev=0,e.next=3,v.a.put(_(B,"validator-summary/".concat(t.id,"/")),t);case 3:e.next=8;break;case 5:e.prev=5,e.t0=e.catch(0),console.error("[patchValidator]",e.t0);case 8:case"end":return e.stop()}}),e,null,[[0,5]])})))).apply(this,arguments)}function q(e,t,n){return Y.apply(this,arguments)}function Y(){return(Y=Object(s.a)(i.a.mark((function e(t,n,a){var r,l,o;return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:if(e.prev=0,null===t){e.next=8;break}return l=_(B,"failing-objects/"),e.next=5,v.a.get(l,{params:{validator_id:t}});case 5:r=e.sent,e.next=16;break;case 8:if(null===n){e.next=14;break}return e.next=11,v.a.get(n);case 11:r=e.sent,e.next=16;break;case 14:return console.error("validator_id and next cannot both be null!"),e.abrupt("return");case 16:o=G(r.data),a((function(e){return{results:[].concat(Object(p.a)(e.results),Object(p.a)(o.results)),next:o.next}})),e.next=23;break;case 20:e.prev=20,e.t0=e.catch(0),console.error("[fetchFailingObjectsForValidator]",e.t0);case 23:case"end":return e.stop()}}),e,null,[[0,20]])})))).apply(this,arguments)}function $(e){return Q.apply(this,arguments)}function Q(){return(Q=Object(s.a)(i.a.mark((function e(t){return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return e.prev=0,e.next=3,v.a.put(_(B,"failing-objects/".concat(t.id,"/")),t);case 3:e.next=8;break;case 5:e.prev=5,e.t0=e.catch(0),console.error("[patchFailingObject]",e.t0);case 8:case"end":return e.stop()}}),e,null,[[0,5]])})))).apply(this,arguments)}!function(e){e[e.UNINITIALIZED=0]="UNINITIALIZED",e[e.PASSING=1]="PASSING",e[e.FAILING=2]="FAILING",e[e.EXCEPTION=3]="EXCEPTION",e[e.WARNING=4]="WARNING"}(V||(V={}));var ee=n(7);function te(){return(te=Object.assign||function(e){for(var t=1;t<arguments.length;t++){var n=arguments[t];for(var a in n)Object.prototype.hasOwnProperty.call(n,a)&&(e[a]=n[a])}return e}).apply(this,arguments)}function ne(e,t){if(null==e)return{};var n,a,r=function(e,t){if(null==e)return{};var n,a,r={},l=Object.keys(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||(r[n]=e[n]);return r}(e,t);if(Object.getOwnPropertySymbols){var l=Object.getOwnPropertySymbols(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||Object.prototype.propertyIsEnumerable.call(e,n)&&(r[n]=e[n])}return r}var ae=r.a.createElement("circle",{cx:12,cy:12,r:11,strokeWidth:0}),re=function(e){var t=e.svgRef,n=e.title,a=ne(e,["svgRef","title"]);return r.a.createElement("svg",te({viewBox:"0 0 24 24",width:"100%",ref:t},a),n?r.a.createElement("title",null,n):null,ae)},le=r.a.forwardRef((function(e,t){return r.a.createElement(re,te({svgRef:t},e))}));function oe(){return(oe=Object.assign||function(e){for(var t=1;t<arguments.length;t++){var n=arguments[t];for(var a in n)Object.prototype.hasOwnProperty.call(n,a)&&(e[a]=n[a])}return e}).apply(this,arguments)}function ce(e,t){if(null==e)return{};var n,a,r=function(e,t){if(null==e)return{};var n,a,r={},l=Object.keys(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||(r[n]=e[n]);return r}(e,t);if(Object.getOwnPropertySymbols){var l=Object.getOwnPropertySymbols(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||Object.prototype.propertyIsEnumerable.call(e,n)&&(r[n]=e[n])}return r}var ie=r.a.createElement("g",null,r.a.createElement("circle",{cx:12,cy:12,r:11,strokeWidth:0}),r.a.createElement("path",{d:"M 9 9 L 15 15"}),r.a.createElement("path",{d:"M 15 9 L 9 15"})),se=function(e){var t=e.svgRef,n=e.title,a=ce(e,["svgRef","title"]);return r.a.createElement("svg",oe({viewBox:"0 0 24 24",width:"100%",stroke:"white",strokeWidth:3,strokeLinecap:"round",ref:t},a),n?r.a.createElement("title",null,n):null,ie)},ue=r.a.forwardRef((function(e,t){return r.a.createElement(se,oe({svgRef:t},e))}));function fe(){return(fe=Object.assign||function(e){for(var t=1;t<arguments.length;t++){var n=arguments[t];for(var a in n)Object.prototype.hasOwnProperty.call(n,a)&&(e[a]=n[a])}return e}).apply(this,arguments)}function de(e,t){if(null==e)return{};var n,a,r=function(e,t){if(null==e)return{};var n,a,r={},l=Object.keys(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||(r[n]=e[n]);return r}(e,t);if(Object.getOwnPropertySymbols){var l=Object.getOwnPropertySymbols(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||Object.prototype.propertyIsEnumerable.call(e,n)&&(r[n]=e[n])}return r}var pe=r.a.createElement("g",null,r.a.createElement("circle",{cx:12,cy:12,r:11,strokeWidth:0}),r.a.createElement("path",{d:"M 12 6 L 12 14"}),r.a.createElement("path",{d:"M 12 18 L 12 18"})),me=function(e){var t=e.svgRef,n=e.title,a=de(e,["svgRef","title"]);return r.a.createElement("svg",fe({viewBox:"0 0 24 24",width:"100%",stroke:"white",strokeWidth:3,strokeLinecap:"round",ref:t},a),n?r.a.createElement("title",null,n):null,pe)},ve=r.a.forwardRef((function(e,t){return r.a.createElement(me,fe({svgRef:t},e))}));function be(){return(be=Object.assign||function(e){for(var t=1;t<arguments.length;t++){var n=arguments[t];for(var a in n)Object.prototype.hasOwnProperty.call(n,a)&&(e[a]=n[a])}return e}).apply(this,arguments)}function ge(e,t){if(null==e)return{};var n,a,r=function(e,t){if(null==e)return{};var n,a,r={},l=Object.keys(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||(r[n]=e[n]);return r}(e,t);if(Object.getOwnPropertySymbols){var l=Object.getOwnPropertySymbols(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||Object.prototype.propertyIsEnumerable.call(e,n)&&(r[n]=e[n])}return r}var ye=r.a.createElement("g",null,r.a.createElement("circle",{cx:12,cy:12,r:11,strokeWidth:0}),r.a.createElement("path",{d:"M 7.5  12.18198052                  L 10.5  15.18198052                  L 16.5  9.18198052",fill:"none"})),he=function(e){var t=e.svgRef,n=e.title,a=ge(e,["svgRef","title"]);return r.a.createElement("svg",be({viewBox:"0 0 24 24",width:"100%",stroke:"white",strokeWidth:3,strokeLinecap:"round",ref:t},a),n?r.a.createElement("title",null,n):null,ye)},Ee=r.a.forwardRef((function(e,t){return r.a.createElement(he,be({svgRef:t},e))})),Oe=function(e){var t=arguments.length>1&&void 0!==arguments[1]&&arguments[1];switch(e){case V.PASSING:return t?"#00fe74":"#009744";case V.FAILING:return t?"#500000":"#8e0000";case V.UNINITIALIZED:case V.EXCEPTION:return t?"#c6d2cd":"#7e8482";case V.WARNING:return t?"#fff409":"#847e05"}},we=function(e){var t=e.status,n=e.onDark,r=function(e){switch(e){case V.UNINITIALIZED:return le;case V.PASSING:return Ee;case V.FAILING:return ue;case V.EXCEPTION:case V.WARNING:return ve}}(t),l=Oe(t,n),o=function(e){var t=arguments.length>1&&void 0!==arguments[1]&&arguments[1];switch(e){case V.UNINITIALIZED:case V.PASSING:case V.EXCEPTION:case V.WARNING:return t?"#696969":"#fff";case V.FAILING:return"#fff"}}(t,n);return a.createElement(r,{className:"icon",fill:l,stroke:o})},xe=function(e){var t=e.status,n=e.onDark;return a.createElement("div",{className:"vertical-align"},a.createElement(we,{status:t,onDark:n}),a.createElement("span",{style:{color:Oe(t,n)}},V[t]))},je=n(10),_e=n(313),Ie=n(312),ke=n(24);function Ne(e,t,n,a){var r=!(arguments.length>4&&void 0!==arguments[4])||arguments[4];a((function(a){return{next:a.next,results:a.results.map((function(a){if(a.id===e){var l=Object(je.a)(Object(je.a)({},a),{},Object(ke.a)({},t,n));return r&&$(l).catch(console.error),l}return a}))}}))}var Se=function(e){var t=e.id,n=e.object_pk,r=e.comment,l=e.admin_page,o=e.allowed_to_fail,c=e.allowed_to_fail_justification,f=e.validator_id,d=e.setValidators,p=e.setFailingObjectPage,m=a.useState(null),v=Object(u.a)(m,2),b=v[0],g=v[1],y=a.useRef(null),h=function(){var e=Object(s.a)(i.a.mark((function e(a){var l,c;return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:l=a.target,(c=l.textContent)!==b&&(g(c),setTimeout((function(){var e;(null===(e=y.current)||void 0===e?void 0:e.textContent)===c&&$({id:t,validator:f,object_pk:n,comment:r,allowed_to_fail:o,allowed_to_fail_justification:c}).catch(console.error)}),1e3));case 3:case"end":return e.stop()}}),e)})));return function(t){return e.apply(this,arguments)}}();return a.createElement("div",{style:{padding:"5px 10px",background:"#ffe2f673",borderBottom:"1px solid #ffade5"}},a.createElement("table",{style:{width:"100%"}},a.createElement("tbody",null,a.createElement("tr",{style:{verticalAlign:"middle",fontSize:"10pt",fontWeight:600,maxHeight:"25px"}},a.createElement("td",{style:Object(je.a)({padding:"0 10px"},Ae)},n),a.createElement("td",{rowSpan:2,style:Ae},l?a.createElement("a",{href:l,target:"_blank",rel:"noopener noreferrer"},"admin page"):"admin_page"),a.createElement("td",{style:{width:"20%",color:"#8e0000",fontWeight:500,fontStyle:"italic"}},r),a.createElement("td",{style:Ae},a.createElement("input",{type:"checkbox",defaultChecked:o,onChange:function(e){!function(e,t,n,a,r){Ne(e,"allowed_to_fail",n,a),r((function(e){return e.map((function(e){if(e.id!==t||null===e.num_allowed_to_fail||null===e.num_failing)return e;var a=Object(je.a)({},e);return n?(a.num_allowed_to_fail+=1,a.num_failing===a.num_allowed_to_fail&&(a.status=V.PASSING,J(a).catch(console.error))):(a.num_allowed_to_fail-=1,a.num_failing===a.num_allowed_to_fail+1&&(a.status=V.FAILING,J(a).catch(console.error))),a}))}))}(t,f,e.target.checked,p,d)}})),a.createElement("td",{rowSpan:3},a.createElement("div",{className:"textarea-div",contentEditable:"true",placeholder:"justification if allowed to fail",ref:y,onInput:h,onBlur:function(e){var n=e.target.textContent;Ne(t,"allowed_to_fail_justification",n,p,!1)},suppressContentEditableWarning:!0},c))),a.createElement("tr",{className:"small-text",style:{verticalAlign:"top",maxHeight:"25px"}},a.createElement("td",{style:Ae},"object id"),a.createElement("td",{style:Ae},"comment"),a.createElement("td",{style:Ae},"allowed to fail")),a.createElement("tr",{style:{height:"100%"}}))))},Ae={width:"10%"},Le=function(e){var t=e.validator_id,n=e.setValidators,r=a.useState({results:[],next:null}),l=Object(u.a)(r,2),o=l[0],c=l[1],f=a.useState(!0),p=Object(u.a)(f,2),m=p[0],v=p[1];a.useEffect((function(){Object(s.a)(i.a.mark((function e(){return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return v(!0),e.next=3,q(t,null,c);case 3:v(!1);case 4:case"end":return e.stop()}}),e)})))()}),[t]);return a.createElement(a.Fragment,null,o.results.map((function(e){return a.createElement(Se,Object.assign({key:e.id},e,{validator_id:t,setValidators:n,setFailingObjectPage:c}))})),m&&a.createElement("div",{style:{width:"100%"}},a.createElement(d.a,{animation:"border",role:"status",variant:"primary",style:{margin:"5px 45%"}})),!m&&null!==o.next&&a.createElement("div",{onClick:function(e){Object(s.a)(i.a.mark((function e(){return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return v(!0),e.next=3,q(null,o.next,c);case 3:v(!1);case 4:case"end":return e.stop()}}),e)})))()},style:Pe},a.createElement("div",{style:{width:"100%",textAlign:"center"}},"Load More...")))},Pe={cursor:"pointer",padding:"10px",fontWeight:600,fontSize:"10pt",background:"#ffe2f673",borderBottom:"2px solid #ffade5"},Re=function(e){var t=e.id,n=e.method_name,r=e.description,l=e.last_run_time,o=e.execution_time,c=e.status,i=e.num_passing,s=e.num_failing,f=e.num_na,p=e.num_allowed_to_fail,m=e.exc_type,v=e.exc_traceback,b=e.exc_obj_pk,g=e.totalObjectCount,y=e.setValidators,h=null!==m;null===i&&null===s&&null===f&&(p=null);var E,O=null!==i&&null!==s&&null!==f?i+s+f:null,w=null!==g&&null!==O?g-O:null,x=l?function(e,t){var n={"%Y":function(){return e.getFullYear().toString()},"%y":function(){return I(e.getFullYear().toString().slice(2),2)},"%mm":function(){return k[e.getMonth()]},"%m":function(){return I(e.getMonth().toString(),2)},"%d":function(){return I(e.getDate().toString(),2)},"%H":function(){return I(e.getHours().toString(),2)},"%M":function(){return I(e.getMinutes().toString(),2)},"%S":function(){return I(e.getSeconds().toString(),2)}};return Object.entries(n).forEach((function(e){var n=Object(u.a)(e,2),a=n[0],r=n[1];t=t.replace(new RegExp(a,"g"),r)})),t}((E=l,new Date(Date.parse(E))),"%Y-%m-%d %H:%M:%S"):"N/A",j=v||(s||0)>0?"pointer":"default";return a.createElement(ee.a,{defaultActiveKey:"",style:{marginBottom:"10px"}},a.createElement(ee.a.Toggle,{as:"div",eventKey:"0",className:"vertical-align",style:Object(je.a)({cursor:j},Ce)},a.createElement("table",{style:{width:"100%",tableLayout:"fixed"}},a.createElement("tbody",null,a.createElement("tr",{style:{verticalAlign:"middle",fontSize:"11pt",fontWeight:600}},a.createElement("td",{className:"no-overflow",style:Fe,title:n}," ",n," "),a.createElement("td",{rowSpan:2,style:{width:"5%"}}," ",a.createElement(we,{status:c,onDark:!1})," "),a.createElement("td",{style:Object(je.a)({fontSize:"10pt",fontWeight:"normal"},We)}," ",x," "),a.createElement("td",{style:Object(je.a)({fontSize:"10pt",fontWeight:"normal"},Ge)}," ",function(e){if(null===e)return"N/A";var t=I(Math.floor(e/3600).toString(),2),n=e%3600,a=I(Math.floor(n/60).toString(),2),r=I((n%60).toFixed(1),4);return"".concat(t,":").concat(a,":").concat(r,"s")}(o)," "),!h&&a.createElement(a.Fragment,null,a.createElement("td",{style:Ge},i),a.createElement("td",{style:Ge},s),a.createElement("td",{style:Ge},f),a.createElement("td",{style:Ge},p),a.createElement("td",{style:Ge},void 0===g?a.createElement(d.a,{animation:"border",role:"status",variant:"primary"}):w)),h&&a.createElement("td",{rowSpan:2,style:{width:"50%",color:Oe(V.EXCEPTION)}},m,null===b?"":" at object id: ".concat(b)),a.createElement("td",null," ")),a.createElement("tr",{className:"small-text",style:{verticalAlign:"top"}},a.createElement("td",{style:Fe},r),a.createElement("td",{style:We},"last run time"),a.createElement("td",{style:Ge},"execution time (s)"),!h&&a.createElement(a.Fragment,null,a.createElement("td",{style:Ge},"passing"),a.createElement("td",{style:Ge},"failing"),a.createElement("td",{style:Ge},"N/A"),a.createElement("td",{style:Ge},"allowed to fail"),a.createElement("td",{style:Ge},"unvalidated")),a.createElement("td",null))))),a.createElement(ee.a.Collapse,{eventKey:"0"},a.createElement(a.Fragment,null,v&&a.createElement(_e.a,{language:"python",style:Ie.a},v),!h&&(s||0)>0&&a.createElement(Le,{validator_id:t,setValidators:y}))))},Ce={padding:"10px 0",background:"#fff",fontWeight:500,fontSize:"14pt",color:"#000",borderBottom:"1px solid #ebebeb"},Fe={width:"20%"},We={width:"10%"},Ge={width:"10%"},Te=function(e){var t=e.appLabel,n=e.modelName,r=e.status,l=e.validators,o=e.setValidators,c=a.useState(null),i=Object(u.a)(c,2),s=i[0],f=i[1];return a.useEffect((function(){(function(e,t,n){return U.apply(this,arguments)})(t,n,f).then()}),[t,n]),a.createElement(ee.a,{defaultActiveKey:"",style:{marginBottom:"10px"}},a.createElement(ee.a.Toggle,{as:"div",eventKey:"0",className:"vertical-align",style:De},a.createElement("div",{className:"no-overflow",style:{width:"20%"},title:n}," ",n," "),a.createElement(xe,{status:r,onDark:!1})),a.createElement(ee.a.Collapse,{eventKey:"0"},a.createElement("div",null," ",Object.values(l).map((function(e){return a.createElement(Re,Object.assign({key:"".concat(t,".").concat(n,".").concat(e.method_name),totalObjectCount:s},e,{setValidators:o}))}))," ")))},De={cursor:"pointer",padding:"10px",background:"#ebebeb",fontWeight:600,fontSize:"14pt",color:"#000"},Me={cursor:"pointer",padding:"10px",background:"#417690",fontWeight:600,fontSize:"14pt",color:"white"},Ve=function(e){var t=e.appLabel,n=e.status,r=e.models,l=e.setValidators;return a.createElement(ee.a,{defaultActiveKey:"",style:{minWidth:"1000px",marginBottom:"10px"}},a.createElement(ee.a.Toggle,{as:"div",eventKey:"0",className:"vertical-align",style:Me},a.createElement("div",{className:"no-overflow",style:{width:"20%"},title:t}," ",t," "),a.createElement(xe,{status:n,onDark:!0})),a.createElement(ee.a.Collapse,{eventKey:"0"},a.createElement("div",null," ",Object.entries(r).map((function(e){var n=Object(u.a)(e,2),r=n[0],o=n[1];return a.createElement(Te,{key:"".concat(t,".").concat(r),appLabel:t,modelName:r,status:o.status,validators:o.validators,setValidators:l})}))," ")))};var Be=function(){var e=a.useState([]),t=Object(u.a)(e,2),n=t[0],r=t[1],l=a.useState(!0),o=Object(u.a)(l,2),c=o[0],p=o[1];a.useEffect((function(){Object(s.a)(i.a.mark((function e(){return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return e.next=2,K();case 2:case"end":return e.stop()}}),e)})))()}),[]),a.useEffect((function(){Object(s.a)(i.a.mark((function e(){return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return p(!0),e.next=3,X(r).then();case 3:p(!1);case 4:case"end":return e.stop()}}),e)})))()}),[]);var m=function(e){var t,n={},a=Object(f.a)(e);try{for(a.s();!(t=a.n()).done;){var r=t.value;n.hasOwnProperty(r.app_label)||(n[r.app_label]={appLabel:r.app_label,status:V.UNINITIALIZED,models:{}});var l=n[r.app_label];l.models.hasOwnProperty(r.model_name)||(l.models[r.model_name]={appLabel:r.app_label,modelName:r.model_name,status:V.UNINITIALIZED,validators:[]}),l.models[r.model_name].validators.push(r)}}catch(m){a.e(m)}finally{a.f()}for(var o=function(e,t){var n,a=Object(f.a)(t);try{for(a.s();!(n=a.n()).done;){var r=n.value;if(r.status===V.PASSING&&e.status===V.UNINITIALIZED)e.status=V.PASSING;else if(r.status===V.FAILING)e.status=V.FAILING;else if(r.status===V.EXCEPTION){e.status=V.EXCEPTION;break}}}catch(m){a.e(m)}finally{a.f()}},c=0,i=Object.values(n);c<i.length;c++){for(var s=i[c],u=0,d=Object.values(s.models);u<d.length;u++){var p=d[u];o(p,p.validators)}o(s,Object.values(s.models))}return n}(n);return c?a.createElement("div",{style:{position:"relative"}},a.createElement(d.a,{animation:"border",role:"status",variant:"primary",style:{position:"absolute",left:"50%"}})):a.createElement(a.Fragment,null,a.createElement("h2",{style:{marginBottom:"10px",color:"#417690"}}," Data Validation Summary "),Object.values(m).map((function(e){return a.createElement(Ve,{key:e.appLabel,appLabel:e.appLabel,status:e.status,models:e.models,setValidators:r})})))};o.a.render(r.a.createElement(r.a.StrictMode,null,r.a.createElement(Be,null)),document.getElementById("root"))},56:function(e,t,n){e.exports=n(308)},62:function(e,t,n){}},[[56,1,2]]]);
+(this.webpackJsonpadmin=this.webpackJsonpadmin||[]).push([[0],{308:function(e,t,n){"use strict";n.r(t);var a=n(0),r=n.n(a),l=n(16),o=n.n(l),c=(n(61),n(62),n(1)),i=n.n(c),s=n(4),u=n(5),f=n(33),d=n(14),p=n(19),m=n(8),v=n.n(m),b=n(20),g=n(51),y=n(55),h=n(9),E=n(21),O=n(26),w=n(27);function x(e){return e.replace(/^\/+/,"")}function j(e){return e.replace(/\/+$/,"")}function _(e){e=j(e);for(var t=arguments.length,n=new Array(t>1?t-1:0),a=1;a<t;a++)n[a-1]=arguments[a];var r=x(n.pop()),l=n.map(x).map(j);return[e].concat(Object(p.a)(l),[r]).join("/")}function I(e,t){var n=arguments.length>2&&void 0!==arguments[2]?arguments[2]:"0";console.assert(1===n.length);var a=t-e.length;if(a<0)throw Error("value longer than fixed width");return n.repeat(a)+e}var k={0:"Jan",1:"Feb",2:"Mar",3:"Apr",4:"May",5:"Jun",6:"Jul",7:"Aug",8:"Sep",9:"Oct",10:"Nov",11:"Dec"};Map;var N=n(23),S=n.n(N),A={type:"integer"},L={type:["integer","null"]},P={type:"string"},R={type:["string","null"]},C=function(e){Object(E.a)(n,e);var t=Object(O.a)(n);function n(e){var a;return Object(b.a)(this,n),(a=t.call(this,e)).name="ValidationError",a}return n}(Object(w.a)(Error)),F={type:"object",properties:{next:R,results:{type:"array",items:{$ref:"#/definitions/failingObject"}}},additionalProperties:!0,required:["next","results"],definitions:{failingObject:{type:"object",properties:{id:A,validator:A,object_pk:A,allowed_to_fail:{type:"boolean"},allowed_to_fail_justification:P,comment:P,admin_page:P},additionalProperties:!1,required:[]}}};F.definitions.failingObject.required=Object.keys(F.definitions.failingObject.properties);var W=(new S.a).compile(F);function G(e){if(function(e){return W(e)}(e))return e;throw new C("invalid data: ".concat(JSON.stringify(W.errors)))}var T={type:"array",items:{$ref:"#/definitions/validationSummary"},definitions:{validationSummary:{type:"object",properties:{id:A,app_label:P,model_name:P,method_name:P,description:P,last_run_time:R,execution_time:{type:["number","null"]},status:A,num_passing:L,num_failing:L,num_na:L,num_allowed_to_fail:L,exc_type:R,exc_traceback:R,exc_obj_pk:L},additionalProperties:!1,required:[]}}};T.definitions.validationSummary.required=Object.keys(T.definitions.validationSummary.properties);var D=(new S.a).compile(T);function M(e){if(function(e){return D(e)}(e))return e;throw new C("invalid data: ".concat(JSON.stringify(D.errors)))}var V,B=_(window.location.href,"/api/");function K(){return z.apply(this,arguments)}function z(){return(z=Object(s.a)(i.a.mark((function e(){var t;return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return e.prev=0,e.next=3,v.a.get(_(B,"meta/csrf/"));case 3:t=e.sent,v.a.defaults.xsrfHeaderName=t.data.csrf_header_name,v.a.defaults.xsrfCookieName=t.data.csrf_cookie_name,e.next=11;break;case 8:e.prev=8,e.t0=e.catch(0),console.error("[fetchCSRFInfo]",e.t0);case 11:case"end":return e.stop()}}),e,null,[[0,8]])})))).apply(this,arguments)}function U(){return(U=Object(s.a)(i.a.mark((function e(t,n,a){var r;return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return e.prev=0,e.next=3,v.a.get(_(B,"meta/object-counts/"),{params:{appLabel:t,modelName:n}});case 3:r=e.sent,a(r.data),e.next=10;break;case 7:e.prev=7,e.t0=e.catch(0),console.error("[fetchTotalObjectCount]",e.t0);case 10:case"end":return e.stop()}}),e,null,[[0,7]])})))).apply(this,arguments)}function X(e){return Z.apply(this,arguments)}function Z(){return(Z=Object(s.a)(i.a.mark((function e(t){var n;return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return e.prev=0,e.next=3,v.a.get(_(B,"validator-summary/"));case 3:n=e.sent,t(M(n.data)),e.next=10;break;case 7:e.prev=7,e.t0=e.catch(0),console.error("[fetchValidators]",e.t0);case 10:case"end":return e.stop()}}),e,null,[[0,7]])})))).apply(this,arguments)}function J(e){return H.apply(this,arguments)}function H(){return(H=Object(s.a)(i.a.mark((function e(t){return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return e.prev=0,e.next=3,v.a.put(_(B,"validator-summary/".concat(t.id,"/")),t);case 3:e.next=8;break;case 5:e.prev=5,e.t0=e.catch(0),console.error("[patchValidator]",e.t0);case 8:case"end":return e.stop()}}),e,null,[[0,5]])})))).apply(this,arguments)}function q(e,t,n){return Y.apply(this,arguments)}function Y(){return(Y=Object(s.a)(i.a.mark((function e(t,n,a){var r,l,o;return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:if(e.prev=0,null===t){e.next=8;break}return l=_(B,"failing-objects/"),e.next=5,v.a.get(l,{params:{validator_id:t}});case 5:r=e.sent,e.next=16;break;case 8:if(null===n){e.next=14;break}return e.next=11,v.a.get(n);case 11:r=e.sent,e.next=16;break;case 14:return console.error("validator_id and next cannot both be null!"),e.abrupt("return");case 16:o=G(r.data),a((function(e){return{results:[].concat(Object(p.a)(e.results),Object(p.a)(o.results)),next:o.next}})),e.next=23;break;case 20:e.prev=20,e.t0=e.catch(0),console.error("[fetchFailingObjectsForValidator]",e.t0);case 23:case"end":return e.stop()}}),e,null,[[0,20]])})))).apply(this,arguments)}function $(e){return Q.apply(this,arguments)}function Q(){return(Q=Object(s.a)(i.a.mark((function e(t){return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return e.prev=0,e.next=3,v.a.put(_(B,"failing-objects/".concat(t.id,"/")),t);case 3:e.next=8;break;case 5:e.prev=5,e.t0=e.catch(0),console.error("[patchFailingObject]",e.t0);case 8:case"end":return e.stop()}}),e,null,[[0,5]])})))).apply(this,arguments)}!function(e){e[e.UNINITIALIZED=0]="UNINITIALIZED",e[e.PASSING=1]="PASSING",e[e.FAILING=2]="FAILING",e[e.EXCEPTION=3]="EXCEPTION",e[e.WARNING=4]="WARNING",e[e.TIMEOUT=5]="TIMEOUT"}(V||(V={}));var ee=n(7);function te(){return(te=Object.assign||function(e){for(var t=1;t<arguments.length;t++){var n=arguments[t];for(var a in n)Object.prototype.hasOwnProperty.call(n,a)&&(e[a]=n[a])}return e}).apply(this,arguments)}function ne(e,t){if(null==e)return{};var n,a,r=function(e,t){if(null==e)return{};var n,a,r={},l=Object.keys(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||(r[n]=e[n]);return r}(e,t);if(Object.getOwnPropertySymbols){var l=Object.getOwnPropertySymbols(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||Object.prototype.propertyIsEnumerable.call(e,n)&&(r[n]=e[n])}return r}var ae=r.a.createElement("circle",{cx:12,cy:12,r:11,strokeWidth:0}),re=function(e){var t=e.svgRef,n=e.title,a=ne(e,["svgRef","title"]);return r.a.createElement("svg",te({viewBox:"0 0 24 24",width:"100%",ref:t},a),n?r.a.createElement("title",null,n):null,ae)},le=r.a.forwardRef((function(e,t){return r.a.createElement(re,te({svgRef:t},e))}));function oe(){return(oe=Object.assign||function(e){for(var t=1;t<arguments.length;t++){var n=arguments[t];for(var a in n)Object.prototype.hasOwnProperty.call(n,a)&&(e[a]=n[a])}return e}).apply(this,arguments)}function ce(e,t){if(null==e)return{};var n,a,r=function(e,t){if(null==e)return{};var n,a,r={},l=Object.keys(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||(r[n]=e[n]);return r}(e,t);if(Object.getOwnPropertySymbols){var l=Object.getOwnPropertySymbols(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||Object.prototype.propertyIsEnumerable.call(e,n)&&(r[n]=e[n])}return r}var ie=r.a.createElement("g",null,r.a.createElement("circle",{cx:12,cy:12,r:11,strokeWidth:0}),r.a.createElement("path",{d:"M 9 9 L 15 15"}),r.a.createElement("path",{d:"M 15 9 L 9 15"})),se=function(e){var t=e.svgRef,n=e.title,a=ce(e,["svgRef","title"]);return r.a.createElement("svg",oe({viewBox:"0 0 24 24",width:"100%",stroke:"white",strokeWidth:3,strokeLinecap:"round",ref:t},a),n?r.a.createElement("title",null,n):null,ie)},ue=r.a.forwardRef((function(e,t){return r.a.createElement(se,oe({svgRef:t},e))}));function fe(){return(fe=Object.assign||function(e){for(var t=1;t<arguments.length;t++){var n=arguments[t];for(var a in n)Object.prototype.hasOwnProperty.call(n,a)&&(e[a]=n[a])}return e}).apply(this,arguments)}function de(e,t){if(null==e)return{};var n,a,r=function(e,t){if(null==e)return{};var n,a,r={},l=Object.keys(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||(r[n]=e[n]);return r}(e,t);if(Object.getOwnPropertySymbols){var l=Object.getOwnPropertySymbols(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||Object.prototype.propertyIsEnumerable.call(e,n)&&(r[n]=e[n])}return r}var pe=r.a.createElement("g",null,r.a.createElement("circle",{cx:12,cy:12,r:11,strokeWidth:0}),r.a.createElement("path",{d:"M 12 6 L 12 14"}),r.a.createElement("path",{d:"M 12 18 L 12 18"})),me=function(e){var t=e.svgRef,n=e.title,a=de(e,["svgRef","title"]);return r.a.createElement("svg",fe({viewBox:"0 0 24 24",width:"100%",stroke:"white",strokeWidth:3,strokeLinecap:"round",ref:t},a),n?r.a.createElement("title",null,n):null,pe)},ve=r.a.forwardRef((function(e,t){return r.a.createElement(me,fe({svgRef:t},e))}));function be(){return(be=Object.assign||function(e){for(var t=1;t<arguments.length;t++){var n=arguments[t];for(var a in n)Object.prototype.hasOwnProperty.call(n,a)&&(e[a]=n[a])}return e}).apply(this,arguments)}function ge(e,t){if(null==e)return{};var n,a,r=function(e,t){if(null==e)return{};var n,a,r={},l=Object.keys(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||(r[n]=e[n]);return r}(e,t);if(Object.getOwnPropertySymbols){var l=Object.getOwnPropertySymbols(e);for(a=0;a<l.length;a++)n=l[a],t.indexOf(n)>=0||Object.prototype.propertyIsEnumerable.call(e,n)&&(r[n]=e[n])}return r}var ye=r.a.createElement("g",null,r.a.createElement("circle",{cx:12,cy:12,r:11,strokeWidth:0}),r.a.createElement("path",{d:"M 7.5  12.18198052                  L 10.5  15.18198052                  L 16.5  9.18198052",fill:"none"})),he=function(e){var t=e.svgRef,n=e.title,a=ge(e,["svgRef","title"]);return r.a.createElement("svg",be({viewBox:"0 0 24 24",width:"100%",stroke:"white",strokeWidth:3,strokeLinecap:"round",ref:t},a),n?r.a.createElement("title",null,n):null,ye)},Ee=r.a.forwardRef((function(e,t){return r.a.createElement(he,be({svgRef:t},e))})),Oe=function(e){var t=arguments.length>1&&void 0!==arguments[1]&&arguments[1];switch(e){case V.PASSING:return t?"#00fe74":"#009744";case V.FAILING:return t?"#500000":"#8e0000";case V.UNINITIALIZED:case V.EXCEPTION:return t?"#c6d2cd":"#7e8482";case V.WARNING:case V.TIMEOUT:return t?"#fff409":"#847e05"}},we=function(e){var t=e.status,n=e.onDark,r=function(e){switch(e){case V.UNINITIALIZED:return le;case V.PASSING:return Ee;case V.FAILING:return ue;case V.EXCEPTION:case V.WARNING:case V.TIMEOUT:return ve}}(t),l=Oe(t,n),o=function(e){var t=arguments.length>1&&void 0!==arguments[1]&&arguments[1];switch(e){case V.UNINITIALIZED:case V.PASSING:case V.EXCEPTION:case V.WARNING:case V.TIMEOUT:return t?"#696969":"#fff";case V.FAILING:return"#fff"}}(t,n);return a.createElement(r,{className:"icon",fill:l,stroke:o})},xe=function(e){var t=e.status,n=e.onDark;return a.createElement("div",{className:"vertical-align"},a.createElement(we,{status:t,onDark:n}),a.createElement("span",{style:{color:Oe(t,n)}},V[t]))},je=n(10),_e=n(313),Ie=n(312),ke=n(24);function Ne(e,t,n,a){var r=!(arguments.length>4&&void 0!==arguments[4])||arguments[4];a((function(a){return{next:a.next,results:a.results.map((function(a){if(a.id===e){var l=Object(je.a)(Object(je.a)({},a),{},Object(ke.a)({},t,n));return r&&$(l).catch(console.error),l}return a}))}}))}var Se=function(e){var t=e.id,n=e.object_pk,r=e.comment,l=e.admin_page,o=e.allowed_to_fail,c=e.allowed_to_fail_justification,f=e.validator_id,d=e.setValidators,p=e.setFailingObjectPage,m=a.useState(null),v=Object(u.a)(m,2),b=v[0],g=v[1],y=a.useRef(null),h=function(){var e=Object(s.a)(i.a.mark((function e(a){var l,c;return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:l=a.target,(c=l.textContent)!==b&&(g(c),setTimeout((function(){var e;(null===(e=y.current)||void 0===e?void 0:e.textContent)===c&&$({id:t,validator:f,object_pk:n,comment:r,allowed_to_fail:o,allowed_to_fail_justification:c}).catch(console.error)}),1e3));case 3:case"end":return e.stop()}}),e)})));return function(t){return e.apply(this,arguments)}}();return a.createElement("div",{style:{padding:"5px 10px",background:"#ffe2f673",borderBottom:"1px solid #ffade5"}},a.createElement("table",{style:{width:"100%"}},a.createElement("tbody",null,a.createElement("tr",{style:{verticalAlign:"middle",fontSize:"10pt",fontWeight:600,maxHeight:"25px"}},a.createElement("td",{style:Object(je.a)({padding:"0 10px"},Ae)},n),a.createElement("td",{rowSpan:2,style:Ae},l?a.createElement("a",{href:l,target:"_blank",rel:"noopener noreferrer"},"admin page"):"admin_page"),a.createElement("td",{style:{width:"20%",color:"#8e0000",fontWeight:500,fontStyle:"italic"}},r),a.createElement("td",{style:Ae},a.createElement("input",{type:"checkbox",defaultChecked:o,onChange:function(e){!function(e,t,n,a,r){Ne(e,"allowed_to_fail",n,a),r((function(e){return e.map((function(e){if(e.id!==t||null===e.num_allowed_to_fail||null===e.num_failing)return e;var a=Object(je.a)({},e);return n?(a.num_allowed_to_fail+=1,a.num_failing===a.num_allowed_to_fail&&(a.status=V.PASSING,J(a).catch(console.error))):(a.num_allowed_to_fail-=1,a.num_failing===a.num_allowed_to_fail+1&&(a.status=V.FAILING,J(a).catch(console.error))),a}))}))}(t,f,e.target.checked,p,d)}})),a.createElement("td",{rowSpan:3},a.createElement("div",{className:"textarea-div",contentEditable:"true",placeholder:"justification if allowed to fail",ref:y,onInput:h,onBlur:function(e){var n=e.target.textContent;Ne(t,"allowed_to_fail_justification",n,p,!1)},suppressContentEditableWarning:!0},c))),a.createElement("tr",{className:"small-text",style:{verticalAlign:"top",maxHeight:"25px"}},a.createElement("td",{style:Ae},"object id"),a.createElement("td",{style:Ae},"comment"),a.createElement("td",{style:Ae},"allowed to fail")),a.createElement("tr",{style:{height:"100%"}}))))},Ae={width:"10%"},Le=function(e){var t=e.validator_id,n=e.setValidators,r=a.useState({results:[],next:null}),l=Object(u.a)(r,2),o=l[0],c=l[1],f=a.useState(!0),p=Object(u.a)(f,2),m=p[0],v=p[1];a.useEffect((function(){Object(s.a)(i.a.mark((function e(){return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return v(!0),e.next=3,q(t,null,c);case 3:v(!1);case 4:case"end":return e.stop()}}),e)})))()}),[t]);return a.createElement(a.Fragment,null,o.results.map((function(e){return a.createElement(Se,Object.assign({key:e.id},e,{validator_id:t,setValidators:n,setFailingObjectPage:c}))})),m&&a.createElement("div",{style:{width:"100%"}},a.createElement(d.a,{animation:"border",role:"status",variant:"primary",style:{margin:"5px 45%"}})),!m&&null!==o.next&&a.createElement("div",{onClick:function(e){Object(s.a)(i.a.mark((function e(){return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return v(!0),e.next=3,q(null,o.next,c);case 3:v(!1);case 4:case"end":return e.stop()}}),e)})))()},style:Pe},a.createElement("div",{style:{width:"100%",textAlign:"center"}},"Load More...")))},Pe={cursor:"pointer",padding:"10px",fontWeight:600,fontSize:"10pt",background:"#ffe2f673",borderBottom:"2px solid #ffade5"},Re=function(e){var t=e.id,n=e.method_name,r=e.description,l=e.last_run_time,o=e.execution_time,c=e.status,i=e.num_passing,s=e.num_failing,f=e.num_na,p=e.num_allowed_to_fail,m=e.exc_type,v=e.exc_traceback,b=e.exc_obj_pk,g=e.totalObjectCount,y=e.setValidators,h=null!==m;null===i&&null===s&&null===f&&(p=null);var E,O=null!==i&&null!==s&&null!==f?i+s+f:null,w=null!==g&&null!==O?g-O:null,x=l?function(e,t){var n={"%Y":function(){return e.getFullYear().toString()},"%y":function(){return I(e.getFullYear().toString().slice(2),2)},"%mm":function(){return k[e.getMonth()]},"%m":function(){return I(e.getMonth().toString(),2)},"%d":function(){return I(e.getDate().toString(),2)},"%H":function(){return I(e.getHours().toString(),2)},"%M":function(){return I(e.getMinutes().toString(),2)},"%S":function(){return I(e.getSeconds().toString(),2)}};return Object.entries(n).forEach((function(e){var n=Object(u.a)(e,2),a=n[0],r=n[1];t=t.replace(new RegExp(a,"g"),r)})),t}((E=l,new Date(Date.parse(E))),"%Y-%m-%d %H:%M:%S"):"N/A",j=v||(s||0)>0?"pointer":"default";return a.createElement(ee.a,{defaultActiveKey:"",style:{marginBottom:"10px"}},a.createElement(ee.a.Toggle,{as:"div",eventKey:"0",className:"vertical-align",style:Object(je.a)({cursor:j},Ce)},a.createElement("table",{style:{width:"100%",tableLayout:"fixed"}},a.createElement("tbody",null,a.createElement("tr",{style:{verticalAlign:"middle",fontSize:"11pt",fontWeight:600}},a.createElement("td",{className:"no-overflow",style:Fe,title:n}," ",n," "),a.createElement("td",{rowSpan:2,style:{width:"5%"}}," ",a.createElement(we,{status:c,onDark:!1})," "),a.createElement("td",{style:Object(je.a)({fontSize:"10pt",fontWeight:"normal"},We)}," ",x," "),a.createElement("td",{style:Object(je.a)({fontSize:"10pt",fontWeight:"normal"},Ge)}," ",function(e){if(null===e)return"N/A";var t=I(Math.floor(e/3600).toString(),2),n=e%3600,a=I(Math.floor(n/60).toString(),2),r=I((n%60).toFixed(1),4);return"".concat(t,":").concat(a,":").concat(r,"s")}(o)," "),!h&&a.createElement(a.Fragment,null,a.createElement("td",{style:Ge},i),a.createElement("td",{style:Ge},s),a.createElement("td",{style:Ge},f),a.createElement("td",{style:Ge},p),a.createElement("td",{style:Ge},void 0===g?a.createElement(d.a,{animation:"border",role:"status",variant:"primary"}):w)),h&&a.createElement("td",{rowSpan:2,style:{width:"50%",color:Oe(V.EXCEPTION)}},m,null===b?"":" at object id: ".concat(b)),a.createElement("td",null," ")),a.createElement("tr",{className:"small-text",style:{verticalAlign:"top"}},a.createElement("td",{style:Fe},r),a.createElement("td",{style:We},"last run time"),a.createElement("td",{style:Ge},"execution time (s)"),!h&&a.createElement(a.Fragment,null,a.createElement("td",{style:Ge},"passing"),a.createElement("td",{style:Ge},"failing"),a.createElement("td",{style:Ge},"N/A"),a.createElement("td",{style:Ge},"allowed to fail"),a.createElement("td",{style:Ge},"unvalidated")),a.createElement("td",null))))),a.createElement(ee.a.Collapse,{eventKey:"0"},a.createElement(a.Fragment,null,v&&a.createElement(_e.a,{language:"python",style:Ie.a},v),!h&&(s||0)>0&&a.createElement(Le,{validator_id:t,setValidators:y}))))},Ce={padding:"10px 0",background:"#fff",fontWeight:500,fontSize:"14pt",color:"#000",borderBottom:"1px solid #ebebeb"},Fe={width:"20%"},We={width:"10%"},Ge={width:"10%"},Te=function(e){var t=e.appLabel,n=e.modelName,r=e.status,l=e.validators,o=e.setValidators,c=a.useState(null),i=Object(u.a)(c,2),s=i[0],f=i[1];return a.useEffect((function(){(function(e,t,n){return U.apply(this,arguments)})(t,n,f).then()}),[t,n]),a.createElement(ee.a,{defaultActiveKey:"",style:{marginBottom:"10px"}},a.createElement(ee.a.Toggle,{as:"div",eventKey:"0",className:"vertical-align",style:De},a.createElement("div",{className:"no-overflow",style:{width:"20%"},title:n}," ",n," "),a.createElement(xe,{status:r,onDark:!1})),a.createElement(ee.a.Collapse,{eventKey:"0"},a.createElement("div",null," ",Object.values(l).map((function(e){return a.createElement(Re,Object.assign({key:"".concat(t,".").concat(n,".").concat(e.method_name),totalObjectCount:s},e,{setValidators:o}))}))," ")))},De={cursor:"pointer",padding:"10px",background:"#ebebeb",fontWeight:600,fontSize:"14pt",color:"#000"},Me={cursor:"pointer",padding:"10px",background:"#417690",fontWeight:600,fontSize:"14pt",color:"white"},Ve=function(e){var t=e.appLabel,n=e.status,r=e.models,l=e.setValidators;return a.createElement(ee.a,{defaultActiveKey:"",style:{minWidth:"1000px",marginBottom:"10px"}},a.createElement(ee.a.Toggle,{as:"div",eventKey:"0",className:"vertical-align",style:Me},a.createElement("div",{className:"no-overflow",style:{width:"20%"},title:t}," ",t," "),a.createElement(xe,{status:n,onDark:!0})),a.createElement(ee.a.Collapse,{eventKey:"0"},a.createElement("div",null," ",Object.entries(r).map((function(e){var n=Object(u.a)(e,2),r=n[0],o=n[1];return a.createElement(Te,{key:"".concat(t,".").concat(r),appLabel:t,modelName:r,status:o.status,validators:o.validators,setValidators:l})}))," ")))};var Be=function(){var e=a.useState([]),t=Object(u.a)(e,2),n=t[0],r=t[1],l=a.useState(!0),o=Object(u.a)(l,2),c=o[0],p=o[1];a.useEffect((function(){Object(s.a)(i.a.mark((function e(){return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return e.next=2,K();case 2:case"end":return e.stop()}}),e)})))()}),[]),a.useEffect((function(){Object(s.a)(i.a.mark((function e(){return i.a.wrap((function(e){for(;;)switch(e.prev=e.next){case 0:return p(!0),e.next=3,X(r).then();case 3:p(!1);case 4:case"end":return e.stop()}}),e)})))()}),[]);var m=function(e){var t,n={},a=Object(f.a)(e);try{for(a.s();!(t=a.n()).done;){var r=t.value;n.hasOwnProperty(r.app_label)||(n[r.app_label]={appLabel:r.app_label,status:V.UNINITIALIZED,models:{}});var l=n[r.app_label];l.models.hasOwnProperty(r.model_name)||(l.models[r.model_name]={appLabel:r.app_label,modelName:r.model_name,status:V.UNINITIALIZED,validators:[]}),l.models[r.model_name].validators.push(r)}}catch(m){a.e(m)}finally{a.f()}for(var o=function(e,t){var n,a=Object(f.a)(t);try{for(a.s();!(n=a.n()).done;){var r=n.value;if(r.status===V.PASSING&&e.status===V.UNINITIALIZED)e.status=V.PASSING;else if(r.status===V.FAILING)e.status=V.FAILING;else if(r.status===V.TIMEOUT&&e.status!==V.FAILING)e.status=V.TIMEOUT;else if(r.status===V.EXCEPTION){e.status=V.EXCEPTION;break}}}catch(m){a.e(m)}finally{a.f()}},c=0,i=Object.values(n);c<i.length;c++){for(var s=i[c],u=0,d=Object.values(s.models);u<d.length;u++){var p=d[u];o(p,p.validators)}o(s,Object.values(s.models))}return n}(n);return c?a.createElement("div",{style:{position:"relative"}},a.createElement(d.a,{animation:"border",role:"status",variant:"primary",style:{position:"absolute",left:"50%"}})):a.createElement(a.Fragment,null,a.createElement("h2",{style:{marginBottom:"10px",color:"#417690"}}," Data Validation Summary "),Object.values(m).map((function(e){return a.createElement(Ve,{key:e.appLabel,appLabel:e.appLabel,status:e.status,models:e.models,setValidators:r})})))};o.a.render(r.a.createElement(r.a.StrictMode,null,r.a.createElement(Be,null)),document.getElementById("root"))},56:function(e,t,n){e.exports=n(308)},62:function(e,t,n){}},[[56,1,2]]]);
 //# sourceMappingURL=main.chunk.js.map
\ No newline at end of file
@@ -1,13 +1,18 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 import itertools
+from math import ceil
+import random
 import sys
 import time
 
 import inspect
-from typing import Callable, Type, Iterable, TypeVar, Tuple, List
+from typing import Awaitable, Callable, Type, Iterable, Optional, TypeVar, Tuple, List
 
-from django.db import models
-from django.db.models import prefetch_related_objects
+from django.db import connections, models
+from django.db.models import Max, Min, prefetch_related_objects
+from django.db.models.expressions import RawSQL
 
 
 T = TypeVar("T")
@@ -25,6 +30,21 @@ def chunk(iterable: Iterable[T], size: int) -> Iterable[T]:
     return iter(lambda: tuple(itertools.islice(it, size)), ())
 
 
+def run_coroutine(coro: Awaitable[T]) -> T:
+    """ run a coroutine to completion from synchronous code
+
+     asyncio.run cannot be called while an event loop is running in this
+     thread (e.g. in a notebook or an async view), so in that case the
+     coroutine is run in a new event loop in a worker thread
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
 def partition(iterable: Iterable[T], predicate: Callable) -> Tuple[List[T], List[T]]:
     """ partition a list into two depending on a predicate """
     trues, falses = [], []
@@ -33,25 +53,128 @@ def partition(iterable: Iterable[T], predicate: Callable) -> Tuple[List[T], List
     return trues, falses
 
 
-# noinspection PyProtectedMember
-def queryset_iterator(queryset: models.QuerySet, chunk_size: int):
-    """ QuerySet.iterate with prefetch_related
+def pk_ranges(queryset: models.QuerySet, num_ranges: int) -> List[Tuple[int, int]]:
+    """ split the (integer) primary keys of a queryset into contiguous
+        inclusive ranges of equal width
 
-     QuerySet.iterate silently ignores prefetch_related
-     modified from this PR: https://github.com/django/django/pull/10707/files
+     :returns: a list of (first_pk, last_pk) tuples, which is empty if the
+        queryset is empty or the primary key is not an integer
     """
-    iterable = queryset._iterable_class(queryset, chunked_fetch=True, chunk_size=chunk_size)
-    if not queryset._prefetch_related_lookups:
-        yield from iterable
-        return
+    bounds = queryset.aggregate(first=Min("pk"), last=Max("pk"))
+    first, last = bounds["first"], bounds["last"]
+    if type(first) is not int or type(last) is not int:
+        return []
+    width = -(-(last - first + 1) // num_ranges)  # ceil division
+    return [
+        (start, min(start + width - 1, last))
+        for start in range(first, last + 1, width)
+    ]
+
+
+def random_pks(queryset: models.QuerySet, size: int) -> List:
+    """ return the primary keys of a random sample of (up to) size objects
+        of a queryset
+
+     on postgres the rows are sampled with TABLESAMPLE BERNOULLI. Otherwise,
+     if the primary key is an integer, random primary keys are drawn between
+     the first and last primary key. ORDER BY RANDOM(), which sorts the whole
+     table, is only used if neither applies or they fail to draw enough rows
+    """
+    count = queryset.count()
+    if size >= count:
+        return list(queryset.values_list("pk", flat=True))
+    if connections[queryset.db].vendor == "postgresql":
+        pks = tablesample_pks(queryset, size, count)
+    else:
+        pks = random_range_pks(queryset, size, count)
+    if pks is None:
+        pks = queryset.order_by("?").values_list("pk", flat=True)[:size]
+    return list(pks)
+
+
+def tablesample_pks(queryset: models.QuerySet, size: int, count: int) -> Optional[List]:
+    """ sample the primary keys with TABLESAMPLE BERNOULLI (postgres only)
+
+     BERNOULLI selects each row independently, unlike SYSTEM which selects
+     whole pages and so would correlate the sampled objects
+    """
+    opts = queryset.model._meta
+    quote_name = connections[queryset.db].ops.quote_name
+    sql = f"SELECT {quote_name(opts.pk.column)} FROM {quote_name(opts.db_table)} " \
+          f"TABLESAMPLE BERNOULLI (%s)"
+    # oversample so that (almost always) one query returns enough rows
+    percent = min(100.0, 120.0 * size / count)
+    for _ in range(3):
+        sampled = queryset.filter(pk__in=RawSQL(sql, (percent,)))
+        pks = list(sampled.values_list("pk", flat=True))
+        if len(pks) >= size:
+            return random.sample(pks, size)
+        percent = min(100.0, 2 * percent)
+    return None
+
+
+def random_range_pks(queryset: models.QuerySet, size: int, count: int) -> Optional[List]:
+    """ sample the primary keys by drawing random integers between the first
+        and last primary key and keeping those that exist
+
+     :returns: None if the primary key is not an integer or the primary
+        keys are too sparse for the draws to find enough objects
+    """
+    bounds = queryset.aggregate(first=Min("pk"), last=Max("pk"))
+    first, last = bounds["first"], bounds["last"]
+    if type(first) is not int or type(last) is not int:
+        return None
+    num_pks = last - first + 1
+    if count * 10 < num_pks:
+        return None
+    sampled = set()
+    for _ in range(5):
+        # every existing primary key is equally likely to be drawn
+        num_draws = min(num_pks, ceil(1.2 * (size - len(sampled)) * num_pks / count))
+        draws = set(random.sample(range(first, last + 1), num_draws)) - sampled
+        for pks in chunk(draws, 1000):
+            sampled.update(queryset.filter(pk__in=pks).values_list("pk", flat=True))
+        if len(sampled) >= size:
+            return random.sample(sorted(sampled), size)
+    return None
 
-    iterator = iter(iterable)
+
+# noinspection PyProtectedMember
+def queryset_chunks(queryset: models.QuerySet,
+                    chunk_size: int
+                    ) -> Iterable[List[models.Model]]:
+    """ iterate a QuerySet in lists of (up to) chunk_size objects with
+        prefetch_related applied to each list
+    """
+    iterable = queryset._iterable_class(queryset, chunked_fetch=True, chunk_size=chunk_size)
+    for results in chunk(iterable, chunk_size):
+        results = list(results)
+        if queryset._prefetch_related_lookups:
+            prefetch_related_objects(results, *queryset._prefetch_related_lookups)
+        yield results
+
+
+def keyset_chunks(queryset: models.QuerySet,
+                  chunk_size: int
+                  ) -> Iterable[List[models.Model]]:
+    """ iterate a QuerySet in lists of (up to) chunk_size objects ordered by
+        primary key, with prefetch_related applied to each list
+
+     each chunk is a separate query (pk > last_pk ORDER BY pk LIMIT n) so,
+     unlike queryset_chunks, no cursor or transaction is held open for the
+     duration of the iteration
+    """
+    queryset = queryset.order_by("pk")
+    last_pk = None
     while True:
-        results = list(itertools.islice(iterator, chunk_size))
-        if not results:
-            break
-        prefetch_related_objects(results, *queryset._prefetch_related_lookups)
-        yield from iter(results)
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        results = list(page[:chunk_size])
+        if len(results) == 0:
+            return
+        yield results
+        if len(results) < chunk_size:
+            return
+        last_pk = results[-1].pk
 
 
 def timer(output: Callable):
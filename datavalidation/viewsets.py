@@ -1,4 +1,4 @@
-from django.db.models import Count, Q, QuerySet
+from django.db.models import QuerySet
 from rest_framework import pagination, permissions, routers, viewsets
 
 from .models import FailingObject, Validator
@@ -24,24 +24,23 @@ class FailingObjectViewSet(viewsets.ModelViewSet):
             return FailingObject.objects.all()
         return FailingObject.objects.filter(validator_id=validator_id)
 
+    def perform_destroy(self, instance: FailingObject) -> None:
+        super().perform_destroy(instance)
+        Validator.add_to_counts(
+            instance.validator_id,
+            num_failing=-1,
+            num_allowed_to_fail=-instance.allowed_to_fail
+        )
+
 
 class ValidatorViewSet(viewsets.ModelViewSet):
     serializer_class = ValidatorSerializer
-    queryset = Validator.objects.prefetch_related("failing_objects")
+    queryset = Validator.objects.all()
     pagination_class = None
     permission_classes = [
         permissions.IsAuthenticated
     ]
 
-    def get_queryset(self):
-        return Validator.objects.all().annotate(
-            num_failing=Count("failing_objects"),
-            num_allowed_to_fail=Count(
-                "failing_objects",
-                filter=Q(failing_objects__allowed_to_fail=True)
-            )
-        )
-
 
 router = routers.DefaultRouter()
 router.register(r"failing-objects", FailingObjectViewSet)
@@ -0,0 +1,24 @@
+# Generated by Django 4.1.13 on 2026-10-18 08:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app1', '0002_overloaded'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Incremental',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('foobar', models.PositiveIntegerField(blank=True, null=True)),
+                ('version', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
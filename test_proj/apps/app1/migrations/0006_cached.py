@@ -0,0 +1,24 @@
+# Generated by Django 4.1.13 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app1', '0005_async_validators'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Cached',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('foobar', models.PositiveIntegerField(blank=True, null=True)),
+                ('note', models.TextField(default='')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -1,6 +1,10 @@
+from .async_validators import AsyncValidators
 from .base import TestModel
 from .c_return_values import CReturnValues
+from .cached import Cached
+from .deferred import Deferred
 from .i_return_values import IReturnValues
+from .incremental import Incremental
 from .inheritance import Parent, ExcludedModel, ModelWithExcludedParent, ProxyModel
 from .overloads import Overloaded
 from .relations import Relation, RelatedFields
@@ -8,8 +12,12 @@ from .relations import Relation, RelatedFields
 
 __all__ = (
     "TestModel",
+    "AsyncValidators",
     "CReturnValues",
+    "Cached",
+    "Deferred",
     "IReturnValues",
+    "Incremental",
     "Parent",
     "ExcludedModel",
     "ModelWithExcludedParent",
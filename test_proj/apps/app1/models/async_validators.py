@@ -0,0 +1,32 @@
+import asyncio
+
+from datavalidation import data_validator, NA
+
+from .base import BaseModel
+
+
+class AsyncValidators(BaseModel):
+    """ Async Validators
+
+    tests: async def validators are awaited concurrently
+    """
+    # the number of calls of returning_result awaited at the same time
+    pending = 0
+    max_pending = 0
+
+    @data_validator
+    async def returning_result(self):
+        """ tests: awaiting a service (stood in for by a sleep) """
+        cls = type(self)
+        cls.pending += 1
+        cls.max_pending = max(cls.max_pending, cls.pending)
+        await asyncio.sleep(0.001)
+        cls.pending -= 1
+        return self.foobar < 10 if self.foobar is not None else NA
+
+    @data_validator
+    async def raising_exception(self):
+        """ tests: exceptions are recorded the same as for sync validators """
+        if self.foobar is not None and self.foobar >= 10:
+            raise ValueError("foobar too large!")
+        return True
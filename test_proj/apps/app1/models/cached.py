@@ -0,0 +1,21 @@
+from datavalidation import data_validator, NA
+from django.db import models
+
+from .base import BaseModel
+
+
+class Cached(BaseModel):
+    """ Cached Results
+
+    tests: the results of unchanged objects are reused
+    """
+    note = models.TextField(default="")
+
+    # the number of times cached_result has been called
+    calls = 0
+
+    @data_validator(cache=True, defer="note")
+    def cached_result(self):
+        """ tests: a validator that does not read note """
+        type(self).calls += 1
+        return self.foobar < 10 if self.foobar is not None else NA
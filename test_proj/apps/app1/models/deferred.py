@@ -0,0 +1,22 @@
+from datavalidation import data_validator
+from django.db import models
+
+from .base import BaseModel
+
+
+class Deferred(BaseModel):
+    """ Deferred Fields
+
+    tests: fields that are not read by any validator are not fetched
+    """
+    blob = models.TextField(default="")
+
+    @data_validator(only="foobar")
+    def only_foobar(self):
+        """ tests: only a single field is read """
+        return self.foobar is None or self.foobar < 10
+
+    @data_validator(defer=["blob"])
+    def defer_blob(self):
+        """ tests: every field except blob is read """
+        return self.foobar is None or self.foobar < 10
@@ -42,3 +42,42 @@ class IReturnValues(BaseModel):
     def raising_exception(self):
         """ tests: raising an exception """
         raise ValueError("An Error!")
+
+    @data_validator(batch=True)
+    @classmethod
+    def batch_returning_dict(cls, objs):
+        """ tests: batch validator returning a result for each object """
+        return {
+            obj: NA if obj.foobar is None else obj.foobar < 10
+            for obj in objs
+        }
+
+    @data_validator(batch=True)
+    @classmethod
+    def batch_returning_failures(cls, objs):
+        """ tests: batch validator returning the objects that fail """
+        return [obj.pk for obj in objs if obj.foobar is not None and obj.foobar >= 10]
+
+    @data_validator(batch=True)
+    @classmethod
+    def batch_raising_exception(cls, objs):
+        """ tests: batch validator raising an exception because of one object """
+        if any(obj.foobar is not None and obj.foobar >= 10 for obj in objs):
+            raise ValueError("foobar too large!")
+        return {obj: PASS for obj in objs}
+
+    @data_validator(batch=True)
+    @classmethod
+    def batch_raising_exception_for_chunk(cls, objs):
+        """ tests: batch validator raising an exception because of the chunk
+            as a whole
+        """
+        if len(objs) > 1:
+            raise ValueError("too many objects!")
+        return {obj: PASS for obj in objs}
+
+    @data_validator(batch=True)
+    @classmethod
+    def batch_missing_result(cls, objs):
+        """ tests: batch validator not returning every object (exception expected) """
+        return {obj: PASS for obj in objs[1:]}
@@ -0,0 +1,16 @@
+from datavalidation.config import Config
+from django.db import models
+
+from .base import BaseModel
+
+
+class Incremental(BaseModel):
+    """ Incremental Validation
+
+    tests: only objects with a greater version than the last run are
+        re-validated
+    """
+    version = models.PositiveIntegerField(default=0)
+
+    class DataValidationConfig(Config):
+        incremental_field = "version"
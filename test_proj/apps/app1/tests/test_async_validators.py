@@ -0,0 +1,91 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from datavalidation import data_validator
+from datavalidation.models import FailingObject
+from datavalidation.registry import REGISTRY
+from datavalidation.results import Status, SummaryEx
+from datavalidation.runners import InstanceMethodRunner, ObjectValidationRunner
+import pytest
+
+from app1.models import AsyncValidators
+from conftest import run_validator
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_registry():
+    valinfo = REGISTRY[AsyncValidators].validators["returning_result"]
+    assert valinfo.is_async
+    assert not REGISTRY[AsyncValidators].validators["check_foobar"].is_async
+
+
+def test_returning_result():
+    failures = AsyncValidators.objects.generate(failing=5)
+    AsyncValidators.objects.generate(na=3)
+    AsyncValidators.max_pending = 0
+    with mock.patch("datavalidation.runners.ASYNC_CONCURRENCY", 4):
+        summary = run_validator(AsyncValidators, "returning_result")
+    assert summary == SummaryEx(
+        num_passing=20, num_na=3, failures=[obj.pk for obj in failures]
+    ).complete()
+    # the calls were awaited concurrently, but no more than the limit
+    assert AsyncValidators.max_pending == 4
+    assert summary.validator_latency.count == 28
+
+
+def test_raising_exception():
+    obj, = AsyncValidators.objects.generate(failing=1)
+    AsyncValidators.objects.generate(failing=1)
+    summary = run_validator(AsyncValidators, "raising_exception")
+    assert summary.status == Status.EXCEPTION
+    assert summary.exc_obj_pk == obj.pk
+    assert FailingObject.objects.filter(object_pk=obj.pk, is_exception=True).exists()
+
+
+def test_object_runner():
+    obj, = AsyncValidators.objects.generate(failing=1)
+    assert ObjectValidationRunner(obj).run(class_methods=False) == (0, 2, 1)
+
+
+def test_elapsed_time():
+    """ test that each validator is charged its own elapsed time rather than
+        the time taken to await all the validators
+    """
+    valinfos = [
+        REGISTRY[AsyncValidators].validators[name]
+        for name in ("returning_result", "raising_exception")
+    ]
+    runner = InstanceMethodRunner(AsyncValidators, valinfos)
+    runner.run(False)
+    # nb. raising_exception never awaits
+    assert runner._spent[valinfos[1]] < runner._spent[valinfos[0]]
+
+
+def test_running_event_loop():
+    """ test that the validators are awaited in a worker thread if an event
+        loop is already running (e.g. in a notebook)
+    """
+    obj, = AsyncValidators.objects.generate(failing=1)
+    # nb. the event loop is faked because django would use another
+    # connection (outside of the test transaction) inside a real one
+    with mock.patch("datavalidation.utils.asyncio", wraps=asyncio) as fake_asyncio, \
+            mock.patch("datavalidation.utils.ThreadPoolExecutor",
+                       wraps=ThreadPoolExecutor) as pool:
+        fake_asyncio.get_running_loop.return_value = mock.Mock()
+        summary = run_validator(AsyncValidators, "returning_result")
+        result = ObjectValidationRunner(obj).run(class_methods=False)
+    assert summary.failures == [obj.pk]
+    assert result == (0, 2, 1)
+    assert pool.call_count > 0
+
+
+def test_async_class_method():
+    with pytest.raises(TypeError):
+        class Bad:
+            @data_validator
+            @classmethod
+            async def bad(cls):
+                return True
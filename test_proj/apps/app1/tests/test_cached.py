@@ -0,0 +1,66 @@
+from unittest import mock
+
+from datavalidation.models import CachedResult, FailingObject
+from datavalidation.registry import REGISTRY
+from datavalidation.results import SummaryEx
+from datavalidation.runners import ResultCache
+import pytest
+
+from app1.models import Cached
+from conftest import run_validator
+
+
+pytestmark = pytest.mark.django_db
+
+
+def get_calls() -> int:
+    """ return the number of times the validator is called in a run """
+    Cached.calls = 0
+    run_validator(Cached, "cached_result")
+    return Cached.calls
+
+
+def test_cached_result():
+    valinfo = REGISTRY[Cached].validators["cached_result"]
+    failures = Cached.objects.generate(failing=3)
+    cached_results = CachedResult.objects.filter(validator_id=valinfo.get_validator_id())
+    assert get_calls() == 23
+    assert cached_results.count() == 23
+
+    # nothing has changed
+    Cached.calls = 0
+    summary = run_validator(Cached, "cached_result")
+    assert Cached.calls == 0
+    assert summary == SummaryEx(
+        num_passing=20, num_na=0, failures=[obj.pk for obj in failures]
+    ).complete()
+    assert FailingObject.objects.filter(validator_id=valinfo.get_validator_id()).count() == 3
+
+    # changing a field that the validator reads invalidates the result
+    Cached.objects.filter(pk=failures[0].pk).update(foobar=1)
+    Cached.objects.filter(pk=failures[1].pk).update(note="not read")
+    Cached.calls = 0
+    summary = run_validator(Cached, "cached_result")
+    assert Cached.calls == 1
+    assert summary.failures == [obj.pk for obj in failures[1:]]
+
+    # changing the validator invalidates every result
+    with mock.patch.object(ResultCache, "get_source_hash", return_value=b"changed"):
+        assert get_calls() == 23
+    assert get_calls() == 23
+    assert get_calls() == 0
+
+
+def test_cache_size():
+    valinfo = REGISTRY[Cached].validators["cached_result"]
+    cached_results = CachedResult.objects.filter(validator_id=valinfo.get_validator_id())
+    with mock.patch("datavalidation.runners.RESULT_CACHE_SIZE", 5):
+        assert get_calls() == 20
+        assert sorted(cached_results.values_list("object_pk", flat=True)) == sorted(
+            Cached.objects.values_list("pk", flat=True)
+        )[:5]
+
+    # the results of deleted objects are removed
+    Cached.objects.filter(pk__in=cached_results.values("object_pk")[:2]).delete()
+    assert get_calls() == 15
+    assert cached_results.count() == 18
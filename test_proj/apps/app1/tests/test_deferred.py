@@ -0,0 +1,37 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from datavalidation.registry import REGISTRY
+from datavalidation.results import SummaryEx
+from datavalidation.runners import InstanceMethodRunner
+import pytest
+
+from app1.models import Deferred
+
+
+pytestmark = pytest.mark.django_db
+
+
+def get_runner(*method_names: str) -> InstanceMethodRunner:
+    model_info = REGISTRY[Deferred]
+    return InstanceMethodRunner(
+        Deferred, [model_info.validators[name] for name in method_names]
+    )
+
+
+def test_deferred_fields():
+    assert get_runner("only_foobar").get_deferred_fields(set()) == {"blob"}
+    assert get_runner("defer_blob").get_deferred_fields(set()) == {"blob"}
+    assert get_runner("only_foobar", "defer_blob").get_deferred_fields(set()) == {"blob"}
+    # check_foobar reads every field
+    assert get_runner("only_foobar", "check_foobar").get_deferred_fields(set()) == set()
+
+
+def test_deferred_scan():
+    runner = get_runner("only_foobar", "defer_blob")
+    with CaptureQueriesContext(connection) as context:
+        summaries = runner.run(False)
+    scan = [q["sql"] for q in context.captured_queries if "FROM \"app1_deferred\"" in q["sql"]]
+    assert len(scan) == 1
+    assert "blob" not in scan[0]
+    for summary in summaries.values():
+        assert summary == SummaryEx(num_passing=20).complete()
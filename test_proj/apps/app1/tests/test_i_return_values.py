@@ -1,4 +1,8 @@
-from datavalidation.results import SummaryEx
+from datavalidation import data_validator
+from datavalidation.models import FailingObject
+from datavalidation.registry import REGISTRY
+from datavalidation.results import Status, SummaryEx
+from datavalidation.runners import InstanceMethodRunner, ObjectValidationRunner
 import pytest
 
 from app1.models.i_return_values import IReturnValues
@@ -65,3 +69,77 @@ def test_raising_exception():
     assert summary.num_na is None
     assert summary.num_allowed_to_fail is None
     assert summary.failures is None
+
+
+@pytest.mark.parametrize("num_failing, num_na", [
+    (0, 0), (2, 1),
+])
+def test_batch_returning_dict(num_failing, num_na):
+    failures = IReturnValues.objects.generate(failing=num_failing)
+    IReturnValues.objects.generate(na=num_na)
+    summary = run_validator(IReturnValues, "batch_returning_dict")
+    assert summary == SummaryEx(
+        num_passing=20,
+        num_na=num_na,
+        failures=failures
+    ).complete()
+
+
+def test_batch_returning_failures():
+    failures = IReturnValues.objects.generate(failing=2)
+    IReturnValues.objects.generate(na=1)
+    summary = run_validator(IReturnValues, "batch_returning_failures")
+    assert summary == SummaryEx(
+        num_passing=21,
+        num_na=0,
+        failures=failures
+    ).complete()
+
+
+def test_batch_missing_result():
+    summary = run_validator(IReturnValues, "batch_missing_result")
+    assert summary.exc_type.startswith("TypeError")
+    assert summary.exc_obj_pk == IReturnValues.objects.order_by("pk").first().pk
+    assert summary.failures is None
+
+
+def test_batch_raising_exception():
+    """ test that an exception in a batch validator is recorded on the object
+        that raises and charged to the validator's budget
+    """
+    failing, = IReturnValues.objects.generate(failing=1)
+    valinfo = REGISTRY[IReturnValues].validators["batch_raising_exception"]
+    runner = InstanceMethodRunner(IReturnValues, [valinfo])
+    summary = runner.run(False)[valinfo]
+    assert summary.exc_type.startswith("ValueError")
+    assert summary.exc_obj_pk == failing.pk
+    fobj = FailingObject.objects.get(validator_id=valinfo.get_validator_id())
+    assert (fobj.object_pk, fobj.is_exception) == (failing.pk, True)
+    assert fobj.comment.startswith("ValueError")
+    assert runner._spent[valinfo] > 0
+
+
+def test_batch_raising_exception_for_chunk():
+    """ test that an exception in a batch validator that no object raises on
+        its own is not attributed to an object
+    """
+    valinfo = REGISTRY[IReturnValues].validators["batch_raising_exception_for_chunk"]
+    summary = InstanceMethodRunner(IReturnValues, [valinfo]).run(False)[valinfo]
+    assert summary.exc_type.startswith("ValueError")
+    assert summary.exc_obj_pk is None
+    assert not FailingObject.objects.filter(validator_id=valinfo.get_validator_id()).exists()
+
+
+def test_batch_object_runner():
+    obj, = IReturnValues.objects.generate(failing=1)
+    valinfo = REGISTRY[IReturnValues].validators["batch_returning_failures"]
+    runner = ObjectValidationRunner(obj)
+    assert runner.run_for_object(valinfo) == Status.FAILING
+
+
+def test_batch_requires_classmethod():
+    with pytest.raises(TypeError):
+        class _Test:
+            @data_validator(batch=True)
+            def foo(self):
+                pass
@@ -0,0 +1,54 @@
+from datavalidation.models import FailingObject, Validator
+from datavalidation.registry import REGISTRY
+from datavalidation.results import SummaryEx
+from datavalidation.runners import ModelValidationRunner
+import pytest
+
+from app1.models import Incremental
+from conftest import run_validator
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_incremental():
+    valinfo = REGISTRY[Incremental].validators["check_foobar"]
+    failing_objects = FailingObject.objects.filter(validator_id=valinfo.get_validator_id())
+
+    # the first run validates every object
+    summary = run_validator(Incremental, "check_foobar")
+    assert summary == SummaryEx(num_passing=20).complete()
+    validator = Validator.objects.get(id=valinfo.get_validator_id())
+    assert validator.high_water_mark == "0"
+
+    # only the new objects are validated
+    failures = Incremental.objects.generate(failing=2)
+    Incremental.objects.filter(pk__in=[obj.pk for obj in failures]).update(version=1)
+    summary = run_validator(Incremental, "check_foobar")
+    assert summary == SummaryEx(num_passing=0, failures=failures).complete()
+    assert failing_objects.count() == 2
+
+    # fixing one object doesn't remove the failure of the other
+    fixed, failing = failures
+    Incremental.objects.filter(pk=fixed.pk).update(foobar=1, version=2)
+    summary = run_validator(Incremental, "check_foobar")
+    assert summary == SummaryEx(num_passing=1, failures=[failing]).complete()
+    assert list(failing_objects.values_list("object_pk", flat=True)) == [failing.pk]
+
+    # nothing has changed
+    summary = run_validator(Incremental, "check_foobar")
+    assert summary == SummaryEx(num_passing=0, failures=[failing]).complete()
+
+    # the failures of deleted objects are removed
+    failing.delete()
+    summary = run_validator(Incremental, "check_foobar")
+    assert summary == SummaryEx(num_passing=0, failures=[]).complete()
+    assert failing_objects.count() == 0
+    validator.refresh_from_db()
+    assert validator.num_failing == 0
+
+    # a full run re-validates everything
+    (_, summary), = ModelValidationRunner(Incremental).run(full=True)
+    assert summary == SummaryEx(num_passing=21).complete()
+    validator.refresh_from_db()
+    assert validator.high_water_mark == "2"
@@ -1,4 +1,8 @@
+from datavalidation.registry import REGISTRY, get_related_lookups, is_valid_lookup
 from datavalidation.results import SummaryEx, PASS
+from django.db import connection
+from django.db.models import Prefetch
+from django.test.utils import CaptureQueriesContext
 import pytest
 
 from app1.models.relations import RelatedFields
@@ -44,6 +48,12 @@ def test_select_related_m2m(caplog):
 def test_bad_related_names(caplog):
     summary = run_validator(RelatedFields, "bad_related_names")
     assert summary == SummaryEx(num_passing=20).complete()
+    valinfo = REGISTRY[RelatedFields].validators["bad_related_names"]
+    assert valinfo.select_related == set()
+    assert valinfo.prefetch_related == set()
+    # the lookups are checked (and the warnings displayed) when the
+    # registry is built
+    get_related_lookups(RelatedFields, "bad_related_names", {"wibble"}, select=True)
     for name, level, message in caplog.record_tuples:
         if name == "datavalidation" and level == logging.WARNING:
             break
@@ -56,3 +66,31 @@ def test_useless_select_related(caplog):
     print(summary.__dict__)
     assert summary == SummaryEx.from_return_value(PASS).complete()
     assert_no_warnings(caplog)
+
+
+@pytest.mark.parametrize("lookup, select, valid", [
+    ("o2o", True, True),
+    ("fkey__o2o_relation__fkey", True, True),
+    ("fkey__o2o_realtion__fkey", True, False),
+    ("m2m", True, False),
+    ("relation_set", True, False),
+    ("foobar", True, False),
+    ("m2m", False, True),
+    ("relation_set", False, True),
+    ("relation_set__fkey", False, True),
+    ("relation", False, False),
+    (Prefetch("m2m"), False, True),
+])
+def test_is_valid_lookup(lookup, select, valid):
+    assert is_valid_lookup(RelatedFields, lookup, select) == valid
+
+
+def test_no_probe_queries():
+    """ test that the only queries on the model are those of the scan """
+    with CaptureQueriesContext(connection) as context:
+        run_validator(RelatedFields, "select_related_o2o")
+    queries = [
+        q["sql"] for q in context.captured_queries
+        if 'FROM "app1_relatedfields"' in q["sql"]
+    ]
+    assert len(queries) == 1
@@ -0,0 +1,12 @@
+SECRET_KEY = "local-test"
+DATABASES["postgres2"] = {
+    "ENGINE": "django.db.backends.sqlite3",
+    "NAME": (BASE_DIR.parent / "db2.sqlite3").as_posix(),
+}
+# local compat for running the suite against a newer django
+import django.conf.urls as _urls
+from django.urls import re_path as _re_path
+_urls.url = _re_path
+SILENCED_SYSTEM_CHECKS = ["models.W042"]
+DATABASES["default"]["OPTIONS"] = {"timeout": 60}
+DATABASES["postgres2"]["OPTIONS"] = {"timeout": 60}
@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+# modules that should only be imported when validation is run (or the api
+# is used)
+HEAVY_MODULES = (
+    "datavalidation.runners",
+    "datavalidation.serializers",
+    "datavalidation.viewsets",
+    "rest_framework.serializers",
+    "tqdm",
+)
+
+SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+import datavalidation
+t1 = time.perf_counter()
+{setup}
+t2 = time.perf_counter()
+print(json.dumps({{
+    "import": t1 - t0,
+    "setup": t2 - t1,
+    "modules": sorted(sys.modules),
+}}))
+"""
+
+
+def import_in_subprocess(setup: str = "") -> dict:
+    """ import datavalidation in a fresh interpreter and return the timings
+        and the imported modules
+    """
+    env = dict(os.environ,
+               DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE,
+               PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(setup=setup)],
+        env=env, stdout=subprocess.PIPE, check=True, universal_newlines=True
+    ).stdout
+    # nb. the registry may log warnings about the test models
+    return json.loads(output.splitlines()[-1])
+
+
+def test_import_benchmark():
+    """ benchmark importing datavalidation and setting up django, and check
+        that the heavy dependencies are not imported (run with -s to see the
+        timings)
+    """
+    result = import_in_subprocess()
+    imported = {*HEAVY_MODULES, "termcolor"} & set(result["modules"])
+    assert len(imported) == 0, f"{', '.join(sorted(imported))} imported by datavalidation"
+
+    result = import_in_subprocess("import django; django.setup()")
+    print(f"\nimport datavalidation: {result['import'] * 1000:.1f}ms, "
+          f"django.setup: {result['setup'] * 1000:.1f}ms")
+    imported = set(HEAVY_MODULES) & set(result["modules"])
+    assert len(imported) == 0, f"{', '.join(sorted(imported))} imported by django.setup"
@@ -0,0 +1,78 @@
+from unittest import mock
+from urllib.request import urlopen
+
+from django.core.management import call_command
+import pytest
+
+from app1.models import TestModel
+from datavalidation.metrics import Metrics, METRICS
+from datavalidation.results import SummaryEx
+
+
+def test_render():
+    metrics = Metrics()
+    metrics.inc("datavalidation_rows_scanned_total", 10, model="app1.TestModel")
+    metrics.inc("datavalidation_rows_scanned_total", 5, model="app1.TestModel")
+    metrics.set("datavalidation_failures", 2, model='a"b', validator="check")
+    assert metrics.render() == (
+        "# HELP datavalidation_failures objects failing the validator in the last run\n"
+        "# TYPE datavalidation_failures gauge\n"
+        'datavalidation_failures{model="a\\"b",validator="check"} 2\n'
+        "# HELP datavalidation_rows_scanned_total objects scanned by the instance "
+        "method validators\n"
+        "# TYPE datavalidation_rows_scanned_total counter\n"
+        'datavalidation_rows_scanned_total{model="app1.TestModel"} 15\n'
+    )
+
+
+def test_textfile_and_http(tmp_path):
+    metrics = Metrics()
+    summary = SummaryEx(num_passing=3, failures=[1, 2]).complete()
+    summary.validator_latency.add(0.01, count=5)
+    metrics.record_summary("app1.TestModel", "check_foobar", summary, 0.5)
+
+    path = tmp_path / "datavalidation.prom"
+    metrics.write_textfile(str(path))
+    assert path.read_text() == metrics.render()
+    assert list(tmp_path.iterdir()) == [path]
+    assert 'datavalidation_validator_calls_total{model="app1.TestModel",' \
+           'validator="check_foobar"} 5' in path.read_text()
+
+    # the latency is a summary with quantiles, _sum and _count
+    text = metrics.render()
+    assert "# TYPE datavalidation_validator_latency_seconds summary\n" in text
+    assert 'datavalidation_validator_latency_seconds{model="app1.TestModel",' \
+           'quantile="0.5",validator="check_foobar"}' in text
+    assert 'datavalidation_validator_latency_seconds_count{model="app1.TestModel",' \
+           'validator="check_foobar"} 5\n' in text
+    assert 'datavalidation_validator_latency_seconds_sum{model="app1.TestModel",' \
+           'validator="check_foobar"} 0.05' in text
+    assert "TYPE datavalidation_validator_latency_seconds_sum" not in text
+
+    server = metrics.serve(0)
+    try:
+        host, port = server.server_address
+        assert host == "127.0.0.1"
+        with urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            assert response.read().decode("utf-8") == metrics.render()
+    finally:
+        server.shutdown()
+
+
+@pytest.mark.django_db
+def test_validate_metrics_file(tmp_path):
+    METRICS.clear()
+    path = tmp_path / "datavalidation.prom"
+    with mock.patch("sys.exit"):
+        call_command("validate", "app1.TestModel", "--metrics-file", str(path))
+    lines = dict(
+        line.rsplit(" ", 1) for line in path.read_text().splitlines()
+        if not line.startswith("#")
+    )
+    num_objects = TestModel.objects.count()
+    scanned = lines['datavalidation_rows_scanned_total{model="app1.TestModel"}']
+    assert float(scanned) == num_objects
+    assert float(lines[
+        'datavalidation_validator_calls_total{model="app1.TestModel",validator="check_foobar"}'
+    ]) == num_objects
+    assert 'datavalidation_scan_duration_seconds{model="app1.TestModel"}' in lines
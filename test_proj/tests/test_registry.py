@@ -1,5 +1,15 @@
+import inspect
+import timeit
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+import pytest
+
 from app1.models import TestModel
-from datavalidation.registry import REGISTRY
+from datavalidation import registry
+from datavalidation.logging import logger
+from datavalidation.models import Validator
+from datavalidation.registry import REGISTRY, Registry, get_validators
 
 
 def test_registry():
@@ -21,3 +31,72 @@ def test_registry():
     assert valinfo.class_method is None
     assert valinfo.select_related == set()
     assert valinfo.prefetch_related == set()
+
+
+@pytest.mark.django_db
+def test_sync_to_db(monkeypatch, django_assert_max_num_queries):
+    """ check that the Validator records are synced in bulk and their ids
+        are cached
+    """
+    monkeypatch.setattr(REGISTRY, "synced", False)
+    monkeypatch.setattr(REGISTRY, "validator_ids", {})
+    monkeypatch.setattr(REGISTRY, "content_type_ids", {})
+    valinfo = REGISTRY[TestModel].validators[TestModel.check_foobar.__name__]
+    Validator.objects.filter(method_name="check_foobar").delete()
+    Validator.objects.exclude(method_name="check_foobar").update(description="outdated")
+
+    num_validators = sum(len(model_info.validators) for model_info in REGISTRY.values())
+    with django_assert_max_num_queries(10):
+        REGISTRY.sync_to_db()
+    assert Validator.objects.count() == num_validators
+    assert not Validator.objects.filter(description="outdated").exists()
+    assert len(REGISTRY.validator_ids) == num_validators
+
+    with django_assert_max_num_queries(0):
+        validator_id = valinfo.get_validator_id()
+        content_type_id = valinfo.model_info.get_content_type_id()
+    validator = Validator.objects.get(id=validator_id)
+    assert (validator.model_name, validator.method_name) == ("TestModel", "check_foobar")
+    assert content_type_id == ContentType.objects.get_for_model(TestModel).id
+
+
+def test_update_registry(monkeypatch):
+    """ check that the registry is built from the validators recorded by
+        the decorator (without inspecting every member of every model)
+    """
+    def getmembers(*args, **kwargs):
+        raise AssertionError("the models should not be inspected")
+
+    monkeypatch.setattr(logger, "disabled", True)
+    monkeypatch.setattr(inspect, "getmembers", getmembers)
+    monkeypatch.setattr(registry, "REGISTRY", Registry())
+    registry.update_registry()
+    assert registry.REGISTRY.keys() == REGISTRY.keys()
+    for model, model_info in REGISTRY.items():
+        assert registry.REGISTRY[model].validators.keys() == model_info.validators.keys()
+
+
+def test_ready_benchmark(monkeypatch):
+    """ benchmark DataValidationConfig.ready, and check that finding the
+        validators is cheaper than inspecting the models (run with -s to
+        see the timings)
+    """
+    monkeypatch.setattr(logger, "disabled", True)
+    monkeypatch.setattr(registry, "REGISTRY", Registry())
+    models = apps.get_models()
+    number = 20
+
+    ready = timeit.timeit(apps.get_app_config("datavalidation").ready, number=number)
+    scan = timeit.timeit(
+        lambda: [get_validators(model) for model in models], number=number
+    )
+    getmembers = timeit.timeit(
+        lambda: [inspect.getmembers(model, lambda m: hasattr(m, "__datavalidator__"))
+                 for model in models],
+        number=number
+    )
+    print(f"\nDataValidationConfig.ready: {ready / number * 1000:.3f}ms "
+          f"({len(models)} models, {len(registry.REGISTRY)} with validators)")
+    print(f"finding the validators: {scan / number * 1000:.3f}ms "
+          f"(inspect.getmembers: {getmembers / number * 1000:.3f}ms)")
+    assert scan < getmembers
@@ -1,7 +1,12 @@
+import pickle
+
 import pytest
 
 from app1.models import TestModel
-from datavalidation.results import Status, SummaryEx, Summary, ExceptionInfo
+from datavalidation.results import (
+    Status, SummaryEx, Summary, ExceptionInfo, FailureSet, LatencyHistogram,
+    wilson_interval
+)
 
 
 @pytest.mark.django_db
@@ -77,3 +82,55 @@ def test_summary_ex_pretty_print():
         exc_obj_pk=1
     ).pretty_print()
     assert summary == "EXCEPTION: ValueError() (object pk=1)"
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) is None
+    for ms in range(1, 101):
+        histogram.add(ms / 1000)
+    latencies = histogram.to_dict()
+    assert latencies["p50"] == pytest.approx(0.050, rel=LatencyHistogram.GROWTH - 1)
+    assert latencies["p95"] == pytest.approx(0.095, rel=LatencyHistogram.GROWTH - 1)
+    assert latencies["p99"] == pytest.approx(0.099, rel=LatencyHistogram.GROWTH - 1)
+    assert latencies["max"] == 0.1
+
+    # merging the histograms of disjoint samples
+    other = LatencyHistogram()
+    other.add(2.0, count=100)
+    histogram.merge(other)
+    assert histogram.count == 200
+    assert histogram.percentile(50) == pytest.approx(0.100, rel=LatencyHistogram.GROWTH - 1)
+    assert histogram.percentile(99) == 2.0
+
+
+def test_wilson_interval():
+    low, high = wilson_interval(10, 100)
+    assert low == pytest.approx(0.0552, abs=1e-4)
+    assert high == pytest.approx(0.1744, abs=1e-4)
+    assert wilson_interval(0, 100)[0] == 0.0
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_failure_set():
+    pks = [1, 2, 3, 7, 9, 10, 4]
+    failures = FailureSet(pks)
+    assert len(failures) == 7
+    assert failures == pks
+    # consecutive primary keys are stored as a single run
+    assert list(failures.iter_runs()) == [(1, 3), (7, 1), (9, 2), (4, 1)]
+    failures.extend(FailureSet([5, 6]))
+    assert list(failures.iter_runs())[-1] == (4, 3)
+
+    # the runs are spilled to disk, and read back when pickled
+    spilled = FailureSet(range(0, 100, 2), spill_size=4)
+    assert spilled.file is not None
+    assert len(spilled.runs) <= 8
+    spilled.extend(range(200, 300))
+    assert spilled == list(range(0, 100, 2)) + list(range(200, 300))
+    assert pickle.loads(pickle.dumps(spilled)) == spilled
+
+    summary = SummaryEx(num_passing=0, failures=list(range(10**6))).complete()
+    assert isinstance(summary.failures, FailureSet)
+    assert len(summary.failures.runs) == 2
+    assert summary.pretty_print().endswith("Failing Ids: 0, 1, 2...")
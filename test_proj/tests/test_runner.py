@@ -1,12 +1,31 @@
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from functools import partial
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
 from unittest import mock
 
 from django.core.management import call_command
+from django.db import connection, connections, router
 import pytest
 
-from app1.models import TestModel
-from datavalidation.models import Validator
-from datavalidation.results import Status
-from datavalidation.runners import ModelValidationRunner, ObjectValidationRunner
+from app1.models import CReturnValues, IReturnValues, TestModel
+from app2.models import SecondDatabase
+from datavalidation.logging import handler
+from datavalidation.management.commands.validate import Command
+from datavalidation.models import FailingObject, Validator
+from datavalidation.registry import REGISTRY
+from datavalidation.results import Status, SummaryEx
+from datavalidation.runners import (
+    ClassMethodRunner, FailingObjectBuffer, InstanceMethodRunner, ModelValidationRunner,
+    ObjectValidationRunner
+)
+from datavalidation.utils import pk_ranges
 
 
 def test_model_runner_with_bad_model():
@@ -46,8 +65,176 @@ def test_model_runner_cli_failure():
         mocked_exit.assert_called_with(1)
 
 
+@pytest.mark.django_db(transaction=True)
+def test_model_runner_cli_concurrency():
+    """ test ./manage.py validate --concurrency 2 --class-workers 2
+
+     the output of each model should be printed in one block. nb. sqlite
+     cannot take concurrent writers, so there the models are validated one
+     at a time
+    """
+    stream = io.StringIO()
+    with mock.patch("sys.exit") as mocked_exit, mock.patch.object(handler, "stream", stream):
+        call_command("validate", "app1.TestModel", "app1.IReturnValues", "app1.CReturnValues",
+                     "--concurrency", "2", "--class-workers", "2")
+        mocked_exit.assert_called_with(1)
+    output = stream.getvalue()
+    is_sqlite = connection.vendor == "sqlite"
+    assert ("does not support concurrent writes" in output) == is_sqlite
+    blocks = output.split("VALIDATING MODEL: ")[1:]
+    assert sorted(block.splitlines()[0].split("\x1b")[0] for block in blocks) == [
+        "app1.CReturnValues", "app1.IReturnValues", "app1.TestModel"
+    ]
+    assert all(block.count("METHOD:") == 1 for block in blocks if "TestModel" in block)
+
+
 @pytest.mark.django_db
-def test_object_runner():
+def test_latency():
+    """ test that the latency of instance method validators is stored """
+    valinfo = REGISTRY[IReturnValues].validators["returning_result"]
+    summaries = InstanceMethodRunner(IReturnValues, [valinfo]).run(False)
+    assert summaries[valinfo].validator_latency.count == IReturnValues.objects.count()
+    validator = Validator.objects.get(id=valinfo.get_validator_id())
+    latency = validator.get_latency()
+    assert set(latency.keys()) == {"validator", "persistence"}
+    assert set(latency["validator"].keys()) == {"p50", "p95", "p99", "max"}
+    assert latency["validator"]["p50"] <= latency["validator"]["max"]
+    assert "Validator Latency: p50=" in summaries[valinfo].pretty_print()
+
+
+@pytest.mark.django_db
+def test_sample():
+    """ test that sampling doesn't change the FailingObjects or Validators """
+    IReturnValues.objects.generate(failing=5)
+    ModelValidationRunner(IReturnValues, ["returning_result"]).run()
+    valinfo = REGISTRY[IReturnValues].validators["returning_result"]
+    validator = Validator.objects.filter(id=valinfo.get_validator_id())
+    failing_objects = FailingObject.all_objects.filter(validator_id=valinfo.get_validator_id())
+    before = list(validator.values()), list(failing_objects.values())
+
+    (_, summary), = ModelValidationRunner(IReturnValues, ["returning_result"]).run(sample=10)
+    assert summary.sample_size == 10
+    assert summary.num_passing + len(summary.failures) + summary.num_na == 10
+    assert "Estimated Failure Rate" in summary.pretty_print()
+    assert (list(validator.values()), list(failing_objects.values())) == before
+
+    (_, summary), = ModelValidationRunner(IReturnValues, ["returning_result"]).run(sample=1.0)
+    assert summary.sample_size == IReturnValues.objects.count()
+    assert len(summary.failures) == failing_objects.count()
+
+    # class method validators are skipped
+    summaries = ModelValidationRunner(IReturnValues).run(sample=0.5)
+    assert len(summaries) == len([
+        v for v in REGISTRY[IReturnValues].validators.values() if v.class_method is None
+    ])
+
+
+@pytest.mark.django_db
+def test_resume():
+    """ test that resuming an interrupted run gives the same result as an
+        uninterrupted run
+    """
+    IReturnValues.objects.generate(failing=5, na=2)
+    valinfos = [
+        REGISTRY[IReturnValues].validators[name]
+        for name in ("returning_result", "allowed_to_fail",
+                     "raising_exception", "batch_returning_failures")
+    ]
+    validator_ids = [valinfo.get_validator_id() for valinfo in valinfos]
+    failing_objects = FailingObject.all_objects.filter(validator_id__in=validator_ids)
+
+    def get_state():
+        return (
+            list(failing_objects.order_by("validator_id", "object_pk").values(
+                "validator_id", "object_pk", "is_exception", "allowed_to_fail"
+            )),
+            list(Validator.objects.filter(id__in=validator_ids).order_by("id").values(
+                "status", "num_passing", "num_na", "exc_type", "exc_obj_pk", "checkpoint"
+            )),
+        )
+
+    expected = InstanceMethodRunner(IReturnValues, valinfos).run(False)
+    expected_state = get_state()
+
+    chunks = []
+    run_for_chunk = InstanceMethodRunner.run_for_chunk
+
+    def interrupt(self, *args):
+        # stop the run while validating the third chunk
+        chunks.append(args)
+        if len(chunks) == 3:
+            raise KeyboardInterrupt
+        return run_for_chunk(self, *args)
+
+    with mock.patch("datavalidation.runners.CHECKPOINT_INTERVAL", 0), \
+            mock.patch.object(InstanceMethodRunner, "CHUNK_SIZE", 5), \
+            mock.patch.object(InstanceMethodRunner, "run_for_chunk", interrupt):
+        with pytest.raises(KeyboardInterrupt):
+            InstanceMethodRunner(IReturnValues, valinfos).run(False)
+    assert all(
+        validator.checkpoint is not None
+        for validator in Validator.objects.filter(id__in=validator_ids)
+    )
+
+    resumed = []
+
+    def count(self, valinfos_, objs):
+        resumed.extend(objs)
+        return run_for_chunk(self, valinfos_, objs)
+
+    with mock.patch.object(InstanceMethodRunner, "CHUNK_SIZE", 5), \
+            mock.patch.object(InstanceMethodRunner, "run_for_chunk", count):
+        summaries = InstanceMethodRunner(IReturnValues, valinfos).run(False, resume=True)
+    assert summaries == expected
+    assert get_state() == expected_state
+    # only the objects after the checkpoint were validated, but the latency
+    # covers the whole run
+    assert len(resumed) == IReturnValues.objects.count() - 10
+    assert summaries[valinfos[0]].validator_latency.count == IReturnValues.objects.count()
+
+
+@pytest.mark.django_db
+def test_resume_max_failures():
+    """ test that a resumed run counts the failures found before it was
+        interrupted towards max_failures
+    """
+    IReturnValues.objects.update(foobar=100)
+    IReturnValues.objects.generate(failing=10)
+    valinfo = REGISTRY[IReturnValues].validators["returning_result"]
+    fobjs = FailingObject.objects.filter(validator_id=valinfo.get_validator_id())
+    runner = partial(InstanceMethodRunner, IReturnValues, [valinfo], max_failures={valinfo: 8})
+
+    with mock.patch.object(InstanceMethodRunner, "CHUNK_SIZE", 5):
+        expected = runner().run(False)[valinfo]
+    expected_pks = list(fobjs.values_list("object_pk", flat=True))
+    assert expected.truncated and len(expected_pks) == 8
+
+    num_chunks = 0
+    run_for_chunk = InstanceMethodRunner.run_for_chunk
+
+    def interrupt(self, *args):
+        # stop the run while validating the second chunk
+        nonlocal num_chunks
+        num_chunks += 1
+        if num_chunks == 2:
+            raise KeyboardInterrupt
+        return run_for_chunk(self, *args)
+
+    with mock.patch("datavalidation.runners.CHECKPOINT_INTERVAL", 0), \
+            mock.patch.object(InstanceMethodRunner, "CHUNK_SIZE", 5), \
+            mock.patch.object(InstanceMethodRunner, "run_for_chunk", interrupt):
+        with pytest.raises(KeyboardInterrupt):
+            runner().run(False)
+
+    with mock.patch.object(InstanceMethodRunner, "CHUNK_SIZE", 5):
+        summary = runner().run(False, resume=True)[valinfo]
+    assert summary == expected
+    assert summary.truncated
+    assert list(fobjs.values_list("object_pk", flat=True)) == expected_pks
+
+
+@pytest.mark.django_db
+def test_object_runner(django_assert_max_num_queries):
     """ test the ObjectValidationRunner """
     validator = Validator.objects.get(
         app_label=TestModel._meta.app_label,
@@ -69,3 +256,443 @@ def test_object_runner():
 
     validator.refresh_from_db()
     assert validator.status == Status.FAILING
+    assert (validator.num_failing, validator.num_allowed_to_fail) == (1, 0)
+
+    # the counts are kept up to date without counting the FailingObjects
+    FailingObject.objects.filter(object_pk=obj_fail.pk).update(allowed_to_fail=True)
+    Validator.add_to_counts(validator.id, num_allowed_to_fail=1)
+    with django_assert_max_num_queries(10) as queries:
+        ObjectValidationRunner(obj_fail).run(class_methods=False)
+    assert not any("COUNT(" in query["sql"] for query in queries.captured_queries)
+    validator.refresh_from_db()
+    assert validator.status == Status.PASSING
+    assert (validator.num_failing, validator.num_allowed_to_fail) == (1, 1)
+
+    obj_fail.foobar = 1
+    obj_fail.save()
+    ObjectValidationRunner(obj_fail).run()
+    validator.refresh_from_db()
+    assert validator.status == Status.PASSING
+    assert (validator.num_failing, validator.num_allowed_to_fail) == (0, 0)
+    assert validator.num_failing == validator.get_num_failing()
+
+
+@pytest.mark.django_db
+def test_buffered_failing_objects():
+    """ test that flushing FailingObjects in small batches gives the same
+        result and preserves objects that were marked allowed_to_fail
+    """
+    failures = IReturnValues.objects.generate(failing=5)
+    valinfo = REGISTRY[IReturnValues].validators["returning_result"]
+    summaries = InstanceMethodRunner(IReturnValues, [valinfo], flush_size=2).run(False)
+    assert summaries[valinfo] == SummaryEx(
+        num_passing=20, num_na=0, failures=failures
+    ).complete()
+    fobjs = FailingObject.objects.filter(validator_id=valinfo.get_validator_id())
+    assert fobjs.count() == 5
+    assert all(fobj.comment == "foobar too large!" for fobj in fobjs)
+
+    # the user marks one object as allowed to fail
+    fobjs.filter(object_pk=failures[0].pk).update(
+        allowed_to_fail=True, allowed_to_fail_justification="it's fine"
+    )
+    summaries = InstanceMethodRunner(IReturnValues, [valinfo], flush_size=2).run(False)
+    assert summaries[valinfo].num_allowed_to_fail == 1
+    fobj = fobjs.get(object_pk=failures[0].pk)
+    assert fobj.allowed_to_fail is True
+    assert fobj.allowed_to_fail_justification == "it's fine"
+    assert fobjs.count() == 5
+
+
+@pytest.mark.django_db
+def test_failing_object_generations():
+    """ test that the failures of the last run stay visible until a new run
+        completes, and the ones that were fixed are then deleted (unless
+        they are allowed to fail)
+    """
+    fixed, failing, allowed = IReturnValues.objects.generate(failing=3)
+    valinfo = REGISTRY[IReturnValues].validators["returning_result"]
+    fobjs = FailingObject.objects.filter(validator_id=valinfo.get_validator_id())
+    InstanceMethodRunner(IReturnValues, [valinfo]).run(False)
+    fobjs.filter(object_pk=allowed.pk).update(allowed_to_fail=True)
+    IReturnValues.objects.filter(pk__in=[fixed.pk, allowed.pk]).update(foobar=1)
+
+    visible_before_sweep = []
+    sweep = InstanceMethodRunner.sweep_failing_objects
+
+    def sweep_failing_objects(valinfo_, generation):
+        visible_before_sweep.extend(fobjs.values_list("object_pk", flat=True))
+        sweep(valinfo_, generation)
+
+    with mock.patch.object(InstanceMethodRunner, "sweep_failing_objects",
+                           staticmethod(sweep_failing_objects)):
+        InstanceMethodRunner(IReturnValues, [valinfo]).run(False)
+    assert visible_before_sweep == [fixed.pk, failing.pk, allowed.pk]
+    assert list(fobjs.values_list("object_pk", flat=True)) == [failing.pk]
+    # the object allowed to fail is hidden but keeps its record
+    assert FailingObject.all_objects.filter(object_pk=allowed.pk, allowed_to_fail=True) \
+                                    .exists()
+    # nb. the visible records are found without joining the validators
+    assert "JOIN" not in str(fobjs.query)
+
+    # and is visible again when it fails again
+    IReturnValues.objects.filter(pk=allowed.pk).update(foobar=100)
+    summaries = InstanceMethodRunner(IReturnValues, [valinfo]).run(False)
+    assert summaries[valinfo].num_allowed_to_fail == 1
+    assert list(fobjs.values_list("object_pk", flat=True)) == [failing.pk, allowed.pk]
+
+
+@pytest.mark.django_db
+def test_object_runner_during_run():
+    """ test that an object saved in the admin while a run is in progress
+        (after the run has validated it) keeps its FailingObject
+    """
+    obj, = IReturnValues.objects.generate(failing=1)
+    valinfo = REGISTRY[IReturnValues].validators["returning_result"]
+    fobjs = FailingObject.objects.filter(validator_id=valinfo.get_validator_id())
+    InstanceMethodRunner(IReturnValues, [valinfo]).run(False)
+    sweep = InstanceMethodRunner.sweep_failing_objects
+
+    def sweep_failing_objects(valinfo_, generation):
+        # the object is still failing when it is saved in the admin
+        obj.foobar += 1
+        obj.save()
+        assert ObjectValidationRunner(obj).run(class_methods=False)[1] != 0
+        sweep(valinfo_, generation)
+
+    with mock.patch.object(InstanceMethodRunner, "sweep_failing_objects",
+                           staticmethod(sweep_failing_objects)):
+        InstanceMethodRunner(IReturnValues, [valinfo]).run(False)
+    assert list(fobjs.values_list("object_pk", flat=True)) == [obj.pk]
+    validator = Validator.objects.get(id=valinfo.get_validator_id())
+    assert validator.run_generation is None
+    assert validator.num_failing == 1
+
+
+@pytest.mark.django_db
+def test_update_failing_objects():
+    """ test that the failures of a class method validator are created or
+        re-validated (with INSERT ... ON CONFLICT on postgres)
+    """
+    failures = CReturnValues.objects.generate(failing=5)
+    pks = [obj.pk for obj in failures]
+    valinfo = REGISTRY[CReturnValues].validators["returning_list_of_model_ids"]
+    fobjs = FailingObject.all_objects.filter(validator_id=valinfo.get_validator_id())
+    fobjs.create(
+        validator_id=valinfo.get_validator_id(),
+        content_type_id=valinfo.model_info.get_content_type_id(), object_pk=pks[0],
+        is_exception=True, comment="ValueError", generation=0,
+        allowed_to_fail=True, allowed_to_fail_justification="it's fine",
+    )
+
+    with mock.patch.object(ClassMethodRunner, "UPSERT_SIZE", 2):
+        summary = ClassMethodRunner.update_failing_objects(
+            valinfo, SummaryEx(failures=pks + pks[:1]), generation=1
+        )
+    assert summary.num_written == 6
+    visible = FailingObject.objects.filter(validator_id=valinfo.get_validator_id())
+    assert sorted(visible.values_list("object_pk", flat=True)) == pks
+    fobj = fobjs.get(object_pk=pks[0])
+    assert (fobj.is_exception, fobj.comment) == (False, "")
+    assert (fobj.allowed_to_fail, fobj.allowed_to_fail_justification) == (True, "it's fine")
+
+
+@pytest.mark.django_db
+def test_upsert_failing_objects_sql():
+    """ test the INSERT ... ON CONFLICT statements that are executed on
+        postgres
+    """
+    pks = [obj.pk for obj in CReturnValues.objects.generate(failing=5)]
+    valinfo = REGISTRY[CReturnValues].validators["returning_list_of_model_ids"]
+    connection = connections[router.db_for_write(FailingObject)]
+    cursor = mock.MagicMock()
+    with mock.patch.object(connection, "vendor", "postgresql"), \
+            mock.patch.object(connection, "cursor", return_value=cursor), \
+            mock.patch.object(ClassMethodRunner, "UPSERT_SIZE", 2):
+        summary = ClassMethodRunner.update_failing_objects(
+            valinfo, SummaryEx(failures=pks), generation=3
+        )
+    assert summary.num_written == 5
+    calls = cursor.__enter__.return_value.execute.call_args_list
+    assert len(calls) == 3
+    table = connection.ops.quote_name(FailingObject._meta.db_table)
+    for (sql, params), _ in calls:
+        assert sql.startswith(f"INSERT INTO {table} (")
+        assert "unnest(%s::integer[])" in sql
+        assert 'ON CONFLICT ("validator_id", "object_pk") DO UPDATE SET' in sql
+        assert "allowed_to_fail" not in sql.split("DO UPDATE SET")[1]
+        assert params[:3] == [
+            valinfo.get_validator_id(), valinfo.model_info.get_content_type_id(), 3
+        ]
+    assert [pk for (_, params), _ in calls for pk in params[3]] == pks
+    # nothing was written to the (sqlite) database
+    fobjs = FailingObject.all_objects.filter(validator_id=valinfo.get_validator_id())
+    assert not fobjs.exists()
+
+
+class InlineExecutor(Executor):
+    """ stand-in for a thread pool that runs the tasks when they are
+        submitted
+    """
+    def __init__(self, max_workers=None):
+        self.num_submitted = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.num_submitted += 1
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+@contextmanager
+def inline_pool(workers):
+    """ stand-in for process_pool that runs the shards in this process """
+    yield SimpleNamespace(map=map)
+
+
+@pytest.mark.django_db
+def test_class_method_runner_pool():
+    """ test that running the class method validators in a pool gives the
+        same results as a serial run
+    """
+    CReturnValues.objects.generate(failing=3)
+    valinfos = [
+        valinfo for valinfo in REGISTRY[CReturnValues].validators.values()
+        if valinfo.class_method is not None
+    ]
+    validator_ids = [valinfo.get_validator_id() for valinfo in valinfos]
+    fobjs = FailingObject.objects.filter(validator_id__in=validator_ids).values_list(
+        "validator_id", "object_pk", "is_exception"
+    )
+
+    serial = ClassMethodRunner(CReturnValues, valinfos).run()
+    serial_fobjs = sorted(fobjs)
+    pool = InlineExecutor()
+    pooled = ClassMethodRunner(CReturnValues, valinfos).run(pool)
+    assert pool.num_submitted == len(valinfos)
+    assert list(pooled) == valinfos
+    assert pooled == serial
+    assert sorted(fobjs) == serial_fobjs
+
+
+@pytest.mark.django_db
+def test_model_runner_cli_by_database():
+    """ test ./manage.py validate --by-database """
+    runners = [
+        ModelValidationRunner(model) for model in (TestModel, SecondDatabase, IReturnValues)
+    ]
+    groups = Command.group_by_database(runners)
+    assert {alias: [runner.model for runner in group] for alias, group in groups.items()} == {
+        "default": [TestModel, IReturnValues],
+        "postgres2": [SecondDatabase],
+    }
+
+    with mock.patch("datavalidation.management.commands.validate.ThreadPoolExecutor",
+                    InlineExecutor):
+        results = Command.run_databases(runners, concurrency=2)
+        assert [summaries[0][0].model_info.model for summaries in results] == [
+            TestModel, SecondDatabase, IReturnValues
+        ]
+        with mock.patch("sys.exit") as mocked_exit:
+            call_command("validate", "app1.TestModel", "app2", "--by-database")
+            mocked_exit.assert_called_with(0)
+
+
+PROCESS_POOL_SETTINGS = """
+from settings import *
+DATABASES = {{
+    "default": {{"ENGINE": "django.db.backends.sqlite3", "NAME": {default!r},
+                 "OPTIONS": {{"timeout": 60}}}},
+    "postgres2": {{"ENGINE": "django.db.backends.sqlite3", "NAME": {postgres2!r},
+                   "OPTIONS": {{"timeout": 60}}}},
+}}
+"""
+
+PROCESS_POOL_SCRIPT = """
+import json
+import django
+django.setup()
+from django.core.management import call_command
+from app1.models import IReturnValues
+from datavalidation.models import FailingObject
+
+for database in ("default", "postgres2"):
+    call_command("migrate", database=database, verbosity=0)
+IReturnValues.objects.generate(passing=20)
+IReturnValues.objects.generate(failing=3, na=2)
+
+def validate(*args):
+    try:
+        call_command("validate", "app1.IReturnValues", *args)
+    except SystemExit:
+        pass
+    return sorted(FailingObject.objects.values_list(
+        "validator_id", "object_pk", "is_exception", "comment"
+    ))
+
+print(json.dumps([validate("--workers", "2"), validate()]))
+"""
+
+
+def test_process_pool(tmp_path):
+    """ test validate --workers 2 with a real process pool (the worker
+        processes set up django and the shards are pickled), against a
+        serial run
+
+     nb. this runs in a subprocess because the workers cannot see the
+     in-memory test database
+    """
+    (tmp_path / "process_pool_settings.py").write_text(PROCESS_POOL_SETTINGS.format(
+        default=str(tmp_path / "default.sqlite3"),
+        postgres2=str(tmp_path / "postgres2.sqlite3"),
+    ))
+    env = dict(os.environ,
+               DJANGO_SETTINGS_MODULE="process_pool_settings",
+               PYTHONPATH=os.pathsep.join([str(tmp_path), *sys.path]))
+    output = subprocess.run(
+        [sys.executable, "-c", PROCESS_POOL_SCRIPT],
+        env=env, stdout=subprocess.PIPE, check=True, universal_newlines=True
+    ).stdout
+    parallel, serial = json.loads(output.splitlines()[-1])
+    assert any(is_exception for _, _, is_exception, _ in parallel)
+    assert len(parallel) > 3
+    assert parallel == serial
+
+
+@pytest.mark.django_db
+def test_parallel_instance_runner():
+    """ test that scanning ranges of primary keys gives the same results as
+        a serial scan
+    """
+    IReturnValues.objects.generate(failing=3, na=2)
+    model_info = REGISTRY[IReturnValues]
+    valinfos = [
+        model_info.validators[name]
+        for name in ("returning_result", "allowed_to_fail", "raising_exception",
+                     "batch_raising_exception", "batch_raising_exception_for_chunk")
+    ]
+    validator_ids = [valinfo.get_validator_id() for valinfo in valinfos]
+    fobjs = FailingObject.all_objects.filter(validator_id__in=validator_ids).values_list(
+        "validator_id", "object_pk", "is_exception", "comment"
+    )
+
+    serial = InstanceMethodRunner(IReturnValues, valinfos).run(False)
+    serial_fobjs = sorted(fobjs)
+    with mock.patch("datavalidation.runners.process_pool", inline_pool):
+        parallel = InstanceMethodRunner(IReturnValues, valinfos).run(False, workers=2)
+    assert parallel == serial
+    assert sorted(fobjs) == serial_fobjs
+
+    # the shards stop at max_failures, but the merged failures are cut to
+    # the same ones as a serial scan
+    IReturnValues.objects.update(foobar=100)
+    valinfo = model_info.validators["returning_result"]
+    fobjs = FailingObject.all_objects.filter(validator_id=valinfo.get_validator_id())
+    InstanceMethodRunner(IReturnValues, [valinfo]).run(False)
+    allowed = fobjs.order_by("object_pk")[1]
+    fobjs.filter(pk=allowed.pk).update(allowed_to_fail=True)
+    runner = partial(InstanceMethodRunner, IReturnValues, [valinfo], max_failures={valinfo: 3})
+    serial = runner().run(False)[valinfo]
+    visible = FailingObject.objects.filter(validator_id=valinfo.get_validator_id())
+
+    def get_fobjs():
+        return [
+            sorted(qs.values_list("object_pk", "allowed_to_fail")) for qs in (fobjs, visible)
+        ]
+
+    serial_fobjs = get_fobjs()
+    with mock.patch("datavalidation.runners.process_pool", inline_pool):
+        parallel = runner().run(False, workers=2)[valinfo]
+    assert parallel.truncated and serial.truncated
+    assert parallel.failures == serial.failures
+    assert len(parallel.failures) == 4
+    assert parallel.num_allowed_to_fail == serial.num_allowed_to_fail == 1
+    assert get_fobjs() == serial_fobjs
+
+    ranges = pk_ranges(IReturnValues.objects.all(), 8)
+    assert 1 < len(ranges) <= 8
+    assert ranges[0][0] == IReturnValues.objects.order_by("pk").first().pk
+    assert ranges[-1][1] == IReturnValues.objects.order_by("pk").last().pk
+    assert all(last + 1 == first for (_, last), (first, _) in zip(ranges, ranges[1:]))
+
+
+@pytest.mark.django_db
+def test_timeout():
+    """ test that a validator that runs out of time keeps its partial results """
+    IReturnValues.objects.generate(failing=5)
+    valinfo = REGISTRY[IReturnValues].validators["returning_result"]
+    with mock.patch.object(InstanceMethodRunner, "CHUNK_SIZE", 5):
+        # a budget of 0 seconds is used up by the first call
+        runner = InstanceMethodRunner(IReturnValues, [valinfo], budgets={valinfo: 0})
+        summary = runner.run(False)[valinfo]
+    assert summary.status == Status.TIMEOUT
+    assert summary.num_passing + summary.num_na + len(summary.failures) == 1
+    validator = Validator.objects.get(id=valinfo.get_validator_id())
+    assert validator.status == Status.TIMEOUT
+    assert "TIMED OUT" in summary.pretty_print()
+
+
+@pytest.mark.django_db
+def test_deadline():
+    """ test that no validators are started after the deadline """
+    summaries = ModelValidationRunner(TestModel).run(deadline=time.time())
+    for valinfo, summary in summaries:
+        assert summary.status == Status.TIMEOUT
+        if valinfo.class_method is not None:
+            assert summary.failures is None
+        else:
+            assert summary.num_passing + summary.num_na + len(summary.failures) <= 1
+
+    with mock.patch("sys.exit") as mocked_exit:
+        call_command("validate", "app1.TestModel", "--deadline", "0")
+        mocked_exit.assert_called_with(1)
+    assert Validator.get_status_for_model(TestModel) == Status.TIMEOUT
+
+
+@pytest.mark.django_db
+def test_class_method_timeout():
+    """ test that a class method that runs over its budget keeps its result
+        on databases without statement timeouts (it cannot be cancelled)
+    """
+    valinfo = REGISTRY[CReturnValues].validators["returning_result"]
+    expected = ClassMethodRunner(CReturnValues, [valinfo]).run()[valinfo]
+    with mock.patch.object(valinfo, "timeout", 1e-9):
+        (_, summary), = ModelValidationRunner(CReturnValues, ["returning_result"]).run()
+    assert not summary.timed_out
+    assert summary.status == expected.status != Status.TIMEOUT
+    assert summary.failures == expected.failures
+
+
+@pytest.mark.django_db
+def test_max_failures():
+    """ test that a validator is dropped once it reaches max_failures """
+    IReturnValues.objects.generate(failing=10)
+    valinfo = REGISTRY[IReturnValues].validators["returning_result"]
+    with mock.patch.object(valinfo, "max_failures", 3):
+        (_, summary), = ModelValidationRunner(IReturnValues, ["returning_result"]).run()
+    assert summary.status == Status.FAILING
+    assert summary.truncated
+    assert len(summary.failures) == 3
+    assert FailingObject.objects.filter(validator_id=valinfo.get_validator_id()).count() == 3
+    assert "TRUNCATED" in summary.pretty_print()
+
+    # objects allowed to fail are not counted, without flushing the
+    # FailingObjects of each failure to find out which they are
+    fobjs = FailingObject.objects.filter(validator_id=valinfo.get_validator_id())
+    fobjs.update(allowed_to_fail=True)
+    with mock.patch.object(valinfo, "max_failures", 3), \
+            mock.patch.object(FailingObjectBuffer, "flush", autospec=True,
+                              side_effect=FailingObjectBuffer.flush) as flush:
+        (_, summary), = ModelValidationRunner(IReturnValues, ["returning_result"]).run()
+    assert flush.call_count <= 2
+    assert summary.truncated
+    assert (len(summary.failures), summary.num_allowed_to_fail) == (6, 3)
+    assert fobjs.filter(allowed_to_fail=False).count() == 3
+
+    # class method validators record at most max_failures
+    CReturnValues.objects.generate(failing=5)
+    with mock.patch("sys.exit") as mocked_exit:
+        call_command("validate", "app1.CReturnValues::returning_queryset", "--fail-fast")
+        mocked_exit.assert_called_with(1)
+    valinfo = REGISTRY[CReturnValues].validators["returning_queryset"]
+    assert FailingObject.objects.filter(validator_id=valinfo.get_validator_id()).count() == 1
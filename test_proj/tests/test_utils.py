@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from app1.models import IReturnValues, TestModel
+from datavalidation.results import SummaryEx
+from datavalidation.utils import keyset_chunks, queryset_chunks, random_pks, run_coroutine
+from conftest import run_validator
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize("iterate", [queryset_chunks, keyset_chunks])
+def test_chunks(iterate):
+    """ test that the chunks contain every object exactly once """
+    chunks = list(iterate(TestModel.objects.all(), 7))
+    assert [len(objs) for objs in chunks] == [7, 7, 6]
+    pks = [obj.pk for objs in chunks for obj in objs]
+    assert sorted(pks) == sorted(TestModel.objects.values_list("pk", flat=True))
+
+
+def test_keyset_runner():
+    """ test that validating with the keyset iterator gives the same result """
+    failures = IReturnValues.objects.generate(failing=2)
+    IReturnValues.objects.generate(na=1)
+    with mock.patch("datavalidation.runners.ITERATOR", "keyset"):
+        summary = run_validator(IReturnValues, "returning_result")
+    assert summary == SummaryEx(num_passing=20, num_na=1, failures=failures).complete()
+
+
+def test_random_pks():
+    """ test that the sample is drawn from the queryset without sorting the
+        table
+    """
+    queryset = TestModel.objects.filter(pk__gt=TestModel.objects.order_by("pk")[2].pk)
+    all_pks = set(queryset.values_list("pk", flat=True))
+    with CaptureQueriesContext(connection) as ctx:
+        pks = random_pks(queryset, 10)
+    assert len(pks) == len(set(pks)) == 10
+    assert set(pks) <= all_pks
+    assert not any("RAND" in query["sql"] for query in ctx.captured_queries)
+    assert set(random_pks(queryset, 100)) == all_pks
+
+    # otherwise the database draws the sample
+    with mock.patch("datavalidation.utils.random_range_pks", return_value=None), \
+            CaptureQueriesContext(connection) as ctx:
+        pks = random_pks(queryset, 10)
+    assert len(set(pks) & all_pks) == 10
+    assert "RAND" in ctx.captured_queries[-1]["sql"]
+
+
+def test_random_pks_postgres():
+    """ test that the sample is drawn with TABLESAMPLE on postgres """
+    with mock.patch.object(connection, "vendor", "postgresql"), \
+            CaptureQueriesContext(connection) as ctx:
+        # sqlite does not support TABLESAMPLE
+        with pytest.raises(OperationalError):
+            random_pks(TestModel.objects.all(), 5)
+    assert "TABLESAMPLE BERNOULLI" in ctx.captured_queries[-1]["sql"]
+
+
+def test_run_coroutine():
+    """ test that a coroutine can be run while an event loop is running """
+    async def get_thread():
+        return threading.current_thread()
+
+    async def main():
+        return run_coroutine(get_thread())
+
+    assert run_coroutine(get_thread()) is threading.current_thread()
+    assert asyncio.run(main()) is not threading.current_thread()
@@ -6,12 +6,14 @@ from django.urls import reverse
 
 from app1.models import TestModel
 
+from datavalidation.models import FailingObject, Validator
 from datavalidation.results import Status
 from datavalidation.runners import ModelValidationRunner
 from datavalidation.viewsets import FailingObjectPagination
 
 
 HTTP_OK = 200
+HTTP_NO_CONTENT = 204
 
 
 @pytest.fixture
@@ -90,6 +92,44 @@ def test_rest_api_validator_list(auth_client):
         break
 
 
+@pytest.mark.django_db
+def test_rest_api_allowed_to_fail(auth_client):
+    """ test that marking a failing object allowed to fail updates the
+        count on the validator
+    """
+    TestModel.objects.generate(failing=2)
+    results = ModelValidationRunner(TestModel, method_names=["check_foobar"]).run()
+    valinfo, _ = results[0]
+    fobj = FailingObject.objects.filter(validator_id=valinfo.get_validator_id()).first()
+
+    url = reverse("admin:failingobject-detail", args=(fobj.id,))
+    resp = auth_client.patch(url, {"allowed_to_fail": True}, content_type="application/json")
+    assert resp.status_code == HTTP_OK
+    validator = Validator.objects.get(id=valinfo.get_validator_id())
+    assert (validator.num_failing, validator.num_allowed_to_fail) == (2, 1)
+
+
+@pytest.mark.django_db
+def test_rest_api_delete_failing_object(auth_client):
+    """ test that deleting a failing object updates the counts on the
+        validator
+    """
+    TestModel.objects.generate(failing=2)
+    results = ModelValidationRunner(TestModel, method_names=["check_foobar"]).run()
+    valinfo, _ = results[0]
+    fobjs = FailingObject.objects.filter(validator_id=valinfo.get_validator_id())
+    fobjs.filter(pk=fobjs.first().pk).update(allowed_to_fail=True)
+    Validator.add_to_counts(valinfo.get_validator_id(), num_allowed_to_fail=1)
+
+    for fobj in fobjs.order_by("-allowed_to_fail"):
+        url = reverse("admin:failingobject-detail", args=(fobj.id,))
+        resp = auth_client.delete(url)
+        assert resp.status_code == HTTP_NO_CONTENT
+    validator = Validator.objects.get(id=valinfo.get_validator_id())
+    assert (validator.num_failing, validator.num_allowed_to_fail) == (0, 0)
+    assert not fobjs.exists()
+
+
 @pytest.mark.django_db
 def test_rest_api_failing_objects_pagination(auth_client):
     """ test that failing objects are paginated """